@@ -16,12 +16,287 @@ Claude Master System - 完全統合管理システム
 
 import sys
 import os
+import re
 import json
 import time
+import atexit
+import threading
 from datetime import datetime
 from typing import Dict, List, Optional, Any
 from pathlib import Path
 
+# ルールファイルのプロセス内キャッシュ（path -> (mtime, 内容)）
+_rule_file_cache: Dict[str, tuple] = {}
+
+def read_rule_file(path: str) -> str:
+    """ルールファイルを読み込み（更新されていなければプロセス内キャッシュを返す）"""
+    mtime = os.path.getmtime(path)
+    cached = _rule_file_cache.get(path)
+    if cached and cached[0] == mtime:
+        return cached[1]
+    
+    with open(path, 'r', encoding='utf-8') as f:
+        content = f.read()
+    _rule_file_cache[path] = (mtime, content)
+    return content
+
+# ルール違反パターン（ルールmarkdownに定義がない場合の既定値）
+DEFAULT_VIOLATION_RULES = [
+    {
+        "id": "one_session_one_file",
+        "target": "output",
+        "all": ["新規作成", "日報"],
+        "message": "1セッション1ファイルルール違反の可能性"
+    },
+    {
+        "id": "memo_instruction",
+        "target": "input",
+        "any": ["メモして", "記録して", "システム化"],
+        "message": "メモ作成指示検出 - 強制記録実行必要"
+    },
+    {
+        "id": "system_promise",
+        "target": "output",
+        "any": ["システム作ります"],
+        "message": "システム構築約束 - 完成まで責任を持つ必要"
+    }
+]
+
+class ViolationDetector:
+    """ルール違反検出エンジン（全パターンを1つの正規表現にまとめて1パスで走査）
+    
+    ルールmarkdown内の ```violation-rules ブロック（JSON配列）からルールを読み込む。
+    各ルールは any（いずれかの語を含む）または all（全ての語を含む）で条件を指定し、
+    target で対象（input / output / any）を指定する。
+    """
+    
+    RULES_BLOCK_PATTERN = re.compile(r'```violation-rules\s*\n(.*?)```', re.DOTALL)
+    
+    def __init__(self, rules: Optional[List[Dict]] = None):
+        self.rules = rules if rules is not None else DEFAULT_VIOLATION_RULES
+        self.compile()
+    
+    @classmethod
+    def from_markdown(cls, *paths: str) -> 'ViolationDetector':
+        """ルールmarkdownからパターンを読み込み（定義がなければ既定ルール）"""
+        rules = []
+        for path in paths:
+            try:
+                content = read_rule_file(path)
+            except OSError:
+                continue
+            for block in cls.RULES_BLOCK_PATTERN.findall(content):
+                try:
+                    rules.extend(json.loads(block))
+                except json.JSONDecodeError as e:
+                    print(f"⚠️ 違反パターン定義の読み込みエラー ({os.path.basename(path)}): {e}")
+        return cls(rules or None)
+    
+    def compile(self):
+        """全ルールの検出語を1つの正規表現（長い語優先の選択）に統合"""
+        self.term_rules: Dict[str, List[int]] = {}
+        for index, rule in enumerate(self.rules):
+            for term in rule.get("all", []) + rule.get("any", []):
+                self.term_rules.setdefault(term, []).append(index)
+        
+        # 先読みで各位置の最長一致語を取り、その語の前方一致語（同じ位置から始まる短い語）も出現扱いにする
+        terms = sorted(self.term_rules, key=len, reverse=True)
+        self.prefix_terms: Dict[str, set] = {
+            term: {other for other in terms if term.startswith(other)} for term in terms
+        }
+        alternation = '|'.join(re.escape(term) for term in terms)
+        self.pattern = re.compile(f'(?=({alternation}))') if terms else None
+    
+    def find_terms(self, text: str) -> set:
+        """テキスト中に出現する検出語を1パスで収集"""
+        found = set()
+        if not self.pattern:
+            return found
+        for match in self.pattern.finditer(text):
+            found |= self.prefix_terms[match.group(1)]
+        return found
+    
+    def evaluate(self, found_terms: set, target: str) -> List[Dict]:
+        """出現語集合からルール判定"""
+        hits = []
+        for rule in self.rules:
+            rule_target = rule.get("target", "any")
+            if target != "any" and rule_target not in ("any", target):
+                continue
+            if rule.get("all") and not all(term in found_terms for term in rule["all"]):
+                continue
+            if rule.get("any") and not any(term in found_terms for term in rule["any"]):
+                continue
+            hits.append(rule)
+        return hits
+    
+    def detect(self, user_input: str = "", claude_output: str = "") -> List[str]:
+        """入力・出力に対する違反判定（違反メッセージのリスト）"""
+        hits = self.evaluate(self.find_terms(user_input), "input")
+        hits += self.evaluate(self.find_terms(claude_output), "output")
+        hit_ids = {id(rule) for rule in hits}
+        return [rule["message"] for rule in self.rules if id(rule) in hit_ids]
+    
+    def scan_file(self, path: str, target: str = "output") -> List[Dict]:
+        """ログファイルを1行ずつストリーム走査（all条件は空行区切りの段落単位で判定）
+        
+        ログはClaude側の記録なので、既定では target が output / any のルールのみ判定する
+        """
+        results = []
+        paragraph_terms = set()
+        paragraph_start = 1
+        
+        def flush():
+            for rule in self.evaluate(paragraph_terms, target):
+                results.append({
+                    "file": path,
+                    "line": paragraph_start,
+                    "rule_id": rule.get("id", ""),
+                    "message": rule["message"]
+                })
+        
+        with open(path, 'r', encoding='utf-8', errors='replace') as f:
+            for line_no, line in enumerate(f, 1):
+                if not line.strip():
+                    if paragraph_terms:
+                        flush()
+                    paragraph_terms = set()
+                    paragraph_start = line_no + 1
+                    continue
+                paragraph_terms |= self.find_terms(line)
+            if paragraph_terms:
+                flush()
+        
+        return results
+    
+    def audit_directory(self, directory: str, pattern: str = "*.md", target: str = "output") -> List[Dict]:
+        """ディレクトリ配下のログを一括監査"""
+        results = []
+        for path in sorted(Path(directory).glob(pattern)):
+            try:
+                results.extend(self.scan_file(str(path), target))
+            except OSError as e:
+                print(f"⚠️ 読み込みエラー {path.name}: {e}")
+        return results
+
+class DailyLogLocator:
+    """日付 → 日報ファイル名のインデックス（LOGS/.cache/log_index.json に保持）
+    
+    ディレクトリのmtimeが記録時と同じならサイドカーをそのまま信用し、
+    外部でファイルが追加・削除された時のみ再走査する。
+    """
+    
+    DATE_PATTERN = re.compile(r'\d{4}-\d{2}-\d{2}')
+    
+    def __init__(self, logs_path: str):
+        self.logs_path = logs_path
+        self.index_path = os.path.join(logs_path, ".cache", "log_index.json")
+        self.dir_mtime = None
+        self.dates: Dict[str, List[str]] = {}
+        self.load()
+    
+    def load(self):
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            self.dir_mtime = data.get("dir_mtime")
+            self.dates = data.get("dates", {})
+        except (OSError, ValueError):
+            self.dir_mtime = None
+            self.dates = {}
+    
+    def save(self):
+        """サイドカーを原子的に保存"""
+        os.makedirs(os.path.dirname(self.index_path), exist_ok=True)
+        tmp_path = self.index_path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({"dir_mtime": self.dir_mtime, "dates": self.dates}, f, ensure_ascii=False)
+        os.replace(tmp_path, self.index_path)
+    
+    def rebuild(self):
+        """LOGSディレクトリを走査してインデックスを再構築"""
+        os.makedirs(os.path.dirname(self.index_path), exist_ok=True)
+        dates: Dict[str, List[str]] = {}
+        with os.scandir(self.logs_path) as entries:
+            for entry in entries:
+                if entry.name.endswith('.md') and self.DATE_PATTERN.match(entry.name):
+                    dates.setdefault(entry.name[:10], []).append(entry.name)
+        for files in dates.values():
+            files.sort()
+        
+        self.dates = dates
+        self.dir_mtime = os.stat(self.logs_path).st_mtime
+        self.save()
+    
+    def ensure_current(self):
+        if os.stat(self.logs_path).st_mtime != self.dir_mtime:
+            self.rebuild()
+    
+    def find(self, date: str) -> Optional[str]:
+        """指定日の日報ファイルパス（なければNone）"""
+        self.ensure_current()
+        files = self.dates.get(date)
+        if not files:
+            return None
+        return os.path.join(self.logs_path, files[0])
+    
+    def register(self, filename: str):
+        """このプロセスで作成したファイルをインデックスに登録
+        
+        記録済みのdir_mtimeは更新しない（他プロセスによる追加・削除を隠さないよう、
+        次回参照時にディレクトリの変化として検知させて再走査する）
+        """
+        self.load()
+        files = self.dates.setdefault(filename[:10], [])
+        if filename not in files:
+            files.append(filename)
+            files.sort()
+        self.save()
+
+class BufferedLogAppender:
+    """日報への追記バッファ（一定時間・一定サイズ・終了時にまとめて書き込み）"""
+    
+    def __init__(self, path: str, flush_interval: float = 2.0, max_buffer: int = 64 * 1024):
+        self.path = path
+        self.flush_interval = flush_interval
+        self.max_buffer = max_buffer
+        self.buffer: List[str] = []
+        self.buffered_size = 0
+        self.lock = threading.Lock()
+        self.timer = None
+        atexit.register(self.close)
+    
+    def write(self, text: str):
+        with self.lock:
+            self.buffer.append(text)
+            self.buffered_size += len(text)
+            if self.buffered_size >= self.max_buffer:
+                self._flush_locked()
+            elif self.timer is None:
+                # 追記が途切れてもflush_interval以内に書き込む
+                self.timer = threading.Timer(self.flush_interval, self.flush)
+                self.timer.daemon = True
+                self.timer.start()
+    
+    def flush(self):
+        with self.lock:
+            self._flush_locked()
+    
+    def _flush_locked(self):
+        if self.timer is not None:
+            self.timer.cancel()
+            self.timer = None
+        if not self.buffer:
+            return
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write(''.join(self.buffer))
+        self.buffer = []
+        self.buffered_size = 0
+    
+    def close(self):
+        self.flush()
+        atexit.unregister(self.close)
+
 class ClaudeMasterSystem:
     """Claude用完全統合管理システム"""
     
@@ -41,6 +316,8 @@ class ClaudeMasterSystem:
         
         # システム状態
         self.session_log_file = None
+        self.log_locator = None
+        self.log_appender = None
         self.session_start_time = datetime.now()
         self.rules_violations = []
         
@@ -49,14 +326,21 @@ class ClaudeMasterSystem:
         self.force_display_critical_rules()
         self.check_session_log_file()
         
+    @property
+    def claude_rules(self) -> str:
+        """CLAUDE.md の内容（更新時のみ再読み込み）"""
+        return read_rule_file(self.claude_md_path)
+    
+    @property
+    def protection_rules(self) -> str:
+        """日報ログ保護ルールの内容（更新時のみ再読み込み）"""
+        return read_rule_file(self.rules_path)
+    
     def force_load_rules(self):
         """ルール強制読み込み - 必ず実行"""
         try:
-            with open(self.claude_md_path, 'r', encoding='utf-8') as f:
-                self.claude_rules = f.read()
-            
-            with open(self.rules_path, 'r', encoding='utf-8') as f:
-                self.protection_rules = f.read()
+            self.claude_rules
+            self.protection_rules
                 
             print("✅ ルールファイル読み込み完了")
             return True
@@ -82,15 +366,14 @@ class ClaudeMasterSystem:
         """セッション日報ファイルチェック - 1セッション1ファイル強制"""
         today = datetime.now().strftime('%Y-%m-%d')
         
-        # 今日の既存ログファイル検索
-        existing_logs = []
-        for file in os.listdir(self.logs_path):
-            if file.startswith(today) and file.endswith('.md'):
-                existing_logs.append(file)
+        # 今日の既存ログファイル検索（日付インデックス参照）
+        if self.log_locator is None:
+            self.log_locator = DailyLogLocator(self.logs_path)
+        existing_log = self.log_locator.find(today)
         
-        if existing_logs:
-            self.session_log_file = os.path.join(self.logs_path, existing_logs[0])
-            print(f"📝 既存日報ファイル検出: {existing_logs[0]}")
+        if existing_log:
+            self.session_log_file = existing_log
+            print(f"📝 既存日報ファイル検出: {os.path.basename(existing_log)}")
             print("✅ 新しい内容は既存ファイルに追記してください")
         else:
             print(f"📝 今日の日報ファイルなし - 必要時に作成します")
@@ -125,6 +408,8 @@ class ClaudeMasterSystem:
             
             with open(self.session_log_file, 'w', encoding='utf-8') as f:
                 f.write(initial_content)
+            if self.log_locator is not None:
+                self.log_locator.register(filename)
             print(f"📝 新規日報作成: {filename}")
             
         else:
@@ -136,10 +421,17 @@ class ClaudeMasterSystem:
 ---
 """
             
-            with open(self.session_log_file, 'a', encoding='utf-8') as f:
-                f.write(append_content)
+            self.append_session_log(append_content)
             print(f"📝 既存日報に追記完了")
     
+    def append_session_log(self, content: str):
+        """セッション日報へのバッファ付き追記"""
+        if self.log_appender is None or self.log_appender.path != self.session_log_file:
+            if self.log_appender is not None:
+                self.log_appender.close()
+            self.log_appender = BufferedLogAppender(self.session_log_file)
+        self.log_appender.write(content)
+    
     def book_selection_system(self, article_theme: str, target_readers: str = "初心者～中級者"):
         """書籍選定システム - 5つの基準自動チェック"""
         print(f"\n📚 【書籍選定システム起動】")
@@ -183,21 +475,24 @@ class ClaudeMasterSystem:
         self.force_memo_creation(memo_content, "書籍選定作業")
         return checklist
     
+    @property
+    def violation_detector(self) -> ViolationDetector:
+        """ルールファイルから構築した違反検出エンジン（ルール更新時のみ再構築）"""
+        key = []
+        for path in (self.claude_md_path, self.rules_path):
+            try:
+                key.append(os.path.getmtime(path))
+            except OSError:
+                key.append(None)
+        
+        if getattr(self, '_violation_detector_key', None) != key:
+            self._violation_detector = ViolationDetector.from_markdown(self.claude_md_path, self.rules_path)
+            self._violation_detector_key = key
+        return self._violation_detector
+    
     def detect_violations(self, user_input: str = "", claude_output: str = ""):
         """ルール違反検出システム"""
-        violations = []
-        
-        # 新規ファイル作成違反チェック
-        if "新規作成" in claude_output and "日報" in claude_output:
-            violations.append("1セッション1ファイルルール違反の可能性")
-        
-        # メモ指示無視チェック  
-        if any(keyword in user_input for keyword in ["メモして", "記録して", "システム化"]):
-            violations.append("メモ作成指示検出 - 強制記録実行必要")
-        
-        # システム約束違反チェック
-        if "システム作ります" in claude_output:
-            violations.append("システム構築約束 - 完成まで責任を持つ必要")
+        violations = self.violation_detector.detect(user_input, claude_output)
         
         if violations:
             self.display_violation_alert(violations)
@@ -217,6 +512,13 @@ class ClaudeMasterSystem:
         print("⚠️  これらの違反は必ず修正してください")
         print("🚨"*20 + "\n")
     
+    def audit_logs(self, directory: Optional[str] = None) -> List[Dict]:
+        """LOGSディレクトリ全体のルール違反監査"""
+        directory = directory or self.logs_path
+        results = self.violation_detector.audit_directory(directory)
+        print(f"🔍 違反監査完了: {len(results)}件検出 ({directory})")
+        return results
+    
     def auto_system_completion_check(self):
         """システム構築完了チェック"""
         if "システム作ります" in str(getattr(self, '_previous_promises', [])):
@@ -240,26 +542,53 @@ class ClaudeMasterSystem:
 **Claude Master System**: セッション管理完了
 """
             
-            with open(self.session_log_file, 'a', encoding='utf-8') as f:
-                f.write(summary_content)
+            self.append_session_log(summary_content)
+            self.log_appender.flush()
             
             print(f"\n📊 セッションサマリー記録完了: {os.path.basename(self.session_log_file)}")
 
-# グローバル実行（このファイルが読み込まれる度に実行）
-claude_system = ClaudeMasterSystem()
+# 遅延初期化シングルトン（import時には何も実行しない）
+_claude_system: Optional[ClaudeMasterSystem] = None
+
+def get_claude_system() -> ClaudeMasterSystem:
+    """ClaudeMasterSystemを取得（プロセス内で初回呼び出し時のみ初期化）"""
+    global _claude_system
+    if _claude_system is None:
+        _claude_system = ClaudeMasterSystem()
+    return _claude_system
+
+def __getattr__(name: str):
+    """従来の `claude_system` 参照を遅延初期化で提供"""
+    if name == "claude_system":
+        return get_claude_system()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 def memo_now(content: str, memo_type: str = "重要学習"):
     """メモ強制実行関数"""
-    return claude_system.force_memo_creation(content, memo_type)
+    return get_claude_system().force_memo_creation(content, memo_type)
 
 def book_select(theme: str, readers: str = "初心者～中級者"):
     """書籍選定システム実行関数"""
-    return claude_system.book_selection_system(theme, readers)
+    return get_claude_system().book_selection_system(theme, readers)
 
 def check_rules():
     """ルール確認関数"""
-    claude_system.force_display_critical_rules()
+    get_claude_system().force_display_critical_rules()
 
 if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "--audit":
+        # システム起動処理を行わずにログ監査のみ実行
+        workspace = "/Users/satoumasamitsu/Desktop/osigoto/CLAUDE_WORKSPACE"
+        detector = ViolationDetector.from_markdown(
+            os.path.join(workspace, "CLAUDE.md"), os.path.join(workspace, "日報ログ保護ルール.md")
+        )
+        target_dir = sys.argv[2] if len(sys.argv) > 2 else os.path.join(workspace, "LOGS")
+        results = detector.audit_directory(target_dir)
+        for result in results:
+            print(f"🚨 {os.path.basename(result['file'])}:{result['line']} [{result['rule_id']}] {result['message']}")
+        print(f"\n📊 違反監査完了: {len(results)}件")
+        sys.exit(0)
+    
+    get_claude_system()
     print("Claude Master System は正常に初期化されました")
     print("このシステムが毎回実行され、違反を防ぎます")
\ No newline at end of file
@@ -14,7 +14,12 @@
 import sys
 import os
 import json
+import math
 import time
+import atexit
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeoutError
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Any
 from pathlib import Path
@@ -33,6 +38,307 @@ try:
 except Exception as e:
     print(f"⚠️ モジュール読み込みエラー: {e}")
 
+class RunningStats:
+    """全期間の平均・分散（Welford法）"""
+    
+    def __init__(self, state: Optional[Dict] = None):
+        state = state or {}
+        self.count = state.get('count', 0)
+        self.mean = state.get('mean', 0.0)
+        self.m2 = state.get('m2', 0.0)
+        self.min = state.get('min')
+        self.max = state.get('max')
+    
+    def push(self, value: float):
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+    
+    @property
+    def variance(self) -> float:
+        return self.m2 / (self.count - 1) if self.count > 1 else 0.0
+    
+    def to_dict(self) -> Dict:
+        return {'count': self.count, 'mean': self.mean, 'm2': self.m2, 'min': self.min, 'max': self.max}
+    
+    def summary(self) -> Dict:
+        return {'count': self.count, 'mean': self.mean, 'stdev': math.sqrt(self.variance),
+                'min': self.min, 'max': self.max}
+
+class RollingWindowStats:
+    """直近N件の平均・分散（Welford法の追加・削除更新でO(1)）"""
+    
+    def __init__(self, size: int, values: Optional[List[float]] = None):
+        self.size = size
+        self.values = deque(maxlen=size)
+        self.mean = 0.0
+        self.m2 = 0.0
+        for value in values or []:
+            self.push(value)
+    
+    def push(self, value: float):
+        if len(self.values) < self.size:
+            self.values.append(value)
+            delta = value - self.mean
+            self.mean += delta / len(self.values)
+            self.m2 += delta * (value - self.mean)
+        else:
+            # 最古の値を入れ替え
+            removed = self.values[0]
+            self.values.append(value)
+            old_mean = self.mean
+            self.mean += (value - removed) / self.size
+            self.m2 += (value - removed) * (value - self.mean + removed - old_mean)
+            self.m2 = max(self.m2, 0.0)
+    
+    @property
+    def count(self) -> int:
+        return len(self.values)
+    
+    @property
+    def variance(self) -> float:
+        return self.m2 / (self.count - 1) if self.count > 1 else 0.0
+    
+    def summary(self) -> Dict:
+        return {
+            'count': self.count,
+            'mean': self.mean,
+            'stdev': math.sqrt(self.variance),
+            'min': min(self.values) if self.values else None,
+            'max': max(self.values) if self.values else None
+        }
+
+class QualityHistoryStore:
+    """品質履歴の永続時系列ストア（JSONL追記 + 集計スナップショット）
+    
+    履歴本体は quality_history.jsonl に追記し、全期間・各ウィンドウの集計状態は
+    quality_aggregates.json に保存する。スナップショットには反映済みのJSONL位置を記録し、
+    起動時はそれ以降の行だけを再生する。
+    """
+    
+    METRICS = ('quality_score', 'execution_time')
+    
+    def __init__(self, data_dir: str, windows: tuple = (5, 10, 50, 100), snapshot_every: int = 10):
+        self.data_dir = data_dir
+        self.history_path = os.path.join(data_dir, "quality_history.jsonl")
+        self.snapshot_path = os.path.join(data_dir, "quality_aggregates.json")
+        self.windows = tuple(sorted(windows))
+        self.snapshot_every = snapshot_every
+        self.lock = threading.Lock()
+        
+        os.makedirs(data_dir, exist_ok=True)
+        self.load()
+        atexit.register(self.save_snapshot)
+    
+    def reset(self):
+        self.offset = 0
+        self.ready_count = 0
+        self.unsaved = 0
+        self.totals = {metric: RunningStats() for metric in self.METRICS}
+        self.rolling = {metric: {size: RollingWindowStats(size) for size in self.windows} for metric in self.METRICS}
+        self.recent_entries = deque(maxlen=self.windows[-1])
+    
+    def load(self):
+        """スナップショット読み込み + 未反映分のJSONL再生"""
+        self.reset()
+        try:
+            with open(self.snapshot_path, 'r', encoding='utf-8') as f:
+                snapshot = json.load(f)
+            if tuple(snapshot.get('windows', ())) == self.windows:
+                self.offset = snapshot['offset']
+                self.ready_count = snapshot['ready_count']
+                self.recent_entries.extend(snapshot['recent_entries'])
+                for metric in self.METRICS:
+                    self.totals[metric] = RunningStats(snapshot['totals'][metric])
+                    values = [entry[metric] for entry in self.recent_entries]
+                    for size in self.windows:
+                        self.rolling[metric][size] = RollingWindowStats(size, values[-size:])
+        except (OSError, ValueError, KeyError):
+            self.reset()
+        
+        if not os.path.exists(self.history_path):
+            return
+        if os.path.getsize(self.history_path) < self.offset:
+            # 履歴ファイルが差し替えられた場合は全件再生
+            self.reset()
+        
+        replayed = 0
+        with open(self.history_path, 'rb') as f:
+            f.seek(self.offset)
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    break
+                self.offset += len(line)
+                self._apply(entry)
+                replayed += 1
+        
+        # 書き込み途中で終わった最終行は以降の追記と混ざらないよう切り詰め
+        if os.path.getsize(self.history_path) > self.offset:
+            with open(self.history_path, 'r+b') as f:
+                f.truncate(self.offset)
+        if replayed:
+            self.save_snapshot()
+    
+    def _apply(self, entry: Dict):
+        for metric in self.METRICS:
+            value = float(entry.get(metric, 0) or 0)
+            self.totals[metric].push(value)
+            for window in self.rolling[metric].values():
+                window.push(value)
+        if entry.get('is_ready'):
+            self.ready_count += 1
+        self.recent_entries.append(entry)
+    
+    def append(self, entry: Dict):
+        """履歴1件を追記し集計を更新"""
+        line = (json.dumps(entry, ensure_ascii=False) + "\n").encode('utf-8')
+        with self.lock:
+            with open(self.history_path, 'ab') as f:
+                f.write(line)
+            self.offset += len(line)
+            self._apply(entry)
+            self.unsaved += 1
+            if self.unsaved >= self.snapshot_every:
+                self._save_snapshot_locked()
+    
+    def save_snapshot(self):
+        with self.lock:
+            self._save_snapshot_locked()
+    
+    def _save_snapshot_locked(self):
+        snapshot = {
+            'windows': list(self.windows),
+            'offset': self.offset,
+            'ready_count': self.ready_count,
+            'totals': {metric: stats.to_dict() for metric, stats in self.totals.items()},
+            'recent_entries': list(self.recent_entries)
+        }
+        tmp_path = self.snapshot_path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(snapshot, f, ensure_ascii=False)
+        os.replace(tmp_path, self.snapshot_path)
+        self.unsaved = 0
+    
+    # ダッシュボード向けクエリAPI
+    @property
+    def count(self) -> int:
+        return self.totals['quality_score'].count
+    
+    def window(self, metric: str, size: int) -> RollingWindowStats:
+        return self.rolling[metric][size]
+    
+    def query(self, metric: str = 'quality_score', window: Optional[int] = None) -> Dict:
+        """全期間（window=None）または直近N件の集計値"""
+        if window is None:
+            return self.totals[metric].summary()
+        return self.rolling[metric][window].summary()
+    
+    def previous_window_mean(self, metric: str, size: int) -> Optional[float]:
+        """直近size件の1つ前のsize件の平均（2*sizeのウィンドウとの差分から算出）"""
+        outer = self.rolling[metric].get(size * 2)
+        inner = self.rolling[metric][size]
+        if outer is None or outer.count < size * 2:
+            return None
+        return (outer.mean * outer.count - inner.mean * inner.count) / size
+    
+    def recent(self, limit: int = 10) -> List[Dict]:
+        return list(self.recent_entries)[-limit:]
+    
+    def dashboard_summary(self) -> Dict:
+        return {
+            'total_checks': self.count,
+            'ready_rate': self.ready_count / self.count if self.count else 0.0,
+            'metrics': {
+                metric: {
+                    'all': self.query(metric),
+                    'windows': {size: self.query(metric, size) for size in self.windows}
+                } for metric in self.METRICS
+            }
+        }
+
+class HealthProbeRunner:
+    """ヘルスチェックプローブの並列実行（プローブ毎のタイムアウト・正常結果のTTLキャッシュ）
+    
+    プローブは {'status', 'details', 'warnings', 'critical_issues'} を返す関数。
+    status が healthy の結果のみ cache_ttl 秒間再利用する。
+    実行中のスレッドは中断できないため、タイムアウトしたプローブは終了するまで再実行せず「実行継続中」と報告する。
+    """
+    
+    def __init__(self, cache_ttl: float = 30.0, max_workers: int = 8):
+        self.cache_ttl = cache_ttl
+        self.max_workers = max_workers
+        self.probes: Dict[str, Dict] = {}
+        self.cache: Dict[str, tuple] = {}
+        self.running: Dict[str, Any] = {}  # タイムアウト後も終了していないプローブ名 → future
+    
+    def register(self, name: str, func, timeout: float = 5.0, critical: bool = False):
+        """プローブ登録（critical=Trueの失敗は投稿不可扱い）"""
+        self.probes[name] = {'func': func, 'timeout': timeout, 'critical': critical}
+    
+    def invalidate(self, name: Optional[str] = None):
+        if name is None:
+            self.cache.clear()
+        else:
+            self.cache.pop(name, None)
+    
+    def failure(self, name: str, status: str, details: str) -> Dict:
+        issue_key = 'critical_issues' if self.probes[name]['critical'] else 'warnings'
+        result = {'status': status, 'details': details, 'warnings': [], 'critical_issues': []}
+        result[issue_key].append(f'{name}: {details}')
+        return result
+    
+    def run(self, use_cache: bool = True) -> Dict[str, Dict]:
+        """全プローブを並列実行し、プローブ名 → 結果 を登録順で返す"""
+        now = time.monotonic()
+        results = {}
+        futures = {}
+        executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="health_probe")
+        
+        try:
+            for name, probe in self.probes.items():
+                cached = self.cache.get(name)
+                previous = self.running.get(name)
+                if use_cache and cached and now - cached[0] < self.cache_ttl:
+                    results[name] = dict(cached[1], cached=True)
+                elif previous is not None and not previous.done():
+                    # 前回タイムアウトしたプローブがまだ終わっていなければ重ねて起動しない
+                    results[name] = self.failure(name, 'timeout', 'タイムアウト（前回の実行が継続中）')
+                else:
+                    self.running.pop(name, None)
+                    futures[name] = executor.submit(probe['func'])
+            
+            # 全プローブは同時に走っているため、待ち時間は最も遅いプローブで決まる
+            for name, future in futures.items():
+                remaining = max(0.0, now + self.probes[name]['timeout'] - time.monotonic())
+                try:
+                    result = future.result(timeout=remaining)
+                except FuturesTimeoutError:
+                    self.running[name] = future
+                    self.cache.pop(name, None)
+                    state = '実行継続中' if future.running() else '未実行'
+                    results[name] = self.failure(
+                        name, 'timeout', f'タイムアウト（{self.probes[name]["timeout"]}秒・{state}）'
+                    )
+                    continue
+                except Exception as e:
+                    result = self.failure(name, 'error', f'エラー: {e}')
+                
+                results[name] = result
+                if result.get('status') == 'healthy':
+                    self.cache[name] = (time.monotonic(), result)
+                else:
+                    self.cache.pop(name, None)
+        finally:
+            # 未開始のプローブは取り消し、実行中のスレッドは待たずに返す（終了後にスレッドは回収される）
+            executor.shutdown(wait=False, cancel_futures=True)
+        
+        return {name: results[name] for name in self.probes}
+
 class 継続的品質管理統合システム:
     """継続的品質管理統合システム（Phase4完成版）"""
     
@@ -46,6 +352,10 @@ class 継続的品質管理統合システム:
         self.monitor = システム監視品質管理() if 'システム監視品質管理' in globals() else None
         self.wp = WordPressBlogAutomator()
         
+        # ヘルスチェックプローブ（並列実行・タイムアウト付き）
+        self.health_runner = HealthProbeRunner(cache_ttl=30.0)
+        self.register_health_probes()
+        
         # 統合管理設定
         self.management_config = {
             'auto_monitoring': True,
@@ -60,8 +370,8 @@ class 継続的品質管理統合システム:
             }
         }
         
-        # 品質履歴管理
-        self.quality_history = []
+        # 品質履歴管理（システム監視データに永続化）
+        self.quality_store = QualityHistoryStore(os.path.join(self.base_path, "システム監視データ"))
         self.improvement_suggestions = []
         
         # 日報ログシステム参照
@@ -82,9 +392,21 @@ class 継続的品質管理統合システム:
         # 記事データ検証
         validation_result = self.validator.comprehensive_validation(article_data)
         
+        comprehensive_result = self.build_check_result(
+            article_data, validation_result, system_health, time.time() - check_start_time
+        )
+        
+        # 継続的改善実行
+        if self.management_config['continuous_improvement']:
+            self.execute_continuous_improvement()
+        
+        return comprehensive_result
+    
+    def build_check_result(self, article_data: Dict, validation_result: Dict, system_health: Dict,
+                           execution_time: float) -> Dict:
+        """検証結果から統合結果を作成（品質監視記録・品質履歴更新を含む）"""
         # 品質監視記録
         if self.monitor:
-            execution_time = time.time() - check_start_time
             self.monitor.log_validation_result(article_data, validation_result, execution_time)
         
         # 統合結果作成
@@ -95,88 +417,169 @@ class 継続的品質管理統合システム:
             'quality_score': validation_result.get('overall_score', 0),
             'is_ready_for_publish': self.determine_publish_readiness(validation_result, system_health),
             'improvement_actions': self.generate_improvement_actions(validation_result),
-            'execution_time': time.time() - check_start_time
+            'execution_time': execution_time
         }
         
         # 品質履歴更新
         self.update_quality_history(comprehensive_result)
         
-        # 継続的改善実行
+        return comprehensive_result
+    
+    def execute_batch_quality_check(self, articles: List[Dict], sources: Optional[List[str]] = None,
+                                    max_workers: int = 4) -> Dict:
+        """複数記事の一括品質チェック（ヘルスチェックは1回・記事検証は並列実行）"""
+        print(f"🔍 一括品質チェック実行開始: {len(articles)}件")
+        batch_start_time = time.time()
+        sources = sources or [article.get('title', f'#{i + 1}') for i, article in enumerate(articles)]
+        
+        # システムヘルスは全記事で共通
+        system_health = self.perform_system_health_check()
+        
+        # 投稿前確認システムはスレッド安全性が保証されていないため、ワーカースレッドごとに1インスタンスを使う
+        worker_state = threading.local()
+        
+        def validate(article_data: Dict) -> tuple:
+            start_time = time.time()
+            try:
+                if not hasattr(worker_state, 'validator'):
+                    worker_state.validator = 投稿前確認システム()
+                validation_result = worker_state.validator.comprehensive_validation(article_data)
+            except Exception as e:
+                validation_result = {
+                    'overall_valid': False,
+                    'overall_score': 0,
+                    'errors': [f'検証エラー: {e}'],
+                    'warnings': []
+                }
+            return validation_result, time.time() - start_time
+        
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            validations = list(executor.map(validate, articles))
+        
+        # 監視記録・履歴更新は順序を保って逐次実行
+        results = []
+        for article_data, (validation_result, execution_time) in zip(articles, validations):
+            results.append(self.build_check_result(article_data, validation_result, system_health, execution_time))
+        
         if self.management_config['continuous_improvement']:
             self.execute_continuous_improvement()
         
-        return comprehensive_result
-    
-    def perform_system_health_check(self) -> Dict:
-        """システムヘルスチェック実行"""
-        print("🏥 システムヘルスチェック実行中...")
+        articles_report = []
+        for source, article_data, result in zip(sources, articles, results):
+            validation_result = result['validation_result']
+            articles_report.append({
+                'source': source,
+                'title': article_data.get('title', 'N/A'),
+                'quality_score': result['quality_score'],
+                'is_ready_for_publish': result['is_ready_for_publish'],
+                'errors': validation_result.get('errors', []),
+                'warnings': validation_result.get('warnings', []),
+                'improvement_actions': result['improvement_actions'],
+                'execution_time': result['execution_time']
+            })
         
-        health_result = {
-            'overall_healthy': True,
-            'components': {},
-            'warnings': [],
-            'critical_issues': []
+        scores = [result['quality_score'] for result in results]
+        ready_count = sum(1 for result in results if result['is_ready_for_publish'])
+        return {
+            'timestamp': datetime.now().isoformat(),
+            'total_articles': len(results),
+            'ready_count': ready_count,
+            'not_ready_count': len(results) - ready_count,
+            'average_score': sum(scores) / len(scores) if scores else 0,
+            'min_score': min(scores) if scores else 0,
+            'system_health': system_health,
+            'execution_time': time.time() - batch_start_time,
+            'articles': articles_report,
+            'results': results
         }
-        
-        # WordPress API接続確認
+    
+    def register_health_probes(self):
+        """標準ヘルスチェックプローブ登録"""
+        self.health_runner.register('wordpress_api', self.probe_wordpress_api, timeout=10.0, critical=True)
+        self.health_runner.register('disk_space', self.probe_disk_space, timeout=2.0)
+        self.health_runner.register('monitoring_system', self.probe_monitoring_system, timeout=5.0)
+    
+    def probe_wordpress_api(self) -> Dict:
+        """WordPress API接続確認"""
         try:
             wp_healthy = self.wp.test_connection()
-            health_result['components']['wordpress_api'] = {
-                'status': 'healthy' if wp_healthy else 'unhealthy',
-                'details': 'API接続正常' if wp_healthy else 'API接続失敗'
-            }
-            if not wp_healthy:
-                health_result['critical_issues'].append('WordPress API接続不良')
-                health_result['overall_healthy'] = False
         except Exception as e:
-            health_result['components']['wordpress_api'] = {
+            return {
                 'status': 'error',
-                'details': f'接続エラー: {e}'
+                'details': f'接続エラー: {e}',
+                'warnings': [],
+                'critical_issues': [f'WordPress API エラー: {e}']
             }
-            health_result['critical_issues'].append(f'WordPress API エラー: {e}')
-            health_result['overall_healthy'] = False
-        
-        # ディスク容量確認
+        return {
+            'status': 'healthy' if wp_healthy else 'unhealthy',
+            'details': 'API接続正常' if wp_healthy else 'API接続失敗',
+            'warnings': [],
+            'critical_issues': [] if wp_healthy else ['WordPress API接続不良']
+        }
+    
+    def probe_disk_space(self) -> Dict:
+        """ディスク容量確認"""
+        import shutil
         try:
-            import shutil
             disk_usage = shutil.disk_usage(self.base_path)
-            free_gb = disk_usage.free / (1024**3)
-            if free_gb < 1.0:  # 1GB未満
-                health_result['warnings'].append(f'ディスク容量不足: {free_gb:.2f}GB残り')
-                health_result['components']['disk_space'] = {
-                    'status': 'warning',
-                    'details': f'{free_gb:.2f}GB利用可能'
-                }
-            else:
-                health_result['components']['disk_space'] = {
-                    'status': 'healthy',
-                    'details': f'{free_gb:.2f}GB利用可能'
-                }
         except Exception as e:
-            health_result['warnings'].append(f'ディスク容量確認失敗: {e}')
+            return {'status': 'error', 'details': f'{e}', 'warnings': [f'ディスク容量確認失敗: {e}'], 'critical_issues': []}
         
-        # 監視システム確認
-        if self.monitor:
-            try:
-                # 監視システム自動ヘルスチェック
-                monitor_healthy = self.monitor.auto_health_check()
-                health_result['components']['monitoring_system'] = {
-                    'status': 'healthy' if monitor_healthy else 'unhealthy',
-                    'details': '監視システム正常' if monitor_healthy else '監視システム異常'
-                }
-                if not monitor_healthy:
-                    health_result['warnings'].append('監視システム異常')
-            except Exception as e:
-                health_result['components']['monitoring_system'] = {
-                    'status': 'error',
-                    'details': f'監視システムエラー: {e}'
-                }
-                health_result['warnings'].append(f'監視システムエラー: {e}')
-        else:
-            health_result['components']['monitoring_system'] = {
-                'status': 'disabled',
-                'details': '監視システム無効'
+        free_gb = disk_usage.free / (1024**3)
+        if free_gb < 1.0:  # 1GB未満
+            return {
+                'status': 'warning',
+                'details': f'{free_gb:.2f}GB利用可能',
+                'warnings': [f'ディスク容量不足: {free_gb:.2f}GB残り'],
+                'critical_issues': []
+            }
+        return {'status': 'healthy', 'details': f'{free_gb:.2f}GB利用可能', 'warnings': [], 'critical_issues': []}
+    
+    def probe_monitoring_system(self) -> Dict:
+        """監視システム確認"""
+        if not self.monitor:
+            return {'status': 'disabled', 'details': '監視システム無効', 'warnings': [], 'critical_issues': []}
+        
+        try:
+            # 監視システム自動ヘルスチェック
+            monitor_healthy = self.monitor.auto_health_check()
+        except Exception as e:
+            return {
+                'status': 'error',
+                'details': f'監視システムエラー: {e}',
+                'warnings': [f'監視システムエラー: {e}'],
+                'critical_issues': []
+            }
+        return {
+            'status': 'healthy' if monitor_healthy else 'unhealthy',
+            'details': '監視システム正常' if monitor_healthy else '監視システム異常',
+            'warnings': [] if monitor_healthy else ['監視システム異常'],
+            'critical_issues': []
+        }
+    
+    def perform_system_health_check(self, use_cache: bool = True) -> Dict:
+        """システムヘルスチェック実行（プローブ並列実行・正常結果は短時間キャッシュ）"""
+        print("🏥 システムヘルスチェック実行中...")
+        
+        health_result = {
+            'overall_healthy': True,
+            'components': {},
+            'warnings': [],
+            'critical_issues': []
+        }
+        
+        for name, result in self.health_runner.run(use_cache=use_cache).items():
+            health_result['components'][name] = {
+                'status': result.get('status', 'error'),
+                'details': result.get('details', '')
             }
+            if result.get('cached'):
+                health_result['components'][name]['cached'] = True
+            health_result['warnings'].extend(result.get('warnings', []))
+            health_result['critical_issues'].extend(result.get('critical_issues', []))
+        
+        if health_result['critical_issues']:
+            health_result['overall_healthy'] = False
         
         return health_result
     
@@ -240,28 +643,26 @@ class 継続的品質管理統合システム:
             'improvement_count': len(result['improvement_actions'])
         }
         
-        self.quality_history.append(history_entry)
-        
-        # 履歴サイズ制限（最新100件）
-        if len(self.quality_history) > 100:
-            self.quality_history = self.quality_history[-100:]
+        self.quality_store.append(history_entry)
         
         # トレンド分析
-        if len(self.quality_history) >= 5:
+        if self.quality_store.count >= 5:
             self.analyze_quality_trends()
     
+    @property
+    def quality_history(self) -> List[Dict]:
+        """直近の品質履歴（最大100件）"""
+        return self.quality_store.recent(100)
+    
     def analyze_quality_trends(self):
-        """品質トレンド分析"""
-        if len(self.quality_history) < 5:
+        """品質トレンド分析（直近5件と、その前の5件の平均を集計済みウィンドウから比較）"""
+        if self.quality_store.count < 5:
             return
         
-        recent_scores = [entry['quality_score'] for entry in self.quality_history[-5:]]
-        avg_recent = sum(recent_scores) / len(recent_scores)
+        avg_recent = self.quality_store.window('quality_score', 5).mean
+        avg_older = self.quality_store.previous_window_mean('quality_score', 5)
         
-        if len(self.quality_history) >= 10:
-            older_scores = [entry['quality_score'] for entry in self.quality_history[-10:-5]]
-            avg_older = sum(older_scores) / len(older_scores)
-            
+        if avg_older is not None:
             # トレンド判定
             if avg_recent < avg_older - 5:
                 trend_suggestion = "品質スコアが低下傾向です。絶対的見本テンプレートの再確認を推奨します。"
@@ -321,13 +722,18 @@ class 継続的品質管理統合システム:
         dashboard.append(f"🕐 最終更新: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
         dashboard.append(f"📈 システムバージョン: {self.system_version}")
         
-        # 品質履歴サマリー
-        if self.quality_history:
-            recent_scores = [entry['quality_score'] for entry in self.quality_history[-10:]]
-            avg_score = sum(recent_scores) / len(recent_scores)
-            dashboard.append(f"📊 直近平均品質スコア: {avg_score:.1f}/100")
-            dashboard.append(f"🎯 最高スコア: {max(recent_scores)}/100")
-            dashboard.append(f"📉 最低スコア: {min(recent_scores)}/100")
+        # 品質履歴サマリー（集計済みの値を参照）
+        if self.quality_store.count:
+            recent = self.quality_store.query('quality_score', 10)
+            overall = self.quality_store.query('quality_score')
+            execution = self.quality_store.query('execution_time', 10)
+            summary = self.quality_store.dashboard_summary()
+            dashboard.append(f"📊 直近平均品質スコア: {recent['mean']:.1f}/100")
+            dashboard.append(f"🎯 最高スコア: {recent['max']:g}/100")
+            dashboard.append(f"📉 最低スコア: {recent['min']:g}/100")
+            dashboard.append(f"📚 全期間: {overall['count']}件 平均{overall['mean']:.1f} (標準偏差{overall['stdev']:.1f})")
+            dashboard.append(f"✅ 投稿準備完了率: {summary['ready_rate'] * 100:.1f}%")
+            dashboard.append(f"⏱️ 直近平均実行時間: {execution['mean']:.2f}秒")
         
         # 改善提案
         if self.improvement_suggestions:
@@ -360,8 +766,8 @@ class 継続的品質管理統合システム:
             'system_version': self.system_version,
             'quality_score': comprehensive_result.get('article_validation_result', {}).get('overall_score', 0),
             'system_health': comprehensive_result.get('system_health', {}),
-            'total_checks': len(self.quality_history),
-            'avg_score': sum(entry['quality_score'] for entry in self.quality_history) / len(self.quality_history) if self.quality_history else 0
+            'total_checks': self.quality_store.count,
+            'avg_score': self.quality_store.query('quality_score')['mean']
         }
         
         # 既存のシステム監視データ機能を活用（重複レポート生成を停止）
@@ -506,12 +912,105 @@ def execute_integrated_quality_management(article_data: Dict) -> Dict:
     
     return result
 
+def load_batch_articles(source) -> List[tuple]:
+    """一括チェック対象の読み込み → [(ソース名, 記事データ)]
+    
+    source: 記事データJSONを置いたディレクトリ / JSONLファイル / JSONファイル（配列可）/
+            記事データdictまたはファイルパスのリスト
+    """
+    if isinstance(source, (list, tuple)):
+        articles = []
+        for i, item in enumerate(source):
+            if isinstance(item, dict):
+                articles.append((item.get('title', f'#{i + 1}'), item))
+            else:
+                articles.extend(load_batch_articles(item))
+        return articles
+    
+    path = Path(source)
+    if path.is_dir():
+        articles = []
+        for json_path in sorted(path.glob('*.json')):
+            articles.extend(load_batch_articles(str(json_path)))
+        return articles
+    
+    with open(path, 'r', encoding='utf-8') as f:
+        if path.suffix == '.jsonl':
+            return [(f"{path.name}:{line_no}", json.loads(line))
+                    for line_no, line in enumerate(f, 1) if line.strip()]
+        data = json.load(f)
+    
+    if isinstance(data, list):
+        return [(f"{path.name}[{i}]", item) for i, item in enumerate(data)]
+    return [(path.name, data)]
+
+def execute_batch_quality_management(source, max_workers: int = 4, report_path: Optional[str] = None) -> Dict:
+    """一括品質管理実行（システムは1回だけ初期化し全記事で共有）"""
+    print("🚀 継続的品質管理統合システム 一括実行開始")
+    
+    entries = load_batch_articles(source)
+    if not entries:
+        print("⚠️ チェック対象の記事データがありません")
+        return {'total_articles': 0, 'articles': []}
+    
+    integrated_system = 継続的品質管理統合システム()
+    sources = [entry[0] for entry in entries]
+    articles = [entry[1] for entry in entries]
+    
+    batch_report = integrated_system.execute_batch_quality_check(articles, sources, max_workers=max_workers)
+    
+    # ダッシュボード表示
+    print("\n" + integrated_system.generate_quality_dashboard())
+    
+    # 自動日報作成（重要セッションに該当する記事のみ）
+    for article_data, result in zip(articles, batch_report['results']):
+        session_details = {
+            'type': '記事品質管理',
+            'article_title': article_data.get('title', 'N/A'),
+            'user_interaction': False
+        }
+        integrated_system.auto_create_daily_log(result, session_details)
+    
+    # 結果サマリー
+    print("\n🎉 一括品質管理完了")
+    for article in batch_report['articles']:
+        status = "✅" if article['is_ready_for_publish'] else "❌"
+        print(f"{status} {article['quality_score']}/100 {article['title']} ({article['source']})")
+    print(f"\n📊 投稿準備完了: {batch_report['ready_count']}/{batch_report['total_articles']}件")
+    print(f"📊 平均品質スコア: {batch_report['average_score']:.1f}/100")
+    print(f"⏱️ 実行時間: {batch_report['execution_time']:.2f}秒")
+    
+    if report_path:
+        report = {key: value for key, value in batch_report.items() if key != 'results'}
+        with open(report_path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"📄 一括レポート: {report_path}")
+    
+    return batch_report
+
 # CLI実行対応
 def main():
     """メイン実行関数"""
     if len(sys.argv) < 2:
         print("使用方法:")
         print("  python 継続的品質管理統合システム.py [記事データJSONファイル]")
+        print("  python 継続的品質管理統合システム.py --batch [ディレクトリ/JSONL] [--workers N] [--report 出力JSON]")
+        return
+    
+    if sys.argv[1] == '--batch':
+        args = sys.argv[2:]
+        if not args:
+            print("❌ 一括チェック対象を指定してください")
+            return
+        max_workers = int(args[args.index('--workers') + 1]) if '--workers' in args else 4
+        report_path = args[args.index('--report') + 1] if '--report' in args else None
+        
+        try:
+            execute_batch_quality_management(args[0], max_workers=max_workers, report_path=report_path)
+        except FileNotFoundError:
+            print(f"❌ ファイルが見つかりません: {args[0]}")
+        except Exception as e:
+            print(f"❌ エラー: {e}")
         return
     
     json_file_path = sys.argv[1]
@@ -7,37 +7,39 @@ import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from core.wordpress_api import WordPressBlogAutomator
-import requests
-import re
+from seo_html_analyzer import analyze_html
+from wp_local_mirror import open_mirror
 
-def analyze_link_and_tag_seo(post_id):
-    """リンクとタグのSEO最適化状況を詳細分析"""
+def analyze_link_and_tag_seo(post_id, mirror=None):
+    """リンクとタグのSEO最適化状況を詳細分析（ローカルミラーの記事データを使用）"""
     
-    wp = WordPressBlogAutomator()  # 環境変数から自動読み込み
+    if mirror is None:
+        mirror = open_mirror(WordPressBlogAutomator(), types=['posts'])  # 環境変数から自動読み込み
     
-    response = requests.get(f'{wp.api_url}/posts/{post_id}', headers=wp.headers)
-    if response.status_code != 200:
+    post = mirror.get_post(post_id)
+    if not post:
         return None
-        
-    post = response.json()
+    
     title = post['title']['rendered']
     content = post['content']['rendered']
     
     print(f'🔍 リンク・タグSEO分析: {title[:50]}...')
     print('='*80)
     
+    # 本文HTMLを1回だけ走査して全指標を収集
+    analysis = analyze_html(content)
+    
     # 1. リンクのアンカーテキスト分析
     print('🔗 リンクのSEO最適化状況:')
     
     # 内部リンクのアンカーテキスト分析
-    internal_links = re.findall(r'<a[^>]*href=["\']https://muffin-blog\.com[^"\']*["\']*[^>]*>(.*?)</a>', content, re.DOTALL)
+    internal_links = [link.text for link in analysis.internal_links]
     print(f'   内部リンク総数: {len(internal_links)}個')
     
     if internal_links:
         print('   内部リンクアンカーテキスト分析:')
         keyword_internal_count = 0
-        for i, anchor in enumerate(internal_links[:5]):
-            clean_anchor = re.sub(r'<[^>]+>', '', anchor).strip()
+        for i, clean_anchor in enumerate(internal_links[:5]):
             # キーワード含有チェック
             has_keyword = any(kw in clean_anchor for kw in ['Audible', 'お金', '投資', '節約', '始め方'])
             if has_keyword:
@@ -50,14 +52,13 @@ def analyze_link_and_tag_seo(post_id):
             print(f'   内部リンクキーワード含有率: {keyword_internal_ratio:.1f}% (推奨: 80%以上)')
     
     # 外部リンクのアンカーテキスト分析
-    external_links = re.findall(r'<a[^>]*href=["\']https?://(?!muffin-blog\.com)[^"\']*["\']*[^>]*>(.*?)</a>', content, re.DOTALL)
+    external_links = [link.text for link in analysis.external_links]
     print(f'   外部リンク総数: {len(external_links)}個')
     
     if external_links:
         print('   外部リンクアンカーテキスト分析:')
         generic_anchors = 0
-        for i, anchor in enumerate(external_links[:5]):
-            clean_anchor = re.sub(r'<[^>]+>', '', anchor).strip()
+        for i, clean_anchor in enumerate(external_links[:5]):
             # 汎用的なアンカーテキストチェック
             is_generic = clean_anchor in ['こちら', 'ここ', 'クリック', 'リンク', '詳細', '公式サイト']
             if is_generic:
@@ -73,8 +74,8 @@ def analyze_link_and_tag_seo(post_id):
     print(f'\n🏷️ リンク属性のSEO最適化:')
     
     # nofollow属性の分析
-    nofollow_links = len(re.findall(r'rel=["\'][^"\']*nofollow[^"\']*["\']', content))
-    external_links_count = len(re.findall(r'href=["\']https?://(?!muffin-blog\.com)', content))
+    nofollow_links = sum(1 for link in analysis.links if 'nofollow' in link.rel)
+    external_links_count = len(external_links)
     
     print(f'   nofollow設定済みリンク: {nofollow_links}個')
     if external_links_count > 0:
@@ -82,12 +83,12 @@ def analyze_link_and_tag_seo(post_id):
         print(f'   外部リンクnofollow率: {nofollow_ratio:.1f}%')
     
     # target='_blank'の分析
-    blank_links = len(re.findall(r'target=["\']_blank["\']', content))
+    blank_links = sum(1 for link in analysis.links if link.target == '_blank')
     print(f'   新しいタブで開くリンク: {blank_links}個')
     
     # sponsored属性の分析（アフィリエイトリンク用）
-    sponsored_links = len(re.findall(r'rel=["\'][^"\']*sponsored[^"\']*["\']', content))
-    amazon_links = len(re.findall(r'amazon\.|amzn\.', content))
+    sponsored_links = sum(1 for link in analysis.links if 'sponsored' in link.rel)
+    amazon_links = len(analysis.amazon_links)
     print(f'   sponsored属性設定: {sponsored_links}個')
     print(f'   Amazonリンク数: {amazon_links}個')
     
@@ -97,9 +98,9 @@ def analyze_link_and_tag_seo(post_id):
     # 3. 画像のalt属性とSEO最適化
     print(f'\n🖼️ 画像タグのSEO最適化:')
     
-    images = re.findall(r'<img[^>]*>', content)
-    alt_texts = re.findall(r'alt=["\']([^"\']*)["\']', content)
-    title_attrs = re.findall(r'<img[^>]*title=["\']([^"\']*)["\'][^>]*>', content)
+    images = analysis.images
+    alt_texts = analysis.alt_texts
+    title_attrs = [image.title for image in images if image.title is not None]
     
     print(f'   画像総数: {len(images)}個')
     print(f'   alt属性設定: {len(alt_texts)}個 ({len(alt_texts)/len(images)*100 if images else 0:.1f}%)')
@@ -142,10 +143,10 @@ def analyze_link_and_tag_seo(post_id):
     print(f'\n📝 HTMLセマンティック構造:')
     
     # 強調タグの使用状況
-    strong_tags = re.findall(r'<strong[^>]*>(.*?)</strong>', content, re.DOTALL)
-    em_tags = re.findall(r'<em[^>]*>(.*?)</em>', content, re.DOTALL)
-    b_tags = re.findall(r'<b[^>]*>(.*?)</b>', content, re.DOTALL)
-    i_tags = re.findall(r'<i[^>]*>(.*?)</i>', content, re.DOTALL)
+    strong_tags = analysis.emphasis['strong']
+    em_tags = analysis.emphasis['em']
+    b_tags = analysis.emphasis['b']
+    i_tags = analysis.emphasis['i']
     
     print(f'   <strong>タグ: {len(strong_tags)}個 (SEO推奨)')
     print(f'   <em>タグ: {len(em_tags)}個 (SEO推奨)')
@@ -157,59 +158,56 @@ def analyze_link_and_tag_seo(post_id):
     
     # 強調タグ内のキーワード分析
     if strong_tags:
-        keyword_strong = sum(1 for strong in strong_tags if any(kw in re.sub(r'<[^>]+>', '', strong) for kw in ['Audible', 'お金', '投資']))
+        keyword_strong = sum(1 for strong in strong_tags if any(kw in strong for kw in ['Audible', 'お金', '投資']))
         keyword_strong_ratio = keyword_strong / len(strong_tags) * 100
         print(f'   強調タグ内キーワード率: {keyword_strong_ratio:.1f}% (推奨: 30%以上)')
     
     # 5. リスト構造の最適化
     print(f'\n📋 リスト構造の最適化:')
     
-    ul_tags = re.findall(r'<ul[^>]*>', content)
-    ol_tags = re.findall(r'<ol[^>]*>', content)
-    li_tags = re.findall(r'<li[^>]*>', content)
+    ul_count = analysis.tag_counts['ul']
+    ol_count = analysis.tag_counts['ol']
+    li_count = analysis.tag_counts['li']
     
-    print(f'   箇条書きリスト: {len(ul_tags)}個')
-    print(f'   番号付きリスト: {len(ol_tags)}個')
-    print(f'   リスト項目総数: {len(li_tags)}個')
+    print(f'   箇条書きリスト: {ul_count}個')
+    print(f'   番号付きリスト: {ol_count}個')
+    print(f'   リスト項目総数: {li_count}個')
     
-    if len(ul_tags) + len(ol_tags) == 0:
+    if ul_count + ol_count == 0:
         print('   ⚠️ リスト構造未使用（読みやすさとSEOに不利）')
     
     # 6. テーブル構造の最適化
-    table_tags = re.findall(r'<table[^>]*>', content)
-    th_tags = re.findall(r'<th[^>]*>', content)
-    td_tags = re.findall(r'<td[^>]*>', content)
+    table_count = analysis.tag_counts['table']
+    th_count = analysis.tag_counts['th']
+    td_count = analysis.tag_counts['td']
     
     print(f'\n📊 テーブル構造:')
-    print(f'   テーブル数: {len(table_tags)}個')
-    print(f'   ヘッダーセル数: {len(th_tags)}個')
-    print(f'   データセル数: {len(td_tags)}個')
+    print(f'   テーブル数: {table_count}個')
+    print(f'   ヘッダーセル数: {th_count}個')
+    print(f'   データセル数: {td_count}個')
     
-    if len(table_tags) > 0 and len(th_tags) == 0:
+    if table_count > 0 and th_count == 0:
         print('   ⚠️ テーブルにヘッダー行（<th>）が未設定')
     
     # 7. 構造化マークアップの確認
     print(f'\n🏗️ 構造化マークアップ:')
     
     # Schema.org構造化データ
-    json_ld = re.findall(r'<script[^>]*type=["\']application/ld\+json["\'][^>]*>(.*?)</script>', content, re.DOTALL)
-    microdata = re.findall(r'itemtype=["\'][^"\']*["\']', content)
+    json_ld = analysis.json_ld_blocks
+    microdata_count = analysis.microdata_count
     
     print(f'   JSON-LD構造化データ: {len(json_ld)}個')
-    print(f'   Microdata属性: {len(microdata)}個')
+    print(f'   Microdata属性: {microdata_count}個')
     
-    if len(json_ld) == 0 and len(microdata) == 0:
+    if len(json_ld) == 0 and microdata_count == 0:
         print('   ⚠️ 構造化データ未実装（リッチスニペット表示不可）')
     
     # 8. アクセシビリティとSEO
     print(f'\n♿ アクセシビリティ関連:')
     
     # aria属性の使用
-    aria_labels = re.findall(r'aria-label=["\'][^"\']*["\']', content)
-    aria_described = re.findall(r'aria-describedby=["\'][^"\']*["\']', content)
-    
-    print(f'   aria-label属性: {len(aria_labels)}個')
-    print(f'   aria-describedby属性: {len(aria_described)}個')
+    print(f'   aria-label属性: {analysis.aria_label_count}個')
+    print(f'   aria-describedby属性: {analysis.aria_describedby_count}個')
     
     return True
 
@@ -219,8 +217,10 @@ if __name__ == "__main__":
     
     target_posts = [2732, 2677, 2625, 2535, 2210, 649]
     
+    mirror = open_mirror(WordPressBlogAutomator(), types=['posts'])  # 環境変数から自動読み込み
+    
     for post_id in target_posts:
-        analyze_link_and_tag_seo(post_id)
+        analyze_link_and_tag_seo(post_id, mirror)
         print('\n' + '='*80 + '\n')
     
     print('📋 分析完了: リンクとタグの最適化状況を確認しました')
\ No newline at end of file
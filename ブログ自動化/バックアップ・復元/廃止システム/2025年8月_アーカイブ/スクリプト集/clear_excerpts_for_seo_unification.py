@@ -8,7 +8,8 @@ import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from core.wordpress_api import WordPressBlogAutomator
-import requests
+from wp_local_mirror import open_mirror
+from wp_writeback_queue import WriteBackQueue
 
 def clear_excerpts_for_seo_unification():
     """WordPress抜粋を削除してSEO SIMPLE PACKでの一元管理を可能にする"""
@@ -37,73 +38,56 @@ def clear_excerpts_for_seo_unification():
     }
     
     try:
-        # Audible関連記事を取得
-        response = requests.get(f"{wp.api_url}/posts?search=Audible&per_page=100", 
-                               headers=wp.headers)
+        # Audible関連記事をローカルミラーから取得
+        mirror = open_mirror(wp, types=['posts'])
+        posts = mirror.search('Audible')
         
-        if response.status_code == 200:
-            posts = response.json()
+        print(f"📄 {len(posts)}件のAudible関連記事を処理中...")
+        print("\n🎯 WordPress抜粋削除とSEO SIMPLE PACK設定用データ出力:")
+        print("=" * 70)
+        
+        queue = WriteBackQueue(wp, mirror, batch_name="clear_excerpts_seo_unification")
+        
+        for post in posts:
+            post_id = post['id']
+            title = post['title']['rendered']
+            current_excerpt = post['excerpt']['rendered']
             
-            print(f"📄 {len(posts)}件のAudible関連記事を処理中...")
-            print("\n🎯 WordPress抜粋削除とSEO SIMPLE PACK設定用データ出力:")
-            print("=" * 70)
+            # HTMLタグを除去してテキストのみ抽出
+            import re
+            clean_excerpt = re.sub(r'<[^>]+>', '', current_excerpt).strip()
             
-            success_count = 0
+            print(f"\\n📖 記事ID {post_id}: {title}")
             
-            for post in posts:
-                post_id = post['id']
-                title = post['title']['rendered']
-                current_excerpt = post['excerpt']['rendered']
+            if clean_excerpt and len(clean_excerpt) > 10:
+                print(f"🔄 抜粋削除前: {clean_excerpt}")
                 
-                # HTMLタグを除去してテキストのみ抽出
-                import re
-                clean_excerpt = re.sub(r'<[^>]+>', '', current_excerpt).strip()
+                # SEO SIMPLE PACK用のメタディスクリプション（コピー用）
+                recommended_meta = meta_descriptions.get(title, clean_excerpt)
+                print(f"📋 SEO SIMPLE PACK設定推奨値:")
+                print(f"   {recommended_meta}")
                 
-                print(f"\\n📖 記事ID {post_id}: {title}")
-                
-                if clean_excerpt and len(clean_excerpt) > 10:
-                    print(f"🔄 抜粋削除前: {clean_excerpt}")
-                    
-                    # SEO SIMPLE PACK用のメタディスクリプション（コピー用）
-                    recommended_meta = meta_descriptions.get(title, clean_excerpt)
-                    print(f"📋 SEO SIMPLE PACK設定推奨値:")
-                    print(f"   {recommended_meta}")
-                    
-                    # WordPress抜粋を空にする
-                    update_data = {
-                        'excerpt': ''
-                    }
-                    
-                    # 記事を更新
-                    response = requests.post(f"{wp.api_url}/posts/{post_id}", 
-                                           headers=wp.headers, 
-                                           json=update_data)
-                    
-                    if response.status_code == 200:
-                        print("✅ WordPress抜粋削除完了")
-                        success_count += 1
-                    else:
-                        print(f"❌ 削除失敗: {response.status_code}")
-                        print(response.text)
-                else:
-                    print("⏭️  抜粋が空または短いためスキップ")
-            
-            print(f"\\n🎯 処理完了: {success_count}件の記事から抜粋を削除しました")
-            
-            # 手動設定用の説明書出力
-            print("\\n" + "="*70)
-            print("📝 **次の手順**: WordPress管理画面での手動設定")
-            print("="*70)
-            print("1. WordPress管理画面 → 投稿 → 投稿一覧")
-            print("2. 各記事を編集")
-            print("3. 下部のSEO SIMPLE PACKセクションで「メタディスクリプション」に上記の推奨値をコピー&ペースト")
-            print("4. 更新ボタンをクリック")
-            print("\\n✨ これで一元管理が完成します！")
-            
-        else:
-            print(f"❌ 記事取得失敗: {response.status_code}")
-            print(response.text)
-            
+                # WordPress抜粋を空にする
+                queue.enqueue(post_id, {'excerpt': ''}, label=f"記事ID {post_id}")
+            else:
+                print("⏭️  抜粋が空または短いためスキップ")
+        
+        # 抜粋削除をまとめて書き戻し
+        result = queue.run()
+        success_count = result['updated']
+        
+        print(f"\\n🎯 処理完了: {success_count}件の記事から抜粋を削除しました")
+        
+        # 手動設定用の説明書出力
+        print("\\n" + "="*70)
+        print("📝 **次の手順**: WordPress管理画面での手動設定")
+        print("="*70)
+        print("1. WordPress管理画面 → 投稿 → 投稿一覧")
+        print("2. 各記事を編集")
+        print("3. 下部のSEO SIMPLE PACKセクションで「メタディスクリプション」に上記の推奨値をコピー&ペースト")
+        print("4. 更新ボタンをクリック")
+        print("\\n✨ これで一元管理が完成します！")
+        
     except Exception as e:
         print(f"❌ エラー: {e}")
 
@@ -116,22 +100,17 @@ def verify_excerpt_removal():
     print("=" * 40)
     
     try:
-        response = requests.get(f"{wp.api_url}/posts?search=Audible&per_page=10", 
-                               headers=wp.headers)
+        # 差分同期で更新分のみ取得してから確認
+        mirror = open_mirror(wp, types=['posts'])
+        posts = mirror.search('Audible', limit=10)
         
-        if response.status_code == 200:
-            posts = response.json()
+        for post in posts:
+            title = post['title']['rendered']
+            excerpt = post['excerpt']['rendered'].strip()
             
-            for post in posts:
-                title = post['title']['rendered']
-                excerpt = post['excerpt']['rendered'].strip()
-                
-                status = "✅ 削除済み" if not excerpt else f"⚠️  残存: {excerpt[:30]}..."
-                print(f"📖 {title}")
-                print(f"   抜粋状態: {status}")
-                
-        else:
-            print(f"❌ 確認失敗: {response.status_code}")
+            status = "✅ 削除済み" if not excerpt else f"⚠️  残存: {excerpt[:30]}..."
+            print(f"📖 {title}")
+            print(f"   抜粋状態: {status}")
             
     except Exception as e:
         print(f"❌ エラー: {e}")
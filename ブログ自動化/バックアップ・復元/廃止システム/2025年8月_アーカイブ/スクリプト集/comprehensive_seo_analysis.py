@@ -8,19 +8,19 @@ import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from core.wordpress_api import WordPressBlogAutomator
-import requests
-import re
+from seo_html_analyzer import analyze_html
+from wp_local_mirror import open_mirror
 
-def comprehensive_seo_analysis(post_id):
-    """記事の包括的SEO分析"""
+def comprehensive_seo_analysis(post_id, mirror=None):
+    """記事の包括的SEO分析（ローカルミラーの記事データを使用）"""
     
-    wp = WordPressBlogAutomator()  # 環境変数から自動読み込み
+    if mirror is None:
+        mirror = open_mirror(WordPressBlogAutomator(), types=['posts'])  # 環境変数から自動読み込み
     
-    response = requests.get(f'{wp.api_url}/posts/{post_id}', headers=wp.headers)
-    if response.status_code != 200:
+    post = mirror.get_post(post_id)
+    if not post:
         return None
-        
-    post = response.json()
+    
     title = post['title']['rendered']
     content = post['content']['rendered']
     
@@ -42,10 +42,13 @@ def comprehensive_seo_analysis(post_id):
     trigger_count = sum(1 for trigger in emotional_triggers if trigger in title)
     print(f'   感情訴求要素: {trigger_count}個含有')
     
+    # 本文HTMLを1回だけ走査して全指標を収集
+    analysis = analyze_html(content)
+    
     # 2. 見出し構造とSEO最適化分析
-    h1_tags = re.findall(r'<h1[^>]*>(.*?)</h1>', content, re.DOTALL)
-    h2_tags = re.findall(r'<h2[^>]*>(.*?)</h2>', content, re.DOTALL)
-    h3_tags = re.findall(r'<h3[^>]*>(.*?)</h3>', content, re.DOTALL)
+    h1_tags = analysis.headings['h1']
+    h2_tags = analysis.headings['h2']
+    h3_tags = analysis.headings['h3']
     
     print(f'\n🏗️ 見出し構造とキーワード最適化:')
     print(f'   H1: {len(h1_tags)}個 (推奨: 1個)')
@@ -56,8 +59,7 @@ def comprehensive_seo_analysis(post_id):
     if h2_tags:
         keyword_h2_count = 0
         print(f'   H2見出し分析:')
-        for i, h2 in enumerate(h2_tags[:5]):
-            clean_h2 = re.sub(r'<[^>]+>', '', h2).strip()
+        for i, clean_h2 in enumerate(h2_tags[:5]):
             has_keyword = any(kw in clean_h2 for kw in ['Audible', 'お金', '投資', '節約'])
             if has_keyword:
                 keyword_h2_count += 1
@@ -67,8 +69,8 @@ def comprehensive_seo_analysis(post_id):
         print(f'   H2キーワード含有率: {keyword_ratio:.1f}% (推奨: 60%以上)')
     
     # 3. キーワード戦略と密度分析
-    clean_content = re.sub(r'<[^>]+>', '', content)
-    word_count = len(clean_content)
+    clean_content = analysis.text
+    word_count = analysis.char_count
     
     print(f'\n🎯 キーワード戦略分析:')
     
@@ -94,15 +96,15 @@ def comprehensive_seo_analysis(post_id):
             print(f'     ⚠️ メインキーワード密度要調整 (推奨: 0.5-3.0%)')
     
     # 4. 内部リンク戦略分析
-    internal_links = re.findall(r'<a[^>]*href=["\']https://muffin-blog\.com[^"\']*["\']*[^>]*>', content)
-    external_links = re.findall(r'<a[^>]*href=["\']https?://(?!muffin-blog\.com)[^"\']*["\']*[^>]*>', content)
+    internal_links = analysis.internal_links
+    external_links = analysis.external_links
     
     print(f'\n🔗 リンク戦略分析:')
     print(f'   内部リンク: {len(internal_links)}個')
     print(f'   外部リンク: {len(external_links)}個')
     
     # Amazon アフィリエイトリンク分析
-    amazon_links = len(re.findall(r'amazon\.|amzn\.', content))
+    amazon_links = len(analysis.amazon_links)
     print(f'   Amazonリンク: {amazon_links}個')
     
     # リンクバランス評価
@@ -112,8 +114,8 @@ def comprehensive_seo_analysis(post_id):
         print(f'   内部リンク比率: {internal_ratio:.1f}% (推奨: 70-80%)')
     
     # 5. 画像最適化とメディア戦略
-    images = re.findall(r'<img[^>]*>', content)
-    alt_attributes = re.findall(r'alt=["\']([^"\']*)["\']', content)
+    images = analysis.images
+    alt_attributes = analysis.alt_texts
     
     print(f'\n🖼️ 画像・メディア最適化:')
     print(f'   画像数: {len(images)}個')
@@ -130,14 +132,14 @@ def comprehensive_seo_analysis(post_id):
             print(f'   altキーワード含有率: {keyword_alt_ratio:.1f}%')
     
     # 6. コンテンツ品質とユーザビリティ
-    paragraphs = re.findall(r'<p[^>]*>(.*?)</p>', content, re.DOTALL)
+    paragraphs = analysis.paragraphs
     
     print(f'\n📊 コンテンツ品質分析:')
     print(f'   総文字数: {word_count:,}文字')
     print(f'   段落数: {len(paragraphs)}個')
     
     if paragraphs:
-        avg_paragraph_length = sum(len(re.sub(r'<[^>]+>', '', p)) for p in paragraphs) / len(paragraphs)
+        avg_paragraph_length = sum(len(p) for p in paragraphs) / len(paragraphs)
         print(f'   平均段落長: {avg_paragraph_length:.0f}文字 (推奨: 100-200文字)')
     
     # 読みやすさ指標
@@ -194,7 +196,7 @@ def comprehensive_seo_analysis(post_id):
     print(f'\n⚙️ テクニカルSEO課題:')
     
     # 構造化データの確認
-    json_ld = re.findall(r'<script[^>]*type=["\']application/ld\+json["\'][^>]*>', content)
+    json_ld = analysis.json_ld_blocks
     print(f'   構造化データ: {len(json_ld)}個')
     
     # 目次の有無
@@ -212,8 +214,10 @@ if __name__ == "__main__":
     # 主要記事を徹底分析
     target_posts = [2732, 2677, 2535]  # お金の勉強、休会制度、始め方
     
+    mirror = open_mirror(WordPressBlogAutomator(), types=['posts'])  # 環境変数から自動読み込み
+    
     for post_id in target_posts:
-        comprehensive_seo_analysis(post_id)
+        comprehensive_seo_analysis(post_id, mirror)
         print('\n' + '='*80 + '\n')
     
     print('📋 分析完了: 真のSEO改善ポイントを特定しました')
\ No newline at end of file
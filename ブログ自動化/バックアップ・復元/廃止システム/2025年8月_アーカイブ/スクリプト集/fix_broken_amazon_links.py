@@ -8,9 +8,23 @@ import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from core.wordpress_api import WordPressBlogAutomator
-import requests
+from wp_local_mirror import open_mirror
+from wp_writeback_queue import WriteBackQueue
+from seo_html_analyzer import analyze_posts
+from link_audit import missing_sponsored_links
 import re
 
+def editable_content(post):
+    """書き戻し用の本文（編集用raw値）
+
+    rendered はショートコード展開・ブロックコメント除去・wpautop適用後のHTMLのため、
+    書き戻すと元のマークアップが失われる。raw が取得できていない記事は更新しない。
+    """
+    content = post.get('content')
+    if isinstance(content, dict) and isinstance(content.get('raw'), str):
+        return content['raw']
+    return None
+
 def fix_broken_amazon_links():
     """Amazonアフィリエイトリンクを緊急修正"""
     
@@ -41,27 +55,36 @@ def fix_broken_amazon_links():
         "https://www.amazon.co.jp/hz/contact-us/foresight/hubgateway": "https://www.amazon.co.jp/gp/help/customer/contact-us",
     }
     
-    # 修正対象記事ID
-    target_posts = [2732, 2677, 2625, 2535, 2210]
+    # 修正対象記事（公開記事のうちAmazon・Audibleリンクを含むもの）
+    mirror = open_mirror(wp, types=['posts'])
+    target_posts = [
+        post['id'] for post, analysis in analyze_posts(mirror.iter_objects('posts', status='publish'))
+        if any(link.is_amazon or 'audible.co.jp' in link.href for link in analysis.links)
+    ]
+    print(f"📄 Amazon・Audibleリンクを含む記事: {len(target_posts)}件")
+    queue = WriteBackQueue(wp, mirror, batch_name="fix_broken_amazon_links")
     
-    total_fixes = 0
+    fixes_by_post = {}
     
     for post_id in target_posts:
         try:
             print(f"\n🔧 記事ID {post_id} のリンク修正中...")
             
-            # 記事取得
-            response = requests.get(f"{wp.api_url}/posts/{post_id}", headers=wp.headers)
-            if response.status_code != 200:
+            # 記事取得（ローカルミラー）
+            post = mirror.get_post(post_id)
+            if not post:
                 print(f"❌ 記事ID {post_id} 取得失敗")
                 continue
                 
-            post = response.json()
             title = post['title']['rendered']
-            content = post['content']['rendered']
+            content = editable_content(post)
             
             print(f"   記事: {title[:40]}...")
             
+            if content is None:
+                print(f"   ⚠️ 記事ID {post_id}: 編集用本文(raw)が未取得のためスキップ（認証付きでミラーを同期してください）")
+                continue
+            
             # リンク修正実行
             modified_content = content
             post_fixes = 0
@@ -90,22 +113,19 @@ def fix_broken_amazon_links():
             
             # 修正がある場合のみ更新
             if post_fixes > 0:
-                update_data = {'content': modified_content}
-                update_response = requests.post(f"{wp.api_url}/posts/{post_id}", 
-                                              headers=wp.headers, 
-                                              json=update_data)
-                
-                if update_response.status_code == 200:
-                    print(f"   ✅ 記事ID {post_id}: {post_fixes}件のリンクを修正完了")
-                    total_fixes += post_fixes
-                else:
-                    print(f"   ❌ 記事ID {post_id}: 更新失敗 ({update_response.status_code})")
+                queue.enqueue(post_id, {'content': modified_content}, label=f"記事ID {post_id}（{post_fixes}件のリンク修正）")
+                fixes_by_post[post_id] = post_fixes
             else:
                 print(f"   ℹ️ 記事ID {post_id}: 修正対象リンクなし")
                 
         except Exception as e:
             print(f"❌ 記事ID {post_id}: エラー - {e}")
     
+    result = queue.run()
+    total_fixes = sum(
+        fixes_by_post[item['job']['id']] for item in result['results'] if item['state'] != 'failed'
+    )
+    
     print(f"\n🎯 リンク修正完了!")
     print(f"総修正件数: {total_fixes}件")
     
@@ -119,19 +139,27 @@ def add_sponsored_attributes():
     print("\n🏷️ Amazonリンクにsponsored属性追加")
     print("-" * 40)
     
-    target_posts = [2732, 2677, 2625, 2535, 2210]
+    # sponsored未設定のAmazonリンクを含む公開記事のみ対象
+    mirror = open_mirror(wp, types=['posts'])
+    target_posts = [
+        post['id'] for post, analysis in analyze_posts(mirror.iter_objects('posts', status='publish'))
+        if missing_sponsored_links(analysis)
+    ]
+    queue = WriteBackQueue(wp, mirror, batch_name="add_sponsored_attributes")
     
     for post_id in target_posts:
         try:
-            response = requests.get(f"{wp.api_url}/posts/{post_id}", headers=wp.headers)
-            if response.status_code != 200:
+            post = mirror.get_post(post_id)
+            if not post:
                 continue
                 
-            post = response.json()
-            content = post['content']['rendered']
+            content = editable_content(post)
+            if content is None:
+                print(f"   ⚠️ 記事ID {post_id}: 編集用本文(raw)が未取得のためスキップ（認証付きでミラーを同期してください）")
+                continue
             
             # Amazonリンクにrel="sponsored"を追加
-            amazon_pattern = r'<a([^>]*href=["\'][^"\']*amazon[^"\']*["\'][^>]*)>'
+            amazon_pattern = r'<a([^>]*href=["\'][^"\']*(?:amazon|amzn)\.[^"\']*["\'][^>]*)>'
             
             def add_sponsored(match):
                 link_attrs = match.group(1)
@@ -147,20 +175,14 @@ def add_sponsored_attributes():
             modified_content = re.sub(amazon_pattern, add_sponsored, content)
             
             if modified_content != content:
-                update_data = {'content': modified_content}
-                update_response = requests.post(f"{wp.api_url}/posts/{post_id}", 
-                                              headers=wp.headers, 
-                                              json=update_data)
-                
-                if update_response.status_code == 200:
-                    print(f"   ✅ 記事ID {post_id}: sponsored属性追加完了")
-                else:
-                    print(f"   ❌ 記事ID {post_id}: 属性追加失敗")
+                queue.enqueue(post_id, {'content': modified_content}, label=f"記事ID {post_id}（sponsored属性追加）")
             else:
                 print(f"   ℹ️ 記事ID {post_id}: 既に設定済み")
                 
         except Exception as e:
             print(f"❌ 記事ID {post_id}: エラー - {e}")
+    
+    queue.run()
 
 if __name__ == "__main__":
     print("🚨 Amazonリンク緊急修正システム")
@@ -174,4 +196,4 @@ if __name__ == "__main__":
     
     print(f"\n✅ 緊急修正完了!")
     print(f"💰 {fixes}件のアフィリエイトリンクが復活しました")
-    print("🔍 再度ヘルスチェックを実行して確認することを推奨します")
\ No newline at end of file
+    print("🔍 link_audit.py でサイト全体のリンクを再確認することを推奨します")
\ No newline at end of file
@@ -8,6 +8,8 @@ import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from core.wordpress_api import WordPressBlogAutomator
+from wp_local_mirror import open_mirror
+from wp_writeback_queue import WriteBackQueue
 import requests
 
 def fix_all_excerpts_automatically():
@@ -27,31 +29,17 @@ def fix_all_excerpts_automatically():
         2210: "Audibleで人生が変わる！効率的な学習方法と時間活用術を紹介。通勤時間を自己投資の時間に変える具体的な方法を解説します。"
     }
     
-    success_count = 0
+    mirror = open_mirror(wp, types=['posts'])
+    queue = WriteBackQueue(wp, mirror, batch_name="fix_excerpt_display")
     
     for post_id, meta_description in meta_descriptions.items():
-        try:
-            print(f"🔄 記事ID {post_id} を処理中...")
-            
-            # WordPress抜粋を直接設定
-            update_data = {
-                'excerpt': meta_description
-            }
-            
-            response = requests.post(f"{wp.api_url}/posts/{post_id}", 
-                                   headers=wp.headers, 
-                                   json=update_data)
-            
-            if response.status_code == 200:
-                print(f"✅ 記事ID {post_id}: 抜粋設定完了")
-                print(f"   設定内容: {meta_description}")
-                success_count += 1
-            else:
-                print(f"❌ 記事ID {post_id}: 設定失敗 ({response.status_code})")
-                print(f"   エラー: {response.text}")
-                
-        except Exception as e:
-            print(f"❌ 記事ID {post_id}: エラー - {e}")
+        print(f"🔄 記事ID {post_id}: {meta_description}")
+        
+        # WordPress抜粋を直接設定
+        queue.enqueue(post_id, {'excerpt': meta_description}, label=f"記事ID {post_id}")
+    
+    result = queue.run()
+    success_count = result['succeeded']
     
     print(f"\n🎯 処理完了: {success_count}/{len(meta_descriptions)}件の記事を自動設定")
     return success_count
@@ -64,13 +52,15 @@ def verify_automatic_changes():
     print("\n🔍 自動設定結果の確認")
     print("=" * 40)
     
+    # 差分同期で更新分のみ取得してから確認
+    mirror = open_mirror(wp, types=['posts'])
+    
     target_post_ids = [2732, 2677, 2625, 2535, 2210]
     
     for post_id in target_post_ids:
         try:
-            response = requests.get(f"{wp.api_url}/posts/{post_id}", headers=wp.headers)
-            if response.status_code == 200:
-                post = response.json()
+            post = mirror.get_post(post_id)
+            if post:
                 title = post['title']['rendered']
                 excerpt = post['excerpt']['rendered']
                 
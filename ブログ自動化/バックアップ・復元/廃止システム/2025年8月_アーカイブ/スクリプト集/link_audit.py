@@ -0,0 +1,333 @@
+"""
+サイト全体のリンク監査
+全記事の外部リンクを抽出・重複排除し、ホスト単位の同時接続制限付きで並列チェックする
+チェック結果は永続キャッシュに保存し、記事ごとにリンク切れ・リダイレクト・sponsored未設定を報告する
+"""
+
+import os
+import json
+import time
+import sqlite3
+import threading
+from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field, asdict
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+from urllib.parse import urlsplit, urlunsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from seo_html_analyzer import analyze_post
+
+DEFAULT_CACHE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "link_check.sqlite3")
+USER_AGENT = "Mozilla/5.0 (compatible; muffin-blog-link-audit/1.0)"
+
+# リダイレクトが前提の短縮URL（リダイレクトとしては報告しない）
+SHORTENER_HOSTS = ('amzn.to', 'amzn.asia', 'bit.ly', 'a.r10.to', 'px.a8.net')
+# HEADを受け付けないサーバー向けにGETで再確認するステータス
+HEAD_FALLBACK_STATUS = (403, 405, 501)
+# リンク切れと判定するステータス（それ以外の4xx/5xxはボット対策の可能性があるため要確認扱い）
+BROKEN_STATUS = (404, 410)
+
+@dataclass
+class LinkCheckResult:
+    url: str
+    outcome: str  # ok / redirect / broken / error
+    status: Optional[int]
+    final_url: str
+    error: str = ""
+    checked_at: float = 0.0
+
+@dataclass
+class PostLinkReport:
+    """1記事分のリンク監査結果"""
+    post_id: int
+    title: str
+    link: str
+    broken: List[LinkCheckResult] = field(default_factory=list)
+    redirected: List[LinkCheckResult] = field(default_factory=list)
+    errors: List[LinkCheckResult] = field(default_factory=list)
+    missing_sponsored: List[str] = field(default_factory=list)
+
+    @property
+    def has_issues(self) -> bool:
+        return bool(self.broken or self.redirected or self.errors or self.missing_sponsored)
+
+def normalize_url(href: str) -> str:
+    """重複判定用にフラグメントを除去（プロトコル相対URLは https: として扱う）"""
+    parts = urlsplit(href.strip())
+    return urlunsplit((parts.scheme or 'https', parts.netloc.lower(), parts.path, parts.query, ''))
+
+def url_host(url: str) -> str:
+    return urlsplit(url).netloc.lower()
+
+def missing_sponsored_links(analysis) -> List[str]:
+    """rel="sponsored" が付いていないAmazonリンク"""
+    return [link.href for link in analysis.amazon_links if 'sponsored' not in link.rel]
+
+def collect_site_links(posts: Iterable[Dict]) -> tuple:
+    """全記事から外部リンクを抽出
+
+    戻り値: (記事IDごとのレポート, URL → 掲載記事IDの集合)
+    """
+    reports: Dict[int, PostLinkReport] = {}
+    url_posts: Dict[str, set] = defaultdict(set)
+
+    for post in posts:
+        analysis = analyze_post(post)
+        reports[post['id']] = PostLinkReport(
+            post_id=post['id'],
+            title=post['title']['rendered'],
+            link=post.get('link', ''),
+            missing_sponsored=missing_sponsored_links(analysis)
+        )
+        for link in analysis.external_links:
+            url_posts[normalize_url(link.href)].add(post['id'])
+
+    return reports, url_posts
+
+class HostThrottle:
+    """ホスト単位の同時接続数と最小リクエスト間隔"""
+
+    def __init__(self, per_host: int, interval: float):
+        self.per_host = per_host
+        self.interval = interval
+        self.lock = threading.Lock()
+        self.semaphores: Dict[str, threading.Semaphore] = {}
+        self.next_slot: Dict[str, float] = {}
+
+    def semaphore(self, host: str) -> threading.Semaphore:
+        with self.lock:
+            if host not in self.semaphores:
+                self.semaphores[host] = threading.Semaphore(self.per_host)
+            return self.semaphores[host]
+
+    def wait_turn(self, host: str):
+        with self.lock:
+            now = time.monotonic()
+            slot = max(now, self.next_slot.get(host, 0.0))
+            self.next_slot[host] = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+class LinkChecker:
+    """外部リンクの並列チェッカー（ホスト単位の流量制限・永続キャッシュ付き）"""
+
+    def __init__(self, cache_path: str = DEFAULT_CACHE_PATH, max_workers: int = 16, per_host: int = 2,
+                 host_interval: float = 0.5, timeout: float = 10, ok_ttl_days: float = 7, error_ttl_days: float = 1):
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.ok_ttl = ok_ttl_days * 86400
+        self.error_ttl = error_ttl_days * 86400
+        self.throttle = HostThrottle(per_host, host_interval)
+
+        self.session = requests.Session()
+        self.session.headers['User-Agent'] = USER_AGENT
+        adapter = HTTPAdapter(pool_connections=max_workers, pool_maxsize=max_workers)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(cache_path, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS link_checks (
+                url TEXT PRIMARY KEY,
+                outcome TEXT NOT NULL,
+                status INTEGER,
+                final_url TEXT,
+                error TEXT,
+                checked_at REAL NOT NULL
+            )
+        """)
+
+    # ---- キャッシュ ----
+
+    def cached(self, url: str) -> Optional[LinkCheckResult]:
+        """有効期限内のチェック結果（正常は長め・異常は短めに保持）"""
+        with self.lock:
+            row = self.conn.execute("SELECT * FROM link_checks WHERE url = ?", (url,)).fetchone()
+        if not row:
+            return None
+        ttl = self.ok_ttl if row['outcome'] in ('ok', 'redirect') else self.error_ttl
+        if time.time() - row['checked_at'] > ttl:
+            return None
+        if row['outcome'] == 'redirect' and row['final_url'] == requests.Request('GET', url).prepare().url:
+            # エンコードの違いだけで誤ってリダイレクト判定された旧結果は再確認
+            return None
+        return LinkCheckResult(row['url'], row['outcome'], row['status'], row['final_url'] or '',
+                               row['error'] or '', row['checked_at'])
+
+    def store(self, result: LinkCheckResult):
+        with self.lock, self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO link_checks (url, outcome, status, final_url, error, checked_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (result.url, result.outcome, result.status, result.final_url, result.error, result.checked_at)
+            )
+
+    # ---- チェック ----
+
+    def request(self, method: str, url: str) -> requests.Response:
+        host = url_host(url)
+        with self.throttle.semaphore(host):
+            self.throttle.wait_turn(host)
+            response = self.session.request(method, url, allow_redirects=True, timeout=self.timeout, stream=True)
+            response.close()
+            return response
+
+    def check_url(self, url: str) -> LinkCheckResult:
+        """1件チェック（HEADで確認し、拒否された場合のみGETで再確認）"""
+        try:
+            response = self.request('HEAD', url)
+            if response.status_code in HEAD_FALLBACK_STATUS:
+                response = self.request('GET', url)
+        except requests.Timeout as e:
+            return LinkCheckResult(url, 'error', None, '', type(e).__name__, time.time())
+        except (requests.ConnectionError, requests.exceptions.InvalidURL) as e:
+            return LinkCheckResult(url, 'broken', None, '', type(e).__name__, time.time())
+        except requests.RequestException as e:
+            return LinkCheckResult(url, 'error', None, '', type(e).__name__, time.time())
+
+        status = response.status_code
+        final_url = response.url
+        if status in BROKEN_STATUS:
+            outcome = 'broken'
+        elif status >= 400:
+            outcome = 'error'
+        elif (response.history and url_host(url) not in SHORTENER_HOSTS
+              and final_url.rstrip('/') != response.history[0].url.rstrip('/')):
+            # 比較はrequestsがエンコードした送信URLと行う（日本語パスの記事リンクを自己リダイレクト扱いしない）
+            outcome = 'redirect'
+        else:
+            outcome = 'ok'
+        return LinkCheckResult(url, outcome, status, final_url, '', time.time())
+
+    @staticmethod
+    def interleave_by_host(urls: Iterable[str]) -> List[str]:
+        """同一ホストのURLが連続しないよう並べ替え（ワーカーが1ホストの待ちで埋まるのを防ぐ）"""
+        queues: Dict[str, deque] = defaultdict(deque)
+        for url in urls:
+            queues[url_host(url)].append(url)
+        ordered = []
+        while queues:
+            for host in list(queues):
+                ordered.append(queues[host].popleft())
+                if not queues[host]:
+                    del queues[host]
+        return ordered
+
+    def check_all(self, urls: Iterable[str], refresh: bool = False) -> Dict[str, LinkCheckResult]:
+        """重複排除済みURLを並列チェック（キャッシュ有効分はリクエストしない）"""
+        results = {}
+        pending = []
+        for url in sorted(set(urls)):
+            cached = None if refresh else self.cached(url)
+            if cached:
+                results[url] = cached
+            else:
+                pending.append(url)
+
+        print(f"🔗 リンクチェック: {len(results) + len(pending)}件（キャッシュ{len(results)}件・新規確認{len(pending)}件）")
+        started = time.time()
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            for index, result in enumerate(executor.map(self.check_url, self.interleave_by_host(pending)), 1):
+                self.store(result)
+                results[result.url] = result
+                if index % 50 == 0:
+                    print(f"   ... {index}/{len(pending)}件確認済み")
+
+        print(f"✅ リンクチェック完了 ({time.time() - started:.1f}秒)")
+        return results
+
+    def close(self):
+        self.session.close()
+        self.conn.close()
+
+def audit_links(posts: Iterable[Dict], checker: LinkChecker, refresh: bool = False) -> List[PostLinkReport]:
+    """記事群のリンクを監査し、記事ごとのレポートを返す"""
+    reports, url_posts = collect_site_links(posts)
+    results = checker.check_all(url_posts, refresh=refresh)
+
+    for url, post_ids in url_posts.items():
+        result = results[url]
+        for post_id in post_ids:
+            report = reports[post_id]
+            if result.outcome == 'broken':
+                report.broken.append(result)
+            elif result.outcome == 'redirect':
+                report.redirected.append(result)
+            elif result.outcome == 'error':
+                report.errors.append(result)
+
+    return sorted(reports.values(), key=lambda report: report.post_id, reverse=True)
+
+def print_audit_report(reports: List[PostLinkReport]):
+    """問題のある記事のみ表示"""
+    problem_reports = [report for report in reports if report.has_issues]
+    print(f"\n📋 リンク監査レポート: {len(reports)}記事中{len(problem_reports)}記事に要対応リンク")
+    print("=" * 70)
+
+    for report in problem_reports:
+        print(f"\n📖 記事ID {report.post_id}: {report.title[:40]}")
+        for result in report.broken:
+            print(f"   ❌ リンク切れ ({result.status or result.error}): {result.url}")
+        for result in report.errors:
+            print(f"   ⚠️  要確認 ({result.status or result.error}): {result.url}")
+        for result in report.redirected:
+            print(f"   ↪️  リダイレクト: {result.url} → {result.final_url}")
+        for href in report.missing_sponsored:
+            print(f"   🏷️ sponsored未設定: {href}")
+
+    totals = {
+        'broken': sum(len(report.broken) for report in reports),
+        'errors': sum(len(report.errors) for report in reports),
+        'redirected': sum(len(report.redirected) for report in reports),
+        'missing_sponsored': sum(len(report.missing_sponsored) for report in reports)
+    }
+    print(f"\n🎯 合計: リンク切れ{totals['broken']}件 / 要確認{totals['errors']}件 / "
+          f"リダイレクト{totals['redirected']}件 / sponsored未設定{totals['missing_sponsored']}件")
+    return totals
+
+def save_audit_report(reports: List[PostLinkReport], path: str):
+    data = {
+        'generated_at': datetime.now().isoformat(),
+        'posts': [asdict(report) for report in reports if report.has_issues]
+    }
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+    print(f"💾 レポート保存: {path}")
+
+def run_site_link_audit(wp, refresh: bool = False, report_path: Optional[str] = None) -> List[PostLinkReport]:
+    """公開記事全体のリンク監査（ミラーを差分同期してから実行）"""
+    from wp_local_mirror import open_mirror
+
+    mirror = open_mirror(wp, types=['posts'])
+    checker = LinkChecker()
+    try:
+        reports = audit_links(mirror.iter_objects('posts', status='publish'), checker, refresh=refresh)
+    finally:
+        checker.close()
+        mirror.close()
+
+    print_audit_report(reports)
+    if report_path:
+        save_audit_report(reports, report_path)
+    return reports
+
+if __name__ == "__main__":
+    import sys
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from core.wordpress_api import WordPressBlogAutomator
+
+    report_path = None
+    if '--report' in sys.argv:
+        report_path = sys.argv[sys.argv.index('--report') + 1]
+
+    print("🔍 サイト全体リンク監査")
+    print("=" * 60)
+    run_site_link_audit(WordPressBlogAutomator(), refresh='--refresh' in sys.argv, report_path=report_path)
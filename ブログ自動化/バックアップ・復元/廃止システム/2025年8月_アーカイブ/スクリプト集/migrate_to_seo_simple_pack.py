@@ -8,7 +8,8 @@ import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from core.wordpress_api import WordPressBlogAutomator
-import requests
+from wp_local_mirror import open_mirror
+from wp_writeback_queue import WriteBackQueue
 
 def migrate_excerpts_to_seo_simple_pack():
     """WordPress抜粋をSEO SIMPLE PACKのメタディスクリプションに移行"""
@@ -19,58 +20,42 @@ def migrate_excerpts_to_seo_simple_pack():
     print("=" * 60)
     
     try:
-        # Audible関連記事を取得
-        response = requests.get(f"{wp.api_url}/posts?search=Audible&per_page=100", 
-                               headers=wp.headers)
+        # Audible関連記事をローカルミラーから取得
+        mirror = open_mirror(wp, types=['posts'])
+        posts = mirror.search('Audible')
         
-        if response.status_code == 200:
-            posts = response.json()
-            
-            print(f"📄 {len(posts)}件のAudible関連記事を処理中...")
+        print(f"📄 {len(posts)}件のAudible関連記事を処理中...")
+        
+        queue = WriteBackQueue(wp, mirror, batch_name="migrate_seo_simple_pack")
+        
+        for post in posts:
+            post_id = post['id']
+            title = post['title']['rendered']
+            current_excerpt = post['excerpt']['rendered']
             
-            success_count = 0
+            # HTMLタグを除去してテキストのみ抽出
+            import re
+            clean_excerpt = re.sub(r'<[^>]+>', '', current_excerpt).strip()
             
-            for post in posts:
-                post_id = post['id']
-                title = post['title']['rendered']
-                current_excerpt = post['excerpt']['rendered']
+            if clean_excerpt and len(clean_excerpt) > 10:
+                print(f"\n📖 記事: {title}")
+                print(f"移行する内容: {clean_excerpt}")
                 
-                # HTMLタグを除去してテキストのみ抽出
-                import re
-                clean_excerpt = re.sub(r'<[^>]+>', '', current_excerpt).strip()
-                
-                if clean_excerpt and len(clean_excerpt) > 10:
-                    print(f"\n📖 記事: {title}")
-                    print(f"移行する内容: {clean_excerpt}")
-                    
-                    # SEO SIMPLE PACKのメタディスクリプションフィールドに設定
-                    update_data = {
-                        'meta': {
-                            '_ssp_description': clean_excerpt
-                        },
-                        'excerpt': ''  # WordPress抜粋を空にする
-                    }
-                    
-                    # 記事を更新
-                    response = requests.post(f"{wp.api_url}/posts/{post_id}", 
-                                           headers=wp.headers, 
-                                           json=update_data)
-                    
-                    if response.status_code == 200:
-                        print("✅ SEO SIMPLE PACKに移行完了")
-                        success_count += 1
-                    else:
-                        print(f"❌ 移行失敗: {response.status_code}")
-                        print(response.text)
-                else:
-                    print(f"\n⏭️  スキップ: {title} (抜粋が空または短すぎる)")
-            
-            print(f"\n🎯 移行完了: {success_count}件の記事を処理しました")
-            
-        else:
-            print(f"❌ 記事取得失敗: {response.status_code}")
-            print(response.text)
-            
+                # SEO SIMPLE PACKのメタディスクリプションフィールドに設定し、WordPress抜粋を空にする
+                queue.enqueue(post_id, {
+                    'meta': {
+                        '_ssp_description': clean_excerpt
+                    },
+                    'excerpt': ''
+                }, label=title)
+            else:
+                print(f"\n⏭️  スキップ: {title} (抜粋が空または短すぎる)")
+        
+        result = queue.run()
+        success_count = result['succeeded']
+        
+        print(f"\n🎯 移行完了: {success_count}件の記事を処理しました")
+        
     except Exception as e:
         print(f"❌ エラー: {e}")
 
@@ -83,25 +68,19 @@ def verify_migration():
     print("=" * 40)
     
     try:
-        # 移行済み記事を確認
-        response = requests.get(f"{wp.api_url}/posts?search=Audible&per_page=10", 
-                               headers=wp.headers)
+        # 移行済み記事を確認（差分同期で更新分のみ取得）
+        mirror = open_mirror(wp, types=['posts'])
+        posts = mirror.search('Audible', limit=10)
         
-        if response.status_code == 200:
-            posts = response.json()
+        for post in posts:
+            title = post['title']['rendered']
+            excerpt = post['excerpt']['rendered']
+            meta = post.get('meta', {})
+            ssp_description = meta.get('_ssp_description', '未設定')
             
-            for post in posts:
-                title = post['title']['rendered']
-                excerpt = post['excerpt']['rendered']
-                meta = post.get('meta', {})
-                ssp_description = meta.get('_ssp_description', '未設定')
-                
-                print(f"\n📖 {title}")
-                print(f"   WordPress抜粋: {'空' if not excerpt.strip() else '設定済み'}")
-                print(f"   SEO SIMPLE PACK: {ssp_description[:50]}..." if len(ssp_description) > 50 else f"   SEO SIMPLE PACK: {ssp_description}")
-                
-        else:
-            print(f"❌ 確認失敗: {response.status_code}")
+            print(f"\n📖 {title}")
+            print(f"   WordPress抜粋: {'空' if not excerpt.strip() else '設定済み'}")
+            print(f"   SEO SIMPLE PACK: {ssp_description[:50]}..." if len(ssp_description) > 50 else f"   SEO SIMPLE PACK: {ssp_description}")
             
     except Exception as e:
         print(f"❌ エラー: {e}")
@@ -8,7 +8,8 @@ import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from core.wordpress_api import WordPressBlogAutomator
-import requests
+from wp_local_mirror import open_mirror
+from wp_writeback_queue import WriteBackQueue
 
 def optimize_all_meta_descriptions_to_60chars():
     """全記事のメタディスクリプションを60文字に最適化"""
@@ -31,43 +32,30 @@ def optimize_all_meta_descriptions_to_60chars():
         649: "コスモ石油のコミっと車検を実際に利用した体験談。料金・サービス・注意点を実体験で詳しく解説。"
     }
     
-    success_count = 0
+    mirror = open_mirror(wp, types=['posts'])
+    queue = WriteBackQueue(wp, mirror, batch_name="meta_description_60chars")
     
     for post_id, meta_description in optimized_meta_descriptions.items():
-        try:
-            print(f"\\n🔄 記事ID {post_id} を60文字に最適化中...")
-            
-            # 文字数確認
+        print(f"\\n🔄 記事ID {post_id} を60文字に最適化中...")
+        
+        # 文字数確認
+        char_count = len(meta_description)
+        print(f"   文字数: {char_count}文字（目標60文字）")
+        
+        if char_count > 60:
+            print(f"   ⚠️  {char_count - 60}文字オーバー - 調整します")
+            # 60文字以内に調整
+            meta_description = meta_description[:57] + "..."
             char_count = len(meta_description)
-            print(f"   文字数: {char_count}文字（目標60文字）")
-            
-            if char_count > 60:
-                print(f"   ⚠️  {char_count - 60}文字オーバー - 調整します")
-                # 60文字以内に調整
-                meta_description = meta_description[:57] + "..."
-                char_count = len(meta_description)
-                print(f"   調整後: {char_count}文字")
-            
-            print(f"   内容: {meta_description}")
-            
-            # WordPress抜粋を更新
-            update_data = {
-                'excerpt': meta_description
-            }
-            
-            response = requests.post(f"{wp.api_url}/posts/{post_id}", 
-                                   headers=wp.headers, 
-                                   json=update_data)
-            
-            if response.status_code == 200:
-                print(f"   ✅ 60文字最適化完了")
-                success_count += 1
-            else:
-                print(f"   ❌ 最適化失敗 ({response.status_code})")
-                print(f"   エラー: {response.text}")
-                
-        except Exception as e:
-            print(f"   ❌ 記事ID {post_id}: エラー - {e}")
+            print(f"   調整後: {char_count}文字")
+        
+        print(f"   内容: {meta_description}")
+        
+        # WordPress抜粋を更新（現在値と同じ記事は送信しない）
+        queue.enqueue(post_id, {'excerpt': meta_description}, label=f"記事ID {post_id}")
+    
+    result = queue.run()
+    success_count = result['succeeded']
     
     print(f"\\n🎯 60文字最適化完了: {success_count}/{len(optimized_meta_descriptions)}件")
     return success_count
@@ -80,13 +68,15 @@ def verify_60char_optimization():
     print("\\n🔍 60文字最適化結果の確認")
     print("=" * 40)
     
+    # 差分同期で更新分のみ取得してから確認
+    mirror = open_mirror(wp, types=['posts'])
+    
     target_post_ids = [2732, 2677, 2625, 2535, 2210, 649]
     
     for post_id in target_post_ids:
         try:
-            response = requests.get(f"{wp.api_url}/posts/{post_id}", headers=wp.headers)
-            if response.status_code == 200:
-                post = response.json()
+            post = mirror.get_post(post_id)
+            if post:
                 title = post['title']['rendered']
                 excerpt = post['excerpt']['rendered']
                 
@@ -0,0 +1,239 @@
+"""
+記事HTMLのSEO指標を1パスで収集する解析エンジン
+見出し・リンク・画像・強調・リスト・テーブル・構造化データ・aria属性・本文テキストを
+html.parser の1回の走査でまとめて取得する
+"""
+
+import re
+from dataclasses import dataclass, field, asdict
+from html.parser import HTMLParser
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+SITE_DOMAIN = "muffin-blog.com"
+AMAZON_PATTERN = re.compile(r'amazon\.|amzn\.')
+
+# テキストを収集するタグ（入れ子にも対応）
+CAPTURE_TAGS = ('h1', 'h2', 'h3', 'h4', 'a', 'strong', 'em', 'b', 'i', 'p', 'li')
+# 出現数のみ数えるタグ
+COUNT_TAGS = ('ul', 'ol', 'li', 'table', 'th', 'td', 'p')
+# 本文テキストに含めないタグ
+SKIP_TEXT_TAGS = ('script', 'style')
+# 開始時に閉じていない <p> を暗黙に閉じるブロック要素（HTML仕様の省略可能な終了タグ）
+P_CLOSING_TAGS = (
+    'address', 'article', 'aside', 'blockquote', 'details', 'div', 'dl', 'fieldset', 'figcaption',
+    'figure', 'footer', 'form', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'header', 'hr', 'main', 'menu',
+    'nav', 'ol', 'p', 'pre', 'section', 'table', 'ul'
+)
+
+@dataclass
+class LinkInfo:
+    href: str
+    text: str
+    rel: List[str]
+    target: Optional[str]
+    is_internal: bool
+    is_amazon: bool
+
+    @property
+    def is_external(self) -> bool:
+        """他ホストへのリンクか（プロトコル相対 //host/ も含む）"""
+        if self.is_internal:
+            return False
+        try:
+            return bool(urlsplit(self.href.strip()).netloc)
+        except ValueError:
+            return False
+
+@dataclass
+class ImageInfo:
+    src: str
+    alt: Optional[str]
+    title: Optional[str]
+
+@dataclass
+class SEOAnalysisResult:
+    """1記事分のSEO解析結果"""
+    headings: Dict[str, List[str]] = field(default_factory=lambda: {'h1': [], 'h2': [], 'h3': [], 'h4': []})
+    links: List[LinkInfo] = field(default_factory=list)
+    images: List[ImageInfo] = field(default_factory=list)
+    emphasis: Dict[str, List[str]] = field(default_factory=lambda: {'strong': [], 'em': [], 'b': [], 'i': []})
+    paragraphs: List[str] = field(default_factory=list)
+    tag_counts: Dict[str, int] = field(default_factory=lambda: {tag: 0 for tag in COUNT_TAGS})
+    json_ld_blocks: List[str] = field(default_factory=list)
+    microdata_count: int = 0
+    aria_label_count: int = 0
+    aria_describedby_count: int = 0
+    text: str = ""
+
+    @property
+    def internal_links(self) -> List[LinkInfo]:
+        return [link for link in self.links if link.is_internal]
+
+    @property
+    def external_links(self) -> List[LinkInfo]:
+        return [link for link in self.links if link.is_external]
+
+    @property
+    def amazon_links(self) -> List[LinkInfo]:
+        return [link for link in self.links if link.is_amazon]
+
+    @property
+    def alt_texts(self) -> List[str]:
+        """alt属性が設定された画像のalt（空文字を含む）"""
+        return [image.alt for image in self.images if image.alt is not None]
+
+    @property
+    def char_count(self) -> int:
+        return len(self.text)
+
+    def keyword_counts(self, keywords: Iterable[str], limit: Optional[int] = None) -> Dict[str, int]:
+        """本文中のキーワード出現数（limit指定時は冒頭limit文字のみ）"""
+        text = self.text[:limit] if limit else self.text
+        return {keyword: text.count(keyword) for keyword in keywords}
+
+    def to_dict(self) -> Dict:
+        data = asdict(self)
+        data['char_count'] = self.char_count
+        return data
+
+class SEOHtmlAnalyzer(HTMLParser):
+    """記事本文HTMLを1回走査してSEO指標を収集"""
+
+    def __init__(self, site_domain: str = SITE_DOMAIN):
+        super().__init__(convert_charrefs=True)
+        self.site_domain = site_domain
+        self.result = SEOAnalysisResult()
+        self.text_parts: List[str] = []
+        self.open_captures: Dict[str, List[List[str]]] = {tag: [] for tag in CAPTURE_TAGS}
+        self.open_links: List[Dict] = []
+        self.skip_depth = 0
+        self.in_json_ld = False
+        self.json_ld_parts: List[str] = []
+
+    def handle_starttag(self, tag: str, attrs: List[Tuple[str, Optional[str]]]):
+        attr_map = dict(attrs)
+        result = self.result
+
+        # 閉じ忘れの段落が後続の段落・見出しを飲み込まないよう、ブロック要素の開始で閉じる
+        if tag in P_CLOSING_TAGS and not self.skip_depth:
+            while self.open_captures['p']:
+                self.handle_endtag('p')
+
+        if 'itemtype' in attr_map:
+            result.microdata_count += 1
+        if 'aria-label' in attr_map:
+            result.aria_label_count += 1
+        if 'aria-describedby' in attr_map:
+            result.aria_describedby_count += 1
+
+        if tag in result.tag_counts:
+            result.tag_counts[tag] += 1
+
+        if tag in SKIP_TEXT_TAGS:
+            self.skip_depth += 1
+            if tag == 'script' and (attr_map.get('type') or '').lower() == 'application/ld+json':
+                self.in_json_ld = True
+                self.json_ld_parts = []
+            return
+
+        if tag == 'img':
+            result.images.append(ImageInfo(
+                src=attr_map.get('src') or '',
+                alt=attr_map.get('alt'),
+                title=attr_map.get('title')
+            ))
+            return
+
+        if tag == 'a':
+            href = attr_map.get('href') or ''
+            self.open_links.append({
+                'href': href,
+                'rel': (attr_map.get('rel') or '').split(),
+                'target': attr_map.get('target')
+            })
+
+        if tag in self.open_captures:
+            self.open_captures[tag].append([])
+
+    def handle_endtag(self, tag: str):
+        result = self.result
+
+        if tag in SKIP_TEXT_TAGS:
+            self.skip_depth = max(0, self.skip_depth - 1)
+            if tag == 'script' and self.in_json_ld:
+                result.json_ld_blocks.append(''.join(self.json_ld_parts).strip())
+                self.in_json_ld = False
+            return
+
+        stack = self.open_captures.get(tag)
+        if not stack:
+            return
+        text = ''.join(stack.pop()).strip()
+
+        if tag in result.headings:
+            result.headings[tag].append(text)
+        elif tag in result.emphasis:
+            result.emphasis[tag].append(text)
+        elif tag == 'p':
+            result.paragraphs.append(text)
+        elif tag == 'a' and self.open_links:
+            link = self.open_links.pop()
+            href = link['href']
+            result.links.append(LinkInfo(
+                href=href,
+                text=text,
+                rel=link['rel'],
+                target=link['target'],
+                is_internal=self.is_internal_url(href),
+                is_amazon=bool(AMAZON_PATTERN.search(href))
+            ))
+
+    def handle_data(self, data: str):
+        if self.skip_depth:
+            if self.in_json_ld:
+                self.json_ld_parts.append(data)
+            return
+        self.text_parts.append(data)
+        for stack in self.open_captures.values():
+            for buffer in stack:
+                buffer.append(data)
+
+    def is_internal_url(self, href: str) -> bool:
+        """自サイト内リンクか（相対パスは内部・プロトコル相対 //host/ はホストで判定）"""
+        if not href or href.startswith(('mailto:', 'tel:', 'javascript:', '#')):
+            return False
+        try:
+            parts = urlsplit(href)
+            host = (parts.hostname or '').lower()
+        except ValueError:
+            return False
+        if parts.scheme and parts.scheme not in ('http', 'https'):
+            return False
+        if not parts.netloc:
+            return True
+        return host == self.site_domain or host.endswith('.' + self.site_domain)
+
+    def close(self):
+        super().close()
+        # 閉じタグのないリンク・見出しも取りこぼさない
+        for tag in CAPTURE_TAGS:
+            while self.open_captures[tag]:
+                self.handle_endtag(tag)
+        self.result.text = ''.join(self.text_parts)
+
+def analyze_html(content: str, site_domain: str = SITE_DOMAIN) -> SEOAnalysisResult:
+    """記事本文HTMLを解析"""
+    analyzer = SEOHtmlAnalyzer(site_domain)
+    analyzer.feed(content)
+    analyzer.close()
+    return analyzer.result
+
+def analyze_post(post: Dict, site_domain: str = SITE_DOMAIN) -> SEOAnalysisResult:
+    """WordPress REST APIの投稿データを解析"""
+    return analyze_html(post['content']['rendered'], site_domain)
+
+def analyze_posts(posts: Iterable[Dict], site_domain: str = SITE_DOMAIN) -> Iterator[Tuple[Dict, SEOAnalysisResult]]:
+    """複数投稿を順に解析（サイト全体の一括分析用）"""
+    for post in posts:
+        yield post, analyze_post(post, site_domain)
@@ -0,0 +1,130 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import wp_writeback_queue
+from wp_writeback_queue import WriteBackQueue
+
+
+class FakeWordPress:
+    api_url = "http://wordpress.invalid/wp-json/wp/v2"
+    headers = {}
+
+
+class FakeMirror:
+    authenticated = True
+
+    def __init__(self, objects):
+        self.objects = objects
+        self.updated = []
+
+    def get(self, object_type, object_id):
+        return self.objects.get((object_type, object_id))
+
+    def update_local(self, object_type, item):
+        self.updated.append((object_type, item))
+
+
+class FakeResponse:
+    status_code = 200
+    text = ""
+
+    def __init__(self, payload):
+        self.payload = payload
+
+    def json(self):
+        if isinstance(self.payload, Exception):
+            raise self.payload
+        return self.payload
+
+
+@pytest.fixture
+def journal_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(wp_writeback_queue, "JOURNAL_DIR", str(tmp_path / "writeback"))
+    return tmp_path / "writeback"
+
+
+def make_queue(mirror, batch_name="test"):
+    return WriteBackQueue(FakeWordPress(), mirror, batch_name=batch_name, max_workers=2, rate=100, burst=10)
+
+
+def test_diff_fields_compares_raw_values(journal_dir):
+    mirror = FakeMirror({("posts", 1): {"id": 1, "excerpt": {"raw": "同じ抜粋", "rendered": "<p>同じ抜粋</p>\n"}}})
+    queue = make_queue(mirror)
+
+    assert queue.diff_fields({"type": "posts", "id": 1, "fields": {"excerpt": "同じ抜粋"}}) == {}
+    assert queue.diff_fields({"type": "posts", "id": 1, "fields": {"excerpt": "新しい抜粋"}}) == {"excerpt": "新しい抜粋"}
+
+
+def test_diff_fields_falls_back_to_rendered_text(journal_dir):
+    mirror = FakeMirror({("posts", 2): {"id": 2, "excerpt": {"rendered": "<p>睡眠 &amp; 休息</p>\n"}}})
+    queue = make_queue(mirror)
+
+    assert queue.diff_fields({"type": "posts", "id": 2, "fields": {"excerpt": "睡眠 & 休息"}}) == {}
+
+
+def test_diff_fields_sends_only_changed_meta_keys(journal_dir):
+    mirror = FakeMirror({("posts", 3): {"id": 3, "meta": {"_ssp_description": "既存", "_ssp_title": "旧"}}})
+    queue = make_queue(mirror)
+
+    fields = {"meta": {"_ssp_description": "既存", "_ssp_title": "新"}, "status": "publish"}
+    assert queue.diff_fields({"type": "posts", "id": 3, "fields": fields}) == {
+        "meta": {"_ssp_title": "新"},
+        "status": "publish",
+    }
+
+
+def test_diff_fields_without_mirror_entry_sends_everything(journal_dir):
+    queue = make_queue(FakeMirror({}))
+
+    assert queue.diff_fields({"type": "posts", "id": 4, "fields": {"excerpt": "抜粋"}}) == {"excerpt": "抜粋"}
+
+
+def test_resumed_job_is_rechecked_against_the_mirror(journal_dir, monkeypatch):
+    mirror = FakeMirror({("posts", 5): {"id": 5, "excerpt": {"raw": "前回の値"}}})
+    queue = make_queue(mirror)
+    queue.enqueue(5, {"excerpt": "前回の値"})
+    job = next(iter(queue.jobs.values()))
+    job["key"] = queue.job_key("posts", 5, job["fields"])
+    queue.completed[job["key"]] = "updated"
+    assert queue.process(job)["state"] == "resumed"
+
+    # 完了後にサイト側で書き換えられた投稿は再度更新する
+    mirror.objects[("posts", 5)]["excerpt"]["raw"] = "別の値"
+    monkeypatch.setattr(queue, "post_update", lambda job, fields: FakeResponse({"id": 5}))
+    assert queue.process(job)["state"] == "updated"
+
+
+def test_worker_errors_are_journaled_as_failed(journal_dir, monkeypatch):
+    queue = make_queue(FakeMirror({}))
+    monkeypatch.setattr(queue, "post_update", lambda job, fields: FakeResponse(ValueError("not json")))
+    queue.enqueue(6, {"excerpt": "抜粋"})
+    queue.enqueue(7, {"excerpt": "抜粋"})
+
+    stats = queue.run()
+
+    assert stats["failed"] == 2
+    assert all("ValueError" in result["error"] for result in stats["results"])
+    assert (journal_dir / "test.jsonl").read_text(encoding="utf-8").count('"failed"') == 2
+
+
+def test_post_update_retries_read_timeouts(journal_dir, monkeypatch):
+    queue = make_queue(FakeMirror({}))
+    attempts = []
+
+    def post(*args, **kwargs):
+        attempts.append(kwargs)
+        if len(attempts) < 3:
+            raise wp_writeback_queue.requests.ReadTimeout("slow")
+        return FakeResponse({"id": 8})
+
+    monkeypatch.setattr(queue.session, "post", post)
+    monkeypatch.setattr(wp_writeback_queue.time, "sleep", lambda seconds: None)
+
+    response = queue.post_update({"type": "posts", "id": 8}, {"excerpt": "抜粋"})
+
+    assert response.status_code == 200
+    assert len(attempts) == 3
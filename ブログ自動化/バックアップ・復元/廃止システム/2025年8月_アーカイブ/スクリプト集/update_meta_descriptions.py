@@ -8,7 +8,8 @@ import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from core.wordpress_api import WordPressBlogAutomator
-import requests
+from wp_local_mirror import open_mirror
+from wp_writeback_queue import WriteBackQueue
 
 def update_post_meta_description(post_id, meta_description):
     """特定の記事のメタディスクリプションを更新"""
@@ -16,22 +17,17 @@ def update_post_meta_description(post_id, meta_description):
     wp = WordPressBlogAutomator()  # 環境変数から自動読み込み
     
     try:
-        # 記事の更新データ
-        update_data = {
-            'excerpt': meta_description  # WordPressではexcerptがメタディスクリプションとして使用される
-        }
+        # WordPressではexcerptがメタディスクリプションとして使用される
+        mirror = open_mirror(wp, types=['posts'])
+        queue = WriteBackQueue(wp, mirror, batch_name=f"meta_description_{post_id}")
+        queue.enqueue(post_id, {'excerpt': meta_description}, label=f"記事ID {post_id}")
+        result = queue.run()
         
-        # 記事を更新
-        response = requests.post(f"{wp.api_url}/posts/{post_id}", 
-                               headers=wp.headers, 
-                               json=update_data)
-        
-        if response.status_code == 200:
+        if result['succeeded']:
             print(f"✅ 記事ID {post_id} のメタディスクリプションを更新しました")
             return True
         else:
-            print(f"❌ 更新失敗: {response.status_code}")
-            print(response.text)
+            print("❌ 更新失敗")
             return False
             
     except Exception as e:
@@ -46,49 +42,40 @@ def update_audible_post_meta():
     print("🔍 Audible記事を検索中...")
     
     try:
-        # Audible関連記事を検索
-        response = requests.get(f"{wp.api_url}/posts?search=Audible&per_page=100", 
-                               headers=wp.headers)
+        # Audible関連記事をローカルミラーから検索
+        mirror = open_mirror(wp, types=['posts'])
+        posts = mirror.search('Audible')
+        queue = WriteBackQueue(wp, mirror, batch_name="audible_meta_description")
+        
+        print(f"📄 {len(posts)}件のAudible関連記事が見つかりました")
         
-        if response.status_code == 200:
-            posts = response.json()
+        for post in posts:
+            post_id = post['id']
+            title = post['title']['rendered']
+            current_excerpt = post['excerpt']['rendered']
             
-            print(f"📄 {len(posts)}件のAudible関連記事が見つかりました")
+            print(f"\n📖 記事: {title}")
+            print(f"現在の抜粋: {current_excerpt[:100]}...")
             
-            for post in posts:
-                post_id = post['id']
-                title = post['title']['rendered']
-                current_excerpt = post['excerpt']['rendered']
-                
-                print(f"\n📖 記事: {title}")
-                print(f"現在の抜粋: {current_excerpt[:100]}...")
-                
-                # Audible記事用の最適化されたメタディスクリプション
-                if "始め方" in title:
-                    new_meta = "Audibleの始め方を初心者向けに完全解説！アプリの使い方から料金プラン、おすすめ機能まで、世界一分かりやすくガイドします。"
-                elif "活用" in title or "人生" in title:
-                    new_meta = "Audibleで人生が変わる！効率的な学習方法と時間活用術を紹介。通勤時間を自己投資の時間に変える具体的な方法を解説します。"
-                elif "貯蓄" in title or "節約" in title:
-                    new_meta = "Audibleでお金の知識を身につけよう！貯蓄・節約・投資が学べるおすすめ書籍6選を厳選紹介。お金の勉強を楽しく続ける方法も解説。"
-                elif "休会" in title:
-                    new_meta = "Audibleの休会制度を完全ガイド！メリット・デメリット、退会との違い、手続き方法まで分かりやすく解説します。"
-                else:
-                    # 汎用的なAudible記事用メタディスクリプション
-                    new_meta = "Audibleを活用した効率的な学習方法を詳しく解説。忙しい日常でも読書時間を確保し、知識を身につける具体的なノウハウを紹介します。"
-                
-                print(f"新しいメタディスクリプション: {new_meta}")
-                
-                # 自動更新実行
-                print("🔄 更新中...")
-                success = update_post_meta_description(post_id, new_meta)
-                if success:
-                    print("✅ 更新完了")
-                else:
-                    print("❌ 更新失敗")
-                
-        else:
-            print(f"❌ 記事検索失敗: {response.status_code}")
-            print(response.text)
+            # Audible記事用の最適化されたメタディスクリプション
+            if "始め方" in title:
+                new_meta = "Audibleの始め方を初心者向けに完全解説！アプリの使い方から料金プラン、おすすめ機能まで、世界一分かりやすくガイドします。"
+            elif "活用" in title or "人生" in title:
+                new_meta = "Audibleで人生が変わる！効率的な学習方法と時間活用術を紹介。通勤時間を自己投資の時間に変える具体的な方法を解説します。"
+            elif "貯蓄" in title or "節約" in title:
+                new_meta = "Audibleでお金の知識を身につけよう！貯蓄・節約・投資が学べるおすすめ書籍6選を厳選紹介。お金の勉強を楽しく続ける方法も解説。"
+            elif "休会" in title:
+                new_meta = "Audibleの休会制度を完全ガイド！メリット・デメリット、退会との違い、手続き方法まで分かりやすく解説します。"
+            else:
+                # 汎用的なAudible記事用メタディスクリプション
+                new_meta = "Audibleを活用した効率的な学習方法を詳しく解説。忙しい日常でも読書時間を確保し、知識を身につける具体的なノウハウを紹介します。"
+            
+            print(f"新しいメタディスクリプション: {new_meta}")
+            queue.enqueue(post_id, {'excerpt': new_meta}, label=title)
+        
+        # 変更のある記事のみ流量制限付きで一括更新
+        print("\n🔄 更新中...")
+        queue.run()
             
     except Exception as e:
         print(f"❌ エラー: {e}")
@@ -117,27 +104,21 @@ def get_all_posts_with_excerpts():
     wp = WordPressBlogAutomator()  # 環境変数から自動読み込み
     
     try:
-        response = requests.get(f"{wp.api_url}/posts?per_page=100", 
-                               headers=wp.headers)
+        mirror = open_mirror(wp, types=['posts'])
+        posts = list(mirror.iter_objects('posts', status='publish'))
         
-        if response.status_code == 200:
-            posts = response.json()
-            
-            print("📋 全記事の抜粋一覧:")
-            print("=" * 80)
+        print("📋 全記事の抜粋一覧:")
+        print("=" * 80)
+        
+        for post in posts:
+            title = post['title']['rendered']
+            excerpt = post['excerpt']['rendered']
+            post_id = post['id']
             
-            for post in posts:
-                title = post['title']['rendered']
-                excerpt = post['excerpt']['rendered']
-                post_id = post['id']
-                
-                print(f"\n🆔 ID: {post_id}")
-                print(f"📖 タイトル: {title}")
-                print(f"📄 現在の抜粋: {excerpt.strip()[:150]}...")
-                print("-" * 80)
-                
-        else:
-            print(f"❌ 記事取得失敗: {response.status_code}")
+            print(f"\n🆔 ID: {post_id}")
+            print(f"📖 タイトル: {title}")
+            print(f"📄 現在の抜粋: {excerpt.strip()[:150]}...")
+            print("-" * 80)
             
     except Exception as e:
         print(f"❌ エラー: {e}")
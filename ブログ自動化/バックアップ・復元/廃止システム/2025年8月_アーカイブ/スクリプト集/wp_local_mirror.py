@@ -0,0 +1,302 @@
+"""
+WordPressサイト全体のローカルミラー
+投稿・固定ページ・メディア・カテゴリ・タグをSQLiteに保持し、
+modified_after による差分同期（ページ単位の並列取得）とID一覧での削除反映で最新状態に保つ
+SEO分析・抜粋修正・リンク監査はこのミラーを読んで実行する
+"""
+
+import os
+import json
+import time
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+
+DEFAULT_DB_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "wp_mirror.sqlite3")
+
+# 差分同期できる種別（modified を持つ） / 毎回全件取得する種別
+INCREMENTAL_TYPES = ('posts', 'pages', 'media')
+FULL_TYPES = ('categories', 'tags')
+ALL_TYPES = INCREMENTAL_TYPES + FULL_TYPES
+
+class WordPressMirror:
+    """WordPress REST APIのローカルミラー（SQLite）"""
+
+    def __init__(self, wp, db_path: str = DEFAULT_DB_PATH, per_page: int = 100, max_workers: int = 4):
+        self.wp = wp
+        self.db_path = db_path
+        self.per_page = per_page
+        self.max_workers = max_workers
+        self.lock = threading.Lock()
+
+        # 認証付きなら下書き等も含めて編集用コンテキスト（raw値付き）で取得
+        self.authenticated = 'Authorization' in getattr(wp, 'headers', {})
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=max_workers, pool_maxsize=max_workers)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+        os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self._create_schema()
+
+    def _create_schema(self):
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS objects (
+                type TEXT NOT NULL,
+                id INTEGER NOT NULL,
+                status TEXT,
+                modified TEXT,
+                title TEXT,
+                excerpt TEXT,
+                content TEXT,
+                data TEXT NOT NULL,
+                PRIMARY KEY (type, id)
+            );
+            CREATE INDEX IF NOT EXISTS idx_objects_modified ON objects(type, modified);
+            CREATE TABLE IF NOT EXISTS sync_state (
+                type TEXT PRIMARY KEY,
+                last_modified TEXT,
+                synced_at TEXT
+            );
+        """)
+
+    # ---- 取得 ----
+
+    def request_params(self, object_type: str, extra: Optional[Dict] = None) -> Dict:
+        params = {'per_page': self.per_page}
+        if self.authenticated:
+            params['context'] = 'edit'
+            if object_type in ('posts', 'pages'):
+                params['status'] = 'any'
+        if object_type in INCREMENTAL_TYPES:
+            params['orderby'] = 'modified'
+            params['order'] = 'asc'
+        params.update(extra or {})
+        return params
+
+    def fetch_page(self, object_type: str, params: Dict, page: int, retries: int = 3) -> requests.Response:
+        """1ページ取得（接続エラー・タイムアウト・5xxは指数バックオフで再試行）"""
+        for attempt in range(retries):
+            try:
+                response = self.session.get(
+                    f"{self.wp.api_url}/{object_type}",
+                    headers=self.wp.headers,
+                    params=dict(params, page=page),
+                    timeout=30
+                )
+                if response.status_code < 500:
+                    response.raise_for_status()
+                    return response
+            except (requests.ConnectionError, requests.Timeout):
+                if attempt == retries - 1:
+                    raise
+            if attempt < retries - 1:
+                time.sleep(2 ** attempt)
+        response.raise_for_status()
+        return response
+
+    def fetch_all(self, object_type: str, extra_params: Optional[Dict] = None) -> Tuple[List[Dict], bool]:
+        """全ページ取得（取得結果, 全件揃ったか）"""
+        return self.fetch_pages(object_type, self.request_params(object_type, extra_params))
+
+    def fetch_pages(self, object_type: str, params: Dict) -> Tuple[List[Dict], bool]:
+        """1ページ目で総ページ数を確認し、残りのページを並列取得
+
+        取得中にサイト側で更新・削除があると並び順がずれ、ページ境界をまたいだ項目を取りこぼす。
+        重複を除いた件数を1ページ目の X-WP-Total と比べ、全件揃ったかを合わせて返す
+        """
+        first = self.fetch_page(object_type, params, 1)
+        items = first.json()
+        total_pages = int(first.headers.get('X-WP-TotalPages', 1) or 1)
+        total = int(first.headers.get('X-WP-Total', len(items)) or 0)
+
+        if total_pages > 1:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                pages = executor.map(lambda page: self.fetch_page(object_type, params, page).json(),
+                                     range(2, total_pages + 1))
+                for page_items in pages:
+                    items.extend(page_items)
+
+        # ずれで2ページに現れた項目は後のページ（新しい値）を採用
+        unique = {item['id']: item for item in items}
+        return list(unique.values()), len(unique) >= total
+
+    # ---- 同期 ----
+
+    def sync(self, types: Optional[List[str]] = None, full: bool = False, prune: bool = True) -> Dict[str, int]:
+        """ミラーを同期（既定は前回以降に更新された分のみ）
+
+        prune=True（既定）の場合、ゴミ箱移動・削除されたオブジェクトをID一覧（_fields=id）との突き合わせで除去する
+        """
+        stats = {}
+        for object_type in types or ALL_TYPES:
+            try:
+                if object_type in FULL_TYPES:
+                    stats[object_type] = self._sync_full(object_type)
+                else:
+                    stats[object_type] = self._sync_incremental(object_type, full)
+                    if full or prune:
+                        self._prune(object_type)
+            except requests.RequestException as e:
+                print(f"⚠️ {object_type} 同期エラー: {e}")
+                stats[object_type] = -1
+        return stats
+
+    def _sync_incremental(self, object_type: str, full: bool, attempts: int = 2) -> int:
+        row = self.conn.execute("SELECT last_modified FROM sync_state WHERE type = ?", (object_type,)).fetchone()
+        previous = row['last_modified'] if row and not full else None
+        extra = {}
+        if previous:
+            # 同一秒内の更新を取りこぼさないよう1秒戻して取得（upsertなので重複は無害）
+            since = datetime.fromisoformat(previous) - timedelta(seconds=1)
+            extra['modified_after'] = since.isoformat()
+
+        for attempt in range(attempts):
+            items, complete = self.fetch_all(object_type, extra)
+            if complete:
+                break
+
+        last_modified = previous
+        with self.lock, self.conn:
+            for item in items:
+                self._upsert(object_type, item)
+                if complete and item.get('modified') and (last_modified is None or item['modified'] > last_modified):
+                    last_modified = item['modified']
+            # 取りこぼしがある場合は同期位置を進めず、次回同じ範囲から取り直す
+            self._save_state(object_type, last_modified)
+        if not complete:
+            print(f"⚠️ {object_type}: 同期中にサイト側の更新があり一部未取得（次回同期で再取得）")
+        return len(items)
+
+    def _sync_full(self, object_type: str) -> int:
+        items, complete = self.fetch_all(object_type)
+        with self.lock, self.conn:
+            if complete:
+                self.conn.execute("DELETE FROM objects WHERE type = ?", (object_type,))
+            for item in items:
+                self._upsert(object_type, item)
+            self._save_state(object_type, None)
+        return len(items)
+
+    def _prune(self, object_type: str):
+        """サイト側でゴミ箱移動・削除されたオブジェクトをミラーから除去（ID一覧のみ取得）"""
+        params = self.request_params(object_type, {'_fields': 'id'})
+        params.pop('orderby', None)
+        params.pop('order', None)
+        items, complete = self.fetch_pages(object_type, params)
+        if not complete:
+            # ID一覧が欠けた状態で突き合わせると存在する記事まで消えるため見送る
+            print(f"⚠️ {object_type}: ID一覧の取得中に変更があったため削除反映を見送り")
+            return
+        remote_ids = {item['id'] for item in items}
+        with self.lock, self.conn:
+            local_ids = [row['id'] for row in self.conn.execute("SELECT id FROM objects WHERE type = ?", (object_type,))]
+            for object_id in local_ids:
+                if object_id not in remote_ids:
+                    self.conn.execute("DELETE FROM objects WHERE type = ? AND id = ?", (object_type, object_id))
+
+    def _save_state(self, object_type: str, last_modified: Optional[str]):
+        self.conn.execute(
+            "INSERT OR REPLACE INTO sync_state (type, last_modified, synced_at) VALUES (?, ?, ?)",
+            (object_type, last_modified, datetime.now().isoformat())
+        )
+
+    @staticmethod
+    def _rendered(value) -> str:
+        if isinstance(value, dict):
+            return value.get('rendered', '') or ''
+        return value or ''
+
+    def _upsert(self, object_type: str, item: Dict):
+        if object_type in FULL_TYPES:
+            title, excerpt, content = item.get('name', ''), '', item.get('description', '')
+        else:
+            title = self._rendered(item.get('title'))
+            excerpt = self._rendered(item.get('excerpt') or item.get('caption'))
+            content = self._rendered(item.get('content') or item.get('description'))
+        self.conn.execute(
+            "INSERT OR REPLACE INTO objects (type, id, status, modified, title, excerpt, content, data) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (object_type, item['id'], item.get('status'), item.get('modified'),
+             title, excerpt, content, json.dumps(item, ensure_ascii=False))
+        )
+
+    def update_local(self, object_type: str, item: Dict):
+        """書き戻し後のAPIレスポンスでミラーを更新"""
+        with self.lock, self.conn:
+            self._upsert(object_type, item)
+
+    # ---- 参照 ----
+
+    def get(self, object_type: str, object_id: int) -> Optional[Dict]:
+        row = self.conn.execute(
+            "SELECT data FROM objects WHERE type = ? AND id = ?", (object_type, int(object_id))
+        ).fetchone()
+        return json.loads(row['data']) if row else None
+
+    def get_post(self, post_id: int) -> Optional[Dict]:
+        return self.get('posts', post_id)
+
+    def iter_objects(self, object_type: str = 'posts', status: Optional[str] = None) -> Iterator[Dict]:
+        sql = "SELECT data FROM objects WHERE type = ?"
+        params = [object_type]
+        if status:
+            sql += " AND status = ?"
+            params.append(status)
+        sql += " ORDER BY id DESC"
+        for row in self.conn.execute(sql, params):
+            yield json.loads(row['data'])
+
+    def search(self, text: str, object_type: str = 'posts', status: Optional[str] = 'publish',
+               limit: Optional[int] = None) -> List[Dict]:
+        """タイトル・抜粋・本文の部分一致検索（REST APIの ?search= 相当）"""
+        pattern = f"%{text}%"
+        sql = ("SELECT data FROM objects WHERE type = ? AND (title LIKE ? OR excerpt LIKE ? OR content LIKE ?)")
+        params = [object_type, pattern, pattern, pattern]
+        if status:
+            sql += " AND status = ?"
+            params.append(status)
+        sql += " ORDER BY modified DESC"
+        if limit:
+            sql += " LIMIT ?"
+            params.append(limit)
+        return [json.loads(row['data']) for row in self.conn.execute(sql, params)]
+
+    def count(self, object_type: str = 'posts') -> int:
+        return self.conn.execute("SELECT COUNT(*) FROM objects WHERE type = ?", (object_type,)).fetchone()[0]
+
+    def close(self):
+        self.session.close()
+        self.conn.close()
+
+def open_mirror(wp, sync: bool = True, types: Optional[List[str]] = None) -> WordPressMirror:
+    """ミラーを開き、既定で差分同期してから返す"""
+    mirror = WordPressMirror(wp)
+    if sync:
+        started = time.time()
+        stats = mirror.sync(types)
+        updated = sum(count for count in stats.values() if count > 0)
+        print(f"🔄 ローカルミラー同期完了: {updated}件更新 ({time.time() - started:.1f}秒)")
+    return mirror
+
+if __name__ == "__main__":
+    import sys
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from core.wordpress_api import WordPressBlogAutomator
+
+    full_sync = '--full' in sys.argv
+    mirror = WordPressMirror(WordPressBlogAutomator())  # 環境変数から自動読み込み
+    print(f"🔄 WordPressローカルミラー{'全件' if full_sync else '差分'}同期開始")
+    started = time.time()
+    stats = mirror.sync(full=full_sync)
+    for object_type, count in stats.items():
+        print(f"   {object_type}: {count}件取得 / ミラー{mirror.count(object_type)}件")
+    print(f"✅ 同期完了 ({time.time() - started:.1f}秒)")
@@ -0,0 +1,249 @@
+"""
+WordPress投稿更新の一括書き戻しキュー
+同時実行数の上限・トークンバケットによる流量制限・差分のみの更新・
+再開可能なジャーナルで、サイト全体のメタデータ移行をホストに負荷をかけずに実行する
+"""
+
+import os
+import re
+import json
+import html
+import time
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict
+
+import requests
+from requests.adapters import HTTPAdapter
+
+JOURNAL_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "writeback")
+RETRY_STATUS = (429, 500, 502, 503, 504)
+
+class TokenBucket:
+    """トークンバケット（rate件/秒・最大capacity件までのバースト）"""
+
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+def plain_text(value: str) -> str:
+    """rendered値の比較用テキスト（タグ除去・実体参照展開）"""
+    return html.unescape(re.sub(r'<[^>]+>', '', value or '')).strip()
+
+class WriteBackQueue:
+    """投稿更新キュー
+
+    enqueue() で更新内容を積み、run() でまとめて書き戻す。
+    同じ投稿への複数の更新は1リクエストに統合し、ミラー上の現在値と同じフィールドは送らない。
+    ジャーナル（batch_name単位のJSONL）に完了済みジョブを記録し、中断後の再実行では完了分を飛ばす。
+    ただしミラーがある場合は完了済みでも現在値と再比較し、その後に変わった投稿は改めて更新する。
+    """
+
+    def __init__(self, wp, mirror=None, batch_name: str = "default", max_workers: int = 4,
+                 rate: float = 2.0, burst: int = 4, retries: int = 4):
+        self.wp = wp
+        self.mirror = mirror
+        self.batch_name = batch_name
+        self.max_workers = max_workers
+        self.retries = retries
+        self.bucket = TokenBucket(rate, burst)
+        self.jobs: Dict[tuple, Dict] = {}
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=max_workers, pool_maxsize=max_workers)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+        os.makedirs(JOURNAL_DIR, exist_ok=True)
+        self.journal_path = os.path.join(JOURNAL_DIR, f"{batch_name}.jsonl")
+        self.journal_lock = threading.Lock()
+        self.completed = self.load_journal()
+
+    # ---- ジャーナル ----
+
+    def load_journal(self) -> Dict[str, str]:
+        """前回中断時の完了済みジョブ（ジョブキー → 状態）"""
+        completed = {}
+        if not os.path.exists(self.journal_path):
+            return completed
+        with open(self.journal_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    break
+                if record.get('state') in ('updated', 'skipped'):
+                    completed[record['key']] = record['state']
+        if completed:
+            print(f"♻️ 中断したバッチ「{self.batch_name}」を再開: 完了済み{len(completed)}件をスキップ")
+        return completed
+
+    def write_journal(self, job: Dict, state: str, detail: str = ""):
+        record = {
+            'key': job['key'],
+            'type': job['type'],
+            'id': job['id'],
+            'state': state,
+            'detail': detail,
+            'time': time.strftime('%Y-%m-%dT%H:%M:%S')
+        }
+        with self.journal_lock:
+            with open(self.journal_path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+
+    # ---- キュー ----
+
+    @staticmethod
+    def job_key(object_type: str, object_id: int, fields: Dict) -> str:
+        payload = json.dumps([object_type, int(object_id), fields], ensure_ascii=False, sort_keys=True)
+        return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+    def enqueue(self, object_id: int, fields: Dict, object_type: str = 'posts', label: str = ""):
+        """更新内容を追加（同じ投稿への更新はフィールド単位で後勝ち統合）"""
+        slot = (object_type, int(object_id))
+        job = self.jobs.setdefault(slot, {'type': object_type, 'id': int(object_id), 'fields': {}, 'label': label})
+        for name, value in fields.items():
+            if name == 'meta' and isinstance(value, dict):
+                job['fields'].setdefault('meta', {}).update(value)
+            else:
+                job['fields'][name] = value
+        job['label'] = label or job['label']
+
+    def diff_fields(self, job: Dict) -> Dict:
+        """ミラー上の現在値と異なるフィールドのみ抽出"""
+        if not self.mirror:
+            return dict(job['fields'])
+        current = self.mirror.get(job['type'], job['id'])
+        if not current:
+            return dict(job['fields'])
+
+        changed = {}
+        for name, value in job['fields'].items():
+            existing = current.get(name)
+            if name == 'meta' and isinstance(value, dict):
+                existing_meta = existing if isinstance(existing, dict) else {}
+                meta_changes = {key: val for key, val in value.items() if existing_meta.get(key) != val}
+                if meta_changes:
+                    changed['meta'] = meta_changes
+            elif isinstance(existing, dict) and ('raw' in existing or 'rendered' in existing):
+                if 'raw' in existing:
+                    same = existing['raw'] == value
+                else:
+                    same = plain_text(existing['rendered']) == plain_text(value)
+                if not same:
+                    changed[name] = value
+            elif existing != value:
+                changed[name] = value
+        return changed
+
+    def post_update(self, job: Dict, fields: Dict) -> requests.Response:
+        """流量制限付きで1件更新（429・5xx・接続エラー・タイムアウトは指数バックオフで再試行）"""
+        params = {'context': 'edit'} if self.mirror and self.mirror.authenticated else None
+        for attempt in range(self.retries):
+            self.bucket.acquire()
+            try:
+                response = self.session.post(
+                    f"{self.wp.api_url}/{job['type']}/{job['id']}",
+                    headers=self.wp.headers, params=params, json=fields, timeout=30
+                )
+            except (requests.ConnectionError, requests.Timeout):
+                if attempt == self.retries - 1:
+                    raise
+                time.sleep(2 ** attempt)
+                continue
+
+            if response.status_code not in RETRY_STATUS or attempt == self.retries - 1:
+                return response
+            retry_after = response.headers.get('Retry-After', '')
+            time.sleep(float(retry_after) if retry_after.isdigit() else 2 ** attempt)
+        return response
+
+    def process(self, job: Dict) -> Dict:
+        """1件処理（想定外の例外も失敗としてジャーナルに記録し、他のジョブは続行）"""
+        label = job['label'] or f"{job['type']} ID {job['id']}"
+        try:
+            return self._process(job, label)
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+            self.write_journal(job, 'failed', error)
+            return {'job': job, 'state': 'failed', 'label': label, 'error': error}
+
+    def _process(self, job: Dict, label: str) -> Dict:
+        fields = self.diff_fields(job)
+        if job['key'] in self.completed and (not self.mirror or not fields):
+            # 前回完了済み（ミラー上でもその後変更されていない）
+            return {'job': job, 'state': 'resumed', 'label': label}
+
+        if not fields:
+            self.write_journal(job, 'skipped')
+            return {'job': job, 'state': 'skipped', 'label': label}
+
+        try:
+            response = self.post_update(job, fields)
+        except requests.RequestException as e:
+            self.write_journal(job, 'failed', str(e))
+            return {'job': job, 'state': 'failed', 'label': label, 'error': str(e)}
+
+        if response.status_code != 200:
+            self.write_journal(job, 'failed', f"{response.status_code}")
+            return {'job': job, 'state': 'failed', 'label': label,
+                    'error': f"{response.status_code} {response.text[:200]}"}
+
+        if self.mirror:
+            self.mirror.update_local(job['type'], response.json())
+        self.write_journal(job, 'updated', ",".join(sorted(fields)))
+        return {'job': job, 'state': 'updated', 'label': label, 'fields': sorted(fields)}
+
+    def run(self) -> Dict:
+        """キューを書き戻し、結果を集計"""
+        jobs = list(self.jobs.values())
+        for job in jobs:
+            job['key'] = self.job_key(job['type'], job['id'], job['fields'])
+
+        print(f"📤 書き戻し開始: {len(jobs)}件（同時{self.max_workers}件・毎秒{self.bucket.rate:g}件まで）")
+        started = time.time()
+        stats = {'updated': 0, 'skipped': 0, 'resumed': 0, 'failed': 0}
+        results = []
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            for result in executor.map(self.process, jobs):
+                results.append(result)
+                stats[result['state']] += 1
+                if result['state'] == 'updated':
+                    print(f"   ✅ {result['label']}: 更新 ({', '.join(result['fields'])})")
+                elif result['state'] == 'skipped':
+                    print(f"   ⏭️  {result['label']}: 変更なし")
+                elif result['state'] == 'resumed':
+                    print(f"   ♻️ {result['label']}: 前回実行で完了済み")
+                else:
+                    print(f"   ❌ {result['label']}: 更新失敗 ({result['error']})")
+
+        # 全件完了したバッチのジャーナルは退避（次回は新規バッチとして実行）
+        if not stats['failed'] and os.path.exists(self.journal_path):
+            os.replace(self.journal_path, self.journal_path + ".done")
+
+        self.jobs.clear()
+        stats['succeeded'] = stats['updated'] + stats['skipped'] + stats['resumed']
+        stats['elapsed'] = time.time() - started
+        stats['results'] = results
+        print(f"📊 書き戻し完了: 更新{stats['updated']}件 / 変更なし{stats['skipped']}件 / "
+              f"失敗{stats['failed']}件 ({stats['elapsed']:.1f}秒)")
+        return stats
@@ -5,36 +5,233 @@
 WordPressから全データを自動取得し、ポートフォリオサイトに追加
 """
 
+import codecs
 import json
+import os
 import sys
 import subprocess
 import re
+import tempfile
+import threading
+import time
 import requests
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from html.parser import HTMLParser
 from urllib.parse import urlparse
 
+class StreamingMetaExtractor(HTMLParser):
+    """HTMLをチャンク単位で逐次解析し、必要なメタ情報が揃った時点で終了できるパーサー"""
+    
+    DATE_TEXT_PATTERNS = [
+        r'"datePublished"\s*:\s*"(\d{4}-\d{2}-\d{2})',
+        r'(\d{4}年\d{1,2}月\d{1,2}日)'
+    ]
+    
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.title = None
+        self.description = None
+        self.thumbnail = None
+        self.date = None
+        self.head_closed = False
+        self._in_title = False
+        self._title_parts = []
+    
+    @property
+    def is_complete(self):
+        """タイトル・説明・OGP画像・日付がすべて取得済みか"""
+        return all([self.title, self.description, self.thumbnail, self.date])
+    
+    def handle_starttag(self, tag, attrs):
+        attrs = {key.lower(): (value or '') for key, value in attrs}
+        if tag == 'title' and self.title is None:
+            self._in_title = True
+        elif tag == 'meta':
+            name = attrs.get('name', '').lower()
+            prop = attrs.get('property', '').lower()
+            content = attrs.get('content', '')
+            if name == 'description' and not self.description and content:
+                self.description = content
+            elif prop == 'og:image' and not self.thumbnail and content:
+                self.thumbnail = content
+            elif prop == 'article:published_time' and not self.date:
+                self._set_date(content)
+        elif tag == 'time' and not self.date:
+            self._set_date(attrs.get('datetime', ''))
+        elif tag == 'body':
+            self.head_closed = True
+    
+    def handle_endtag(self, tag):
+        if tag == 'title' and self._in_title:
+            self._in_title = False
+            self.title = ''.join(self._title_parts).strip()
+        elif tag == 'head':
+            self.head_closed = True
+    
+    def handle_data(self, data):
+        if self._in_title:
+            self._title_parts.append(data)
+        elif not self.date:
+            # JSON-LDや本文中の日付表記
+            for pattern in self.DATE_TEXT_PATTERNS:
+                date_match = re.search(pattern, data)
+                if date_match:
+                    self._set_date(date_match.group(1))
+                    break
+    
+    def _set_date(self, value):
+        """ISO形式・日本語形式の日付をYYYY-MM-DDに正規化して設定"""
+        iso_match = re.match(r'(\d{4}-\d{2}-\d{2})', value)
+        if iso_match:
+            self.date = iso_match.group(1)
+            return
+        ja_match = re.match(r'(\d{4})年(\d{1,2})月(\d{1,2})日', value)
+        if ja_match:
+            year, month, day = ja_match.groups()
+            self.date = f"{year}-{int(month):02d}-{int(day):02d}"
+
+class UrlValidator:
+    """プール済みセッションでURLを並列検証し、結果を有効期限付きでキャッシュする
+    
+    一時的な障害をいつまでも引きずらないよう、失敗結果は failure_ttl_seconds だけ保持する
+    """
+    
+    # HEADを拒否するサーバーが返しがちなステータス
+    HEAD_REJECTED_STATUSES = {403, 405, 501}
+    
+    def __init__(self, cache_path=".cache/url_validation.json", ttl_seconds=6 * 3600,
+                 failure_ttl_seconds=5 * 60, pool_size=16):
+        self.cache_path = cache_path
+        self.ttl_seconds = ttl_seconds
+        self.failure_ttl_seconds = failure_ttl_seconds
+        self.session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self._lock = threading.Lock()
+        self.cache = self.load_cache()
+        self.dirty = False
+    
+    def load_cache(self):
+        """キャッシュファイルを読み込み"""
+        try:
+            with open(self.cache_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+    
+    def is_fresh(self, verdict, now=None):
+        """キャッシュ済み結果が有効期限内か（成功と失敗で期限が異なる）"""
+        ttl = self.ttl_seconds if verdict.get('ok') else self.failure_ttl_seconds
+        return (now or time.time()) - verdict['checked_at'] < ttl
+    
+    def save_cache(self):
+        """新しい検証結果があれば、期限切れを除いたキャッシュをアトミックに保存（一時ファイル→置換）"""
+        now = time.time()
+        with self._lock:
+            if not self.dirty:
+                return
+            self.cache = {
+                url: verdict for url, verdict in self.cache.items()
+                if self.is_fresh(verdict, now)
+            }
+            directory = os.path.dirname(os.path.abspath(self.cache_path))
+            os.makedirs(directory, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.url_validation.', suffix='.json.tmp')
+            try:
+                with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                    json.dump(self.cache, f, ensure_ascii=False, indent=2)
+                os.replace(tmp_path, self.cache_path)
+            except Exception:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+                raise
+            self.dirty = False
+    
+    def check(self, url, use_cache=True):
+        """URLを検証し {ok, status, final_url, error, checked_at} を返す"""
+        if use_cache:
+            with self._lock:
+                verdict = self.cache.get(url)
+            if verdict and self.is_fresh(verdict):
+                return verdict
+        
+        verdict = {'ok': False, 'status': None, 'final_url': url, 'error': None, 'checked_at': time.time()}
+        try:
+            response = self.session.head(url, allow_redirects=True, timeout=10)
+            if response.status_code in self.HEAD_REJECTED_STATUSES:
+                # HEAD非対応 → 先頭1バイトだけのGETで再確認
+                response = self.session.get(
+                    url, headers={'Range': 'bytes=0-0'}, allow_redirects=True, timeout=10, stream=True
+                )
+                response.close()
+            verdict['status'] = response.status_code
+            verdict['final_url'] = response.url
+            verdict['ok'] = response.status_code < 400
+        except requests.RequestException as e:
+            verdict['error'] = str(e)
+        
+        with self._lock:
+            self.cache[url] = verdict
+            self.dirty = True
+        return verdict
+    
+    def check_many(self, urls, max_workers=16, use_cache=True):
+        """複数URLを並列検証し {url: verdict} を返す（キャッシュ保存は呼び出し側の処理終了時）"""
+        urls = list(dict.fromkeys(urls))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            verdicts = list(executor.map(lambda url: self.check(url, use_cache), urls))
+        return dict(zip(urls, verdicts))
+
 class ArticleAutoAdder:
     def __init__(self):
         self.articles_json_path = "public/content/articles/articles.json"
+        self.url_validator = UrlValidator()
         
     def validate_url(self, url):
         """URLの検証とWordPressサイトかの確認"""
-        try:
-            # URLが有効か確認
-            response = requests.head(url, allow_redirects=True, timeout=10)
-            if response.status_code == 404:
-                print(f"❌ エラー: URLが存在しません（404エラー）")
-                return False
-            elif response.status_code >= 400:
-                print(f"❌ エラー: URLにアクセスできません（ステータス: {response.status_code}）")
-                return False
-            
-            print(f"✅ URL検証成功: {url}")
-            return True
-            
-        except requests.RequestException as e:
-            print(f"❌ URLアクセスエラー: {e}")
+        verdict = self.url_validator.check(url)
+        if verdict['error']:
+            print(f"❌ URLアクセスエラー: {verdict['error']}")
+            return False
+        if verdict['status'] == 404:
+            print(f"❌ エラー: URLが存在しません（404エラー）")
             return False
+        elif not verdict['ok']:
+            print(f"❌ エラー: URLにアクセスできません（ステータス: {verdict['status']}）")
+            return False
+        
+        print(f"✅ URL検証成功: {url}")
+        return True
+    
+    def validate_urls_bulk(self, urls, max_workers=16):
+        """複数URLを並列検証し {url: 検証結果} を返す"""
+        return self.url_validator.check_many(urls, max_workers=max_workers)
+    
+    def revalidate_all_articles(self, max_workers=16):
+        """articles.json内の全記事URLを再検証（夜間バッチ用）。すべて有効ならTrue"""
+        with open(self.articles_json_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        
+        urls = [
+            article['url']
+            for articles in data.values() if isinstance(articles, list)
+            for article in articles if article.get('url')
+        ]
+        print(f"🔍 全記事URL再検証開始: {len(urls)}件")
+        
+        # 夜間再検証ではキャッシュを使わず常に最新の状態を確認
+        verdicts = self.url_validator.check_many(urls, max_workers=max_workers, use_cache=False)
+        self.url_validator.save_cache()
+        broken = {url: verdict for url, verdict in verdicts.items() if not verdict['ok']}
+        
+        for url, verdict in broken.items():
+            reason = verdict['error'] or f"ステータス: {verdict['status']}"
+            print(f"   ❌ {url}（{reason}）")
+        print(f"📊 検証結果: 正常 {len(verdicts) - len(broken)}件 / 異常 {len(broken)}件")
+        
+        return not broken
     
     def get_wordpress_data(self, url):
         """WordPress REST APIからデータを取得"""
@@ -157,43 +354,16 @@ class ArticleAutoAdder:
         try:
             print(f"📡 HTMLからデータ取得中...")
             
-            response = requests.get(url, timeout=10)
-            html = response.text
+            meta = self.stream_html_metadata(url)
             
             # タイトル取得
-            title_match = re.search(r'<title[^>]*>([^<]+)</title>', html, re.IGNORECASE)
-            title = title_match.group(1) if title_match else ""
+            title = meta.title or ""
             if ' | ' in title:
                 title = title.split(' | ')[0]
             
-            # メタディスクリプション取得
-            desc_match = re.search(r'<meta\s+name="description"\s+content="([^"]+)"', html, re.IGNORECASE)
-            if not desc_match:
-                desc_match = re.search(r'<meta\s+content="([^"]+)"\s+name="description"', html, re.IGNORECASE)
-            description = desc_match.group(1) if desc_match else ""
-            
-            # OGP画像取得
-            og_image_match = re.search(r'<meta\s+property="og:image"\s+content="([^"]+)"', html, re.IGNORECASE)
-            if not og_image_match:
-                og_image_match = re.search(r'<meta\s+content="([^"]+)"\s+property="og:image"', html, re.IGNORECASE)
-            thumbnail = og_image_match.group(1) if og_image_match else None
-            
-            # 日付取得（複数パターン）
-            date = datetime.now().strftime('%Y-%m-%d')
-            date_patterns = [
-                r'<time[^>]*datetime="(\d{4}-\d{2}-\d{2})',
-                r'"datePublished"\s*:\s*"(\d{4}-\d{2}-\d{2})',
-                r'(\d{4}年\d{1,2}月\d{1,2}日)'
-            ]
-            for pattern in date_patterns:
-                date_match = re.search(pattern, html)
-                if date_match:
-                    date_str = date_match.group(1)
-                    if '年' in date_str:
-                        # 日本語形式を変換
-                        date_str = re.sub(r'(\d{4})年(\d{1,2})月(\d{1,2})日', r'\1-\2-\3', date_str)
-                    date = date_str
-                    break
+            description = meta.description or ""
+            thumbnail = meta.thumbnail
+            date = meta.date or datetime.now().strftime('%Y-%m-%d')
             
             # タグ生成
             tags = self.generate_tags_from_title(title)
@@ -216,6 +386,34 @@ class ArticleAutoAdder:
             print(f"❌ HTML解析エラー: {e}")
             return None
     
+    def stream_html_metadata(self, url, chunk_size=4096, max_bytes=512 * 1024):
+        """レスポンスをチャンク単位で読み込み、メタ情報が揃った時点で転送を打ち切る
+        
+        <head>終了後も日付が見つからない場合のみ本文を読み進める（max_bytesまで）。
+        """
+        extractor = StreamingMetaExtractor()
+        with requests.get(url, timeout=10, stream=True) as response:
+            content_type = response.headers.get('content-type', '')
+            encoding = response.encoding if 'charset' in content_type.lower() else 'utf-8'
+            decoder = codecs.getincrementaldecoder(encoding or 'utf-8')(errors='replace')
+            
+            received = 0
+            for chunk in response.iter_content(chunk_size=chunk_size):
+                received += len(chunk)
+                extractor.feed(decoder.decode(chunk))
+                if extractor.is_complete:
+                    break
+                if extractor.head_closed and extractor.date:
+                    break
+                if received >= max_bytes:
+                    break
+            else:
+                extractor.feed(decoder.decode(b'', final=True))
+        
+        extractor.close()
+        print(f"   受信サイズ: {received / 1024:.1f}KB")
+        return extractor
+    
     def generate_tags_from_title(self, title):
         """タイトルからタグを生成"""
         tags = []
@@ -254,20 +452,17 @@ class ArticleAutoAdder:
         else:
             return 'seoArticles'
     
-    def add_article(self, url):
-        """記事を追加するメイン処理"""
-        print(f"🎯 記事追加処理開始: {url}")
-        print("-" * 50)
-        
+    def build_article_data(self, url):
+        """URL検証・データ取得を行い、articles.json用の記事データと記事タイプを返す"""
         # URL検証
         if not self.validate_url(url):
-            return False
+            return None, None
         
         # データ取得
         article_data = self.get_wordpress_data(url)
         if not article_data:
             print("❌ データ取得に失敗しました")
-            return False
+            return None, None
         
         # 記事タイプを判定
         article_type = self.detect_article_type(url)
@@ -281,6 +476,23 @@ class ArticleAutoAdder:
         if not article_data.get('thumbnail'):
             article_data['thumbnail'] = '/assets/images/default-blog-thumbnail.jpg'
         
+        return article_data, article_type
+    
+    def add_article(self, url):
+        """記事を追加するメイン処理（URL検証キャッシュは終了時に1回だけ保存）"""
+        try:
+            return self._add_article(url)
+        finally:
+            self.url_validator.save_cache()
+    
+    def _add_article(self, url):
+        print(f"🎯 記事追加処理開始: {url}")
+        print("-" * 50)
+        
+        article_data, article_type = self.build_article_data(url)
+        if not article_data:
+            return False
+        
         print("-" * 50)
         
         # articles.json更新
@@ -298,6 +510,72 @@ class ArticleAutoAdder:
         
         return True
     
+    def load_url_list(self, list_path):
+        """URLリストファイルを読み込み（1行1URL、空行と#コメントは無視）"""
+        urls = []
+        with open(list_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if line and not line.startswith('#') and line not in urls:
+                    urls.append(line)
+        return urls
+    
+    def add_articles_batch(self, urls, max_workers=8):
+        """複数記事を並列取得し、articles.jsonを1回だけ更新・1回だけデプロイ（URL検証キャッシュも終了時に1回保存）"""
+        try:
+            return self._add_articles_batch(urls, max_workers)
+        finally:
+            self.url_validator.save_cache()
+    
+    def _add_articles_batch(self, urls, max_workers):
+        # 入力URLの重複を除去（順序は維持）
+        urls = list(dict.fromkeys(urls))
+        print(f"🎯 一括記事追加処理開始: {len(urls)}件")
+        print("-" * 50)
+        
+        if not urls:
+            print("⚠️  追加対象のURLがありません")
+            return False
+        
+        # URLを事前に一括検証（結果はキャッシュされ、build_article_dataで再利用）
+        self.validate_urls_bulk(urls, max_workers=max_workers)
+        
+        # 並列でデータ取得
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            results = list(executor.map(self.build_article_data, urls))
+        
+        entries = []
+        failed = []
+        for url, (article_data, article_type) in zip(urls, results):
+            if article_data:
+                entries.append((article_data, article_type))
+            else:
+                failed.append(url)
+        
+        print("-" * 50)
+        print(f"📊 取得結果: 成功 {len(entries)}件 / 失敗 {len(failed)}件")
+        for url in failed:
+            print(f"   ❌ {url}")
+        
+        if not entries:
+            return False
+        
+        # articles.json一括更新
+        added = self.merge_articles_json(entries)
+        if added is None:
+            return False
+        
+        # 変更がある場合のみGit操作（1回）
+        if added > 0 and not self.git_deploy(added):
+            return False
+        
+        print("-" * 50)
+        print(f"🎉 一括記事追加完了！（追加 {added}件）")
+        print(f"📱 サイト確認: https://muffin-portfolio-public.vercel.app")
+        print("⏱️  Vercelデプロイまで1-2分お待ちください")
+        
+        return not failed
+    
     def extract_client_name(self, url):
         """URLからクライアント名を推測"""
         domain = urlparse(url).netloc
@@ -327,8 +605,7 @@ class ArticleAutoAdder:
             data[article_type].insert(0, article_data)
             
             # 保存
-            with open(self.articles_json_path, 'w', encoding='utf-8') as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
+            self.write_articles_json(data)
             
             print(f"✅ articles.json更新完了（{article_type}に追加）")
             return True
@@ -337,7 +614,64 @@ class ArticleAutoAdder:
             print(f"❌ ファイル更新エラー: {e}")
             return False
     
-    def git_deploy(self):
+    def merge_articles_json(self, entries):
+        """複数記事をメモリ上でマージ（URLで重複排除）し、1回だけ書き込む。追加件数を返す"""
+        try:
+            print(f"📝 articles.json一括更新中...")
+            
+            with open(self.articles_json_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            
+            # 既存URLを集合化（全記事タイプ横断で重複チェック）
+            existing_urls = {
+                article.get('url')
+                for articles in data.values() if isinstance(articles, list)
+                for article in articles
+            }
+            
+            new_articles = {}
+            for article_data, article_type in entries:
+                if article_data['url'] in existing_urls:
+                    print(f"⚠️  既存のためスキップ: {article_data['url']}")
+                    continue
+                existing_urls.add(article_data['url'])
+                new_articles.setdefault(article_type, []).append(article_data)
+            
+            added = sum(len(articles) for articles in new_articles.values())
+            if added == 0:
+                print("⚠️  追加すべき新規記事はありません")
+                return 0
+            
+            # 入力順を保ったまま先頭に追加
+            for article_type, articles in new_articles.items():
+                data[article_type] = articles + data.get(article_type, [])
+            
+            self.write_articles_json(data)
+            
+            for article_type, articles in new_articles.items():
+                print(f"✅ {article_type}に{len(articles)}件追加")
+            return added
+            
+        except Exception as e:
+            print(f"❌ ファイル更新エラー: {e}")
+            return None
+    
+    def write_articles_json(self, data):
+        """articles.jsonをアトミックに書き込み（一時ファイル→置換）"""
+        directory = os.path.dirname(os.path.abspath(self.articles_json_path))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.articles.', suffix='.json.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False, indent=2)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.articles_json_path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+    
+    def git_deploy(self, article_count=1):
         """Git操作でデプロイ"""
         try:
             print("🚀 Gitデプロイ中...")
@@ -347,6 +681,8 @@ class ArticleAutoAdder:
             
             # コミット
             commit_msg = f"記事追加: {datetime.now().strftime('%Y-%m-%d %H:%M')}"
+            if article_count > 1:
+                commit_msg += f" ({article_count}件)"
             subprocess.run(['git', 'commit', '-m', commit_msg], check=True)
             
             # プッシュ
@@ -362,8 +698,25 @@ class ArticleAutoAdder:
 
 def main():
     """メイン処理"""
+    if len(sys.argv) == 3 and sys.argv[1] == '--batch':
+        # 一括追加モード
+        adder = ArticleAutoAdder()
+        success = adder.add_articles_batch(adder.load_url_list(sys.argv[2]))
+        if not success:
+            print("❌ 一部またはすべての記事追加に失敗しました")
+            sys.exit(1)
+        return
+    
+    if len(sys.argv) == 2 and sys.argv[1] == '--validate-all':
+        # 既存記事URLの一括再検証モード
+        if not ArticleAutoAdder().revalidate_all_articles():
+            sys.exit(1)
+        return
+    
     if len(sys.argv) != 2:
         print("❌ 使用方法: python3 add_article_auto.py [記事URL]")
+        print("       python3 add_article_auto.py --batch [URLリストファイル]")
+        print("       python3 add_article_auto.py --validate-all")
         print("例: python3 add_article_auto.py https://muffin-blog.com/your-article/")
         return
     
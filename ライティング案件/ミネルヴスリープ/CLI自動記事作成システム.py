@@ -14,6 +14,9 @@ import os
 import re
 import json
 import sys
+import unicodedata
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 from typing import Dict, List, Optional, Tuple
 from pathlib import Path
@@ -21,21 +24,156 @@ from pathlib import Path
 # 統合アーカイブシステム import
 sys.path.append("/Users/satoumasamitsu/Desktop/osigoto/統合管理システム/資料アーカイブ/")
 try:
-    from archive_utilization_system import ArchiveUtilizationSystem
+    from archive_utilization_system import ArchiveUtilizationSystem, ArchiveServiceClient
 except ImportError:
     print("⚠️ アーカイブシステムが見つかりません。基本機能のみで動作します。")
     ArchiveUtilizationSystem = None
+    ArchiveServiceClient = None
+
+class ReferenceProfileBuilder:
+    """完成記事コーパスの統計プロファイル（見出し階層・セクション長・H2表現）を差分更新で管理"""
+    
+    # H2見出しの典型表現（数字は N に正規化して照合）
+    H2_PHRASE_PATTERNS = {
+        "Nつの": r'Nつ',
+        "N選": r'N選',
+        "疑問形": r'[？?]',
+        "とは": r'とは',
+        "選び方": r'選び方|選び',
+        "方法": r'方法|やり方|コツ',
+        "原因": r'原因|理由',
+        "対策": r'対策|解決',
+        "メリット・デメリット": r'メリット|デメリット',
+        "おすすめ": r'おすすめ',
+        "よくある質問": r'よくある質問|Q&A',
+        "まとめ": r'まとめ'
+    }
+    
+    def __init__(self, corpus_path: str, profile_path: str):
+        """初期化"""
+        self.corpus_path = corpus_path
+        self.profile_path = profile_path
+        self.articles = {}   # path -> 記事単位の統計（mtime/size付き）
+        try:
+            with open(self.profile_path, 'r', encoding='utf-8') as f:
+                self.articles = json.load(f).get("articles", {})
+        except (OSError, ValueError):
+            self.articles = {}
+    
+    def analyze_article(self, content: str) -> Dict:
+        """1記事分の統計を抽出"""
+        depth_histogram = Counter()
+        h2_phrases = Counter()
+        section_lengths = []
+        current_length = None
+        
+        for line in content.split('\n'):
+            heading = re.match(r'^(#{1,6})\s+(.+)$', line)
+            if heading:
+                level = len(heading.group(1))
+                depth_histogram[f"H{level}"] += 1
+                if level == 2:
+                    if current_length is not None:
+                        section_lengths.append(current_length)
+                    current_length = 0
+                    text = re.sub(r'\d+', 'N', unicodedata.normalize("NFKC", heading.group(2)))
+                    for phrase, pattern in self.H2_PHRASE_PATTERNS.items():
+                        if re.search(pattern, text):
+                            h2_phrases[phrase] += 1
+                continue
+            if current_length is not None:
+                current_length += len(line.strip())
+        
+        if current_length is not None:
+            section_lengths.append(current_length)
+        
+        return {
+            "depth_histogram": dict(depth_histogram),
+            "section_lengths": section_lengths,
+            "h2_phrases": dict(h2_phrases)
+        }
+    
+    def refresh(self) -> int:
+        """新規・更新された完成記事のみ再解析し、更新件数を返す"""
+        seen = set()
+        updated = 0
+        
+        for file_path in Path(self.corpus_path).glob("**/*.md"):
+            path = str(file_path)
+            seen.add(path)
+            stat = file_path.stat()
+            article = self.articles.get(path)
+            if article and article["mtime"] == stat.st_mtime and article["size"] == stat.st_size:
+                continue
+            
+            try:
+                with open(file_path, 'r', encoding='utf-8') as f:
+                    stats = self.analyze_article(f.read())
+            except Exception as e:
+                print(f"⚠️ 参照プロファイル解析警告 ({file_path.name}): {e}")
+                continue
+            
+            stats.update({"mtime": stat.st_mtime, "size": stat.st_size})
+            self.articles[path] = stats
+            updated += 1
+        
+        for path in [p for p in self.articles if p not in seen]:
+            del self.articles[path]
+            updated += 1
+        
+        if updated:
+            self.save()
+        return updated
+    
+    def save(self):
+        """プロファイル保存（記事単位の統計と集計結果）"""
+        os.makedirs(os.path.dirname(self.profile_path), exist_ok=True)
+        tmp_path = self.profile_path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({"profile": self.aggregate(), "articles": self.articles}, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.profile_path)
+    
+    def aggregate(self) -> Dict:
+        """記事単位の統計をコーパス全体のプロファイルに集計"""
+        depth_histogram = Counter()
+        h2_phrases = Counter()
+        section_lengths = []
+        h2_counts = []
+        
+        for article in self.articles.values():
+            depth_histogram.update(article["depth_histogram"])
+            h2_phrases.update(article["h2_phrases"])
+            section_lengths.extend(article["section_lengths"])
+            h2_counts.append(article["depth_histogram"].get("H2", 0))
+        
+        article_count = len(self.articles)
+        return {
+            "article_count": article_count,
+            "depth_histogram": dict(depth_histogram),
+            "avg_h2_per_article": round(sum(h2_counts) / article_count, 1) if article_count else 0,
+            "avg_section_chars": round(sum(section_lengths) / len(section_lengths)) if section_lengths else 0,
+            "common_h2_phrases": [phrase for phrase, _ in h2_phrases.most_common(5)]
+        }
+    
+    def load(self) -> Dict:
+        """差分更新後のプロファイルを返す"""
+        updated = self.refresh()
+        if updated:
+            print(f"📊 参照プロファイル更新: {updated}件")
+        return self.aggregate()
 
 class CLIAutoWritingSystem:
     """CLI自動記事作成システム - ライティング案件側"""
     
-    def __init__(self):
-        """初期化"""
+    def __init__(self, use_archive: bool = True):
+        """初期化（use_archive=Falseでアーカイブ連携を省略）"""
         self.base_path = "/Users/satoumasamitsu/Desktop/osigoto/ライティング案件/ミネルヴスリープ/"
         self.template_path = os.path.join(self.base_path, "テンプレート/記事作成完全テンプレート_FINAL.md")
         self.work_in_progress_path = os.path.join(self.base_path, "記事/3_作成中/")
         self.completed_path = os.path.join(self.base_path, "記事/2_完成記事/")
         self.reference_articles_path = os.path.join(self.base_path, "記事/2_完成記事/追加記事/")
+        self.reference_profile_path = os.path.join(self.base_path, ".cache/reference_profile.json")
+        self.final_template = ""
         
         # 参照記事（2025年8月11日記事）
         self.reference_articles = [
@@ -43,22 +181,43 @@ class CLIAutoWritingSystem:
             "2025.08.11.社会人.睡眠時間.md"
         ]
         
-        # + α 統合アーカイブシステム初期化
+        # + α 統合アーカイブシステム初期化（常駐サービスが起動していればそちらを利用）
         self.archive_system = None
-        if ArchiveUtilizationSystem:
+        if not use_archive:
+            return
+        if ArchiveServiceClient:
+            self.archive_system = ArchiveServiceClient.connect()
+            if self.archive_system:
+                print("✅ 常駐アーカイブサービス接続完了")
+        if self.archive_system is None and ArchiveUtilizationSystem:
             try:
                 self.archive_system = ArchiveUtilizationSystem()
                 print("✅ 統合アーカイブシステム連携完了")
             except Exception as e:
                 print(f"⚠️ アーカイブシステム初期化警告: {e}")
-        else:
+        elif self.archive_system is None:
             print("ℹ️ 基本機能のみで動作中（アーカイブ機能無効）")
     
+    def close(self):
+        """常駐アーカイブサービスへの接続を閉じる"""
+        if ArchiveServiceClient and isinstance(self.archive_system, ArchiveServiceClient):
+            self.archive_system.close()
+        self.archive_system = None
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+    
     def load_final_template(self) -> str:
-        """FINAL版テンプレートを読み込み"""
+        """FINAL版テンプレートを読み込み（読み込み済み・共有済みならそれを返す）"""
+        if self.final_template:
+            return self.final_template
         try:
             with open(self.template_path, 'r', encoding='utf-8') as f:
-                return f.read()
+                self.final_template = f.read()
+            return self.final_template
         except Exception as e:
             print(f"❌ FINAL版テンプレート読み込みエラー: {e}")
             return ""
@@ -267,6 +426,16 @@ class CLIAutoWritingSystem:
             input_data, reader_analysis, reference_patterns
         )
         
+        # 参照プロファイルの要約（コーパスがある場合のみ）
+        profile = reference_patterns.get("profile")
+        profile_note = ""
+        if profile:
+            profile_note = (
+                f"\n- 参照コーパス{profile['article_count']}記事の傾向: "
+                f"H2平均{profile['avg_h2_per_article']}個・1セクション平均{profile['avg_section_chars']}文字"
+                f"（頻出H2表現: {', '.join(profile['common_h2_phrases'])}）"
+            )
+        
         # 骨格ファイル作成
         skeleton = f"""# 記事骨格：{title}
 
@@ -296,7 +465,7 @@ class CLIAutoWritingSystem:
 - 参照記事（8月11日）のトーンを踏襲
 - 読者の悩みファーストで構成
 - 具体的で実践しやすい内容
-- スクロール効率（1見出し1箇条書き）遵守
+- スクロール効率（1見出し1箇条書き）遵守{profile_note}
 
 ---
 **作成日時**: {datetime.now().strftime('%Y年%m月%d日 %H時%M分')}
@@ -306,8 +475,17 @@ class CLIAutoWritingSystem:
         print("✅ 記事構造作成完了")
         return skeleton
     
+    def load_reference_profile(self) -> Dict:
+        """完成記事コーパス全体の参照プロファイルを取得（新しい完成記事のみ差分解析）"""
+        try:
+            builder = ReferenceProfileBuilder(self.completed_path, self.reference_profile_path)
+            return builder.load()
+        except Exception as e:
+            print(f"⚠️ 参照プロファイル読み込み警告: {e}")
+            return {}
+    
     def _analyze_reference_patterns(self, references: Dict) -> Dict:
-        """参照記事のパターン分析"""
+        """参照記事のパターン分析（参照プロファイル優先、なければ参照記事本文から抽出）"""
         patterns = {
             "heading_style": "## ",
             "numbered_lists": True,
@@ -315,6 +493,19 @@ class CLIAutoWritingSystem:
             "tone": "親しみやすい・実用的"
         }
         
+        if getattr(self, "reference_profile", None) is None:
+            self.reference_profile = self.load_reference_profile()
+        profile = self.reference_profile
+        
+        if profile.get("article_count"):
+            common_phrases = profile["common_h2_phrases"]
+            if "Nつの" in common_phrases or "N選" in common_phrases:
+                patterns["uses_numbers"] = True
+            if "メリット・デメリット" in common_phrases:
+                patterns["pros_cons"] = True
+            patterns["profile"] = profile
+            return patterns
+        
         # 実際の参照記事から見出しパターンを抽出
         for article_name, content in references.items():
             lines = content.split('\n')
@@ -410,19 +601,174 @@ class CLIAutoWritingSystem:
         
         filename = f"{timestamp}_{main_keyword_clean}_骨格.md"
         
-        # 保存
+        # 保存（同一秒・同一キーワードの上書きを防止）
         os.makedirs(self.work_in_progress_path, exist_ok=True)
         file_path = os.path.join(self.work_in_progress_path, filename)
+        suffix = 2
+        while os.path.exists(file_path):
+            file_path = os.path.join(self.work_in_progress_path, f"{timestamp}_{main_keyword_clean}_骨格_{suffix}.md")
+            suffix += 1
         
         with open(file_path, 'w', encoding='utf-8') as f:
             f.write(skeleton_content)
         
         return file_path
 
+    def load_batch_briefs(self, source: str) -> List[Dict]:
+        """ディレクトリ（*.txt / *.md）またはJSONLから複数の資料を読み込み解析"""
+        briefs = []
+        
+        if os.path.isdir(source):
+            for file_path in sorted(Path(source).iterdir()):
+                if file_path.suffix not in ('.txt', '.md'):
+                    continue
+                with open(file_path, 'r', encoding='utf-8') as f:
+                    data = self.parse_input_data(f.read())
+                data["source"] = file_path.name
+                briefs.append(data)
+        else:
+            with open(source, 'r', encoding='utf-8') as f:
+                for line_number, line in enumerate(f, 1):
+                    if not line.strip():
+                        continue
+                    record = json.loads(line)
+                    # {"text": 資料テキスト} または解析済みフィールドをそのまま受け付ける
+                    data = self.parse_input_data(record["text"]) if "text" in record else {
+                        "project": record.get("project", ""),
+                        "main_keyword": record.get("main_keyword", ""),
+                        "related_keywords": record.get("related_keywords", []),
+                        "competitor_analysis": record.get("competitor_analysis", ""),
+                        "target_audience": record.get("target_audience", ""),
+                        "other_requirements": record.get("other_requirements", "")
+                    }
+                    data["source"] = f"{os.path.basename(source)}:{line_number}"
+                    briefs.append(data)
+        
+        return briefs
+    
+    def analyze_archive(self, input_data: Dict) -> Optional[Dict]:
+        """統合アーカイブ分析（重複リスク・差別化提案を表示して分析結果を返す）"""
+        if not self.archive_system:
+            return None
+        try:
+            user_request = f"メインキーワード: {input_data['main_keyword']}, 関連: {', '.join(input_data['related_keywords'])}"
+            archive_analysis = self.archive_system.auto_archive_utilization_workflow(user_request)
+        except Exception as e:
+            print(f"⚠️ アーカイブ分析エラー: {e}")
+            return None
+        
+        if archive_analysis["workflow_status"] != "success":
+            print("⚠️ アーカイブ分析で問題が発生しました")
+            return archive_analysis
+        
+        print("✅ アーカイブ分析完了")
+        duplication = archive_analysis["duplication_check"]
+        if duplication["status"] != "SAFE":
+            print(f"⚠️ 重複リスク検出: {duplication['status']}")
+            if duplication["suggestions"]:
+                print(f"💡 差別化提案: {duplication['suggestions'][0]}")
+        return archive_analysis
+    
+    @staticmethod
+    def confirm_duplication_risk(archive_analysis: Optional[Dict]) -> bool:
+        """重複リスクが高い場合は続行の確認を求める（入力がない場合は中止）"""
+        if not archive_analysis or archive_analysis["workflow_status"] != "success":
+            return True
+        if archive_analysis["duplication_check"]["status"] != "HIGH_RISK":
+            return True
+        try:
+            continue_confirm = input(f"\n⚠️ 高い重複リスクが検出されました。続行しますか？ (y/n): ").lower().strip()
+        except EOFError:
+            continue_confirm = ""
+        return continue_confirm == 'y'
+    
+    def generate_skeleton(self, input_data: Dict, references: Dict) -> str:
+        """1件分の骨格を生成（読者ニーズ分析 → 記事構造作成）"""
+        reader_analysis = self.analyze_reader_needs(
+            input_data["main_keyword"],
+            input_data["related_keywords"]
+        )
+        return self.create_article_structure(input_data, reader_analysis, references)
+    
+    def run_batch(self, source: str, max_workers: Optional[int] = None) -> List[Dict]:
+        """複数資料の重複チェック後、骨格をプロセスプールで並列生成し「3_作成中」へ一括保存"""
+        template = self.load_final_template()
+        if not template:
+            print("❌ FINAL版テンプレートが読み込めません")
+            return []
+        
+        # テンプレート・参照記事・参照プロファイルは1回だけ読み込み、ワーカーへ共有
+        references = self.load_reference_articles()
+        reference_profile = self.load_reference_profile()
+        briefs = self.load_batch_briefs(source)
+        
+        # 重複チェックは1件ずつ親プロセスで実行（アーカイブ・常駐サービス接続はワーカーへ持ち込まない）
+        valid_briefs = []
+        duplication_status = {}
+        for brief in briefs:
+            if not brief.get("main_keyword"):
+                print(f"⚠️ メインキーワードなしのためスキップ: {brief['source']}")
+                continue
+            print(f"\n🔍 統合アーカイブ分析: {brief['source']}")
+            archive_analysis = self.analyze_archive(brief)
+            if not self.confirm_duplication_risk(archive_analysis):
+                print(f"❌ 重複リスクのためスキップ: {brief['source']}")
+                continue
+            if archive_analysis and archive_analysis["workflow_status"] == "success":
+                duplication_status[brief["source"]] = archive_analysis["duplication_check"]["status"]
+            valid_briefs.append(brief)
+        
+        print(f"🚀 一括骨格生成開始: {len(valid_briefs)}件")
+        
+        with ProcessPoolExecutor(
+            max_workers=max_workers,
+            initializer=_init_batch_worker,
+            initargs=(template, references, reference_profile)
+        ) as executor:
+            skeletons = list(executor.map(_generate_skeleton_worker, valid_briefs))
+        
+        results = []
+        for brief, skeleton in zip(valid_briefs, skeletons):
+            file_path = self.save_skeleton_file(skeleton, brief)
+            results.append({
+                "source": brief["source"],
+                "main_keyword": brief["main_keyword"],
+                "file_path": file_path,
+                "duplication_status": duplication_status.get(brief["source"])
+            })
+            print(f"✅ {brief['source']} → {os.path.basename(file_path)}")
+        
+        print(f"🎉 一括骨格生成完了: {len(results)}件保存（{self.work_in_progress_path}）")
+        return results
+
+# 一括生成ワーカー（プロセスごとに1回だけ初期化される読み取り専用データ）
+_batch_worker_system = None
+_batch_worker_references = None
+
+def _init_batch_worker(template: str, references: Dict[str, str], reference_profile: Dict):
+    """ワーカープロセス初期化（重複チェックは親プロセスで実施済みのためアーカイブ連携なし）"""
+    global _batch_worker_system, _batch_worker_references
+    _batch_worker_system = CLIAutoWritingSystem(use_archive=False)
+    _batch_worker_system.final_template = template
+    _batch_worker_system.reference_profile = reference_profile
+    _batch_worker_references = references
+
+def _generate_skeleton_worker(input_data: Dict) -> str:
+    """ワーカープロセスで骨格を生成"""
+    return _batch_worker_system.generate_skeleton(input_data, _batch_worker_references)
+
 def main():
-    """メイン実行関数"""
-    system = CLIAutoWritingSystem()
+    """メイン実行関数（--batch [ディレクトリ or JSONL] で一括生成）"""
+    if len(sys.argv) == 3 and sys.argv[1] == '--batch':
+        with CLIAutoWritingSystem() as system:
+            system.run_batch(sys.argv[2])
+        return
     
+    with CLIAutoWritingSystem() as system:
+        run_interactive(system)
+
+def run_interactive(system: CLIAutoWritingSystem):
+    """対話モード（資料入力 → アーカイブ分析 → 骨格作成・保存）"""
     print("🚀 CLI自動記事作成システム - ライティング案件（ミネルヴスリープ）")
     print("=" * 80)
     
@@ -483,29 +829,12 @@ def main():
     print(f"   関連キーワード: {', '.join(input_data['related_keywords'])}")
     
     # + α アーカイブシステム統合分析
-    archive_analysis = None
     if system.archive_system:
-        try:
-            print("\n🔍 統合アーカイブ分析実行中...")
-            user_request = f"メインキーワード: {input_data['main_keyword']}, 関連: {', '.join(input_data['related_keywords'])}"
-            archive_analysis = system.archive_system.auto_archive_utilization_workflow(user_request)
-            if archive_analysis["workflow_status"] == "success":
-                print("✅ アーカイブ分析完了")
-                if archive_analysis["duplication_check"]["status"] != "SAFE":
-                    print(f"⚠️ 重複リスク検出: {archive_analysis['duplication_check']['status']}")
-                    if archive_analysis["duplication_check"]["suggestions"]:
-                        print(f"💡 差別化提案: {archive_analysis['duplication_check']['suggestions'][0]}")
-                        
-                        # 重複リスクが高い場合は確認を求める
-                        if archive_analysis["duplication_check"]["status"] == "HIGH_RISK":
-                            continue_confirm = input(f"\n⚠️ 高い重複リスクが検出されました。続行しますか？ (y/n): ").lower().strip()
-                            if continue_confirm != 'y':
-                                print("❌ 記事作成をキャンセルしました")
-                                return
-            else:
-                print("⚠️ アーカイブ分析で問題が発生しました")
-        except Exception as e:
-            print(f"⚠️ アーカイブ分析エラー: {e}")
+        print("\n🔍 統合アーカイブ分析実行中...")
+    archive_analysis = system.analyze_archive(input_data)
+    if not system.confirm_duplication_risk(archive_analysis):
+        print("❌ 記事作成をキャンセルしました")
+        return
     
     # 読者ニーズ分析
     print("\n🎯 読者ニーズ分析実行中...")
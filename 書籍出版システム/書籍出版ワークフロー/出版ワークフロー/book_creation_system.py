@@ -5,45 +5,204 @@
 
 import os
 import json
+import hashlib
+import sqlite3
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 from typing import Dict, List, Optional
 import markdown
+from markdown.extensions.toc import slugify
+from functools import partial
 from pathlib import Path
+from daily_log_index import DailyLogIndex, DEFAULT_LOG_DIRS
+
+MARKDOWN_EXTENSIONS = ['toc', 'tables', 'fenced_code']
+
+def prefixed_slugify(value: str, separator: str, prefix: str) -> str:
+    """見出しidに章ごとの接頭辞を付ける（章を個別に変換しても統合HTMLでidが重複しない）"""
+    slug = slugify(value, separator)
+    return f"{prefix}{separator}{slug}" if slug else prefix
+
+def render_markdown_html(markdown_text: str, id_prefix: str = "") -> str:
+    """Markdown→HTML変換（並列ワーカーから呼び出すためモジュール関数）
+
+    id_prefix を指定すると見出しidをその名前空間で採番する（例: ch01, ch01_1, ch01-overview）
+    """
+    if not id_prefix:
+        return markdown.markdown(markdown_text, extensions=MARKDOWN_EXTENSIONS)
+    extension_configs = {'toc': {'slugify': partial(prefixed_slugify, prefix=id_prefix)}}
+    return markdown.markdown(markdown_text, extensions=MARKDOWN_EXTENSIONS, extension_configs=extension_configs)
+
+def html_document_open(title: str) -> str:
+    """HTML文書の開始部分（<body>まで）"""
+    return f"""
+<!DOCTYPE html>
+<html lang="ja">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>{title}</title>
+    <style>
+        body {{ font-family: 'Hiragino Kaku Gothic Pro', sans-serif; line-height: 1.6; margin: 40px; }}
+        h1, h2, h3 {{ color: #333; }}
+        code {{ background: #f4f4f4; padding: 2px 4px; }}
+        pre {{ background: #f4f4f4; padding: 15px; overflow-x: auto; }}
+        nav {{ margin: 20px 0; }}
+    </style>
+</head>
+<body>
+"""
+
+def html_document_close() -> str:
+    """HTML文書の終了部分"""
+    return """
+</body>
+</html>
+"""
 
 class BookPublishingSystem:
     """書籍出版ワークフロー管理システム"""
     
-    def __init__(self, base_path: str = None):
+    # テーマ別キーワード（章立ての洞察抽出に使用）
+    THEME_KEYWORDS = {
+        "ai_collaboration": ["AI協働", "Claude Code", "協働パターン", "AI活用"],
+        "system_building": ["段階的", "システム構築", "テスト", "検証"],
+        "wordpress_seo": ["WordPress", "SEO", "タイトル", "メタデータ"],
+        "image_system": ["Unsplash", "画像", "alt属性", "アイキャッチ"],
+        "quality_assurance": ["品質保証", "AI表現", "スコア", "チェック"],
+        "automation": ["自動化", "ワークフロー", "NotebookLM", "フェーズ"],
+        "system_management": ["GitHub", "保存", "セキュリティ", "管理"],
+        "future_prospects": ["未来", "展望", "ビジネス", "ROI", "効果"]
+    }
+    
+    def __init__(self, base_path: str = None, use_log_index: bool = True):
         self.base_path = base_path or "/Users/satoumasamitsu/osigoto/ブログ自動化/book_publication"
         self.knowledge_base_path = os.path.join(self.base_path, "knowledge_base")
+        self.use_log_index = use_log_index
+        self._log_index = None
         self.manuscript_path = os.path.join(self.base_path, "manuscript_drafts")
+        self.cache_path = os.path.join(self.knowledge_base_path, ".cache")
+        self.section_cache_path = os.path.join(self.cache_path, "report_sections.json")
+        self.chapter_cache_path = os.path.join(self.manuscript_path, ".chapter_cache")
         
         # ディレクトリ作成
         os.makedirs(self.manuscript_path, exist_ok=True)
+    
+    @property
+    def log_index(self) -> DailyLogIndex:
+        """日報・ログ横断インデックス（初回アクセス時に接続）"""
+        if self._log_index is None:
+            reports_path = os.path.join(self.knowledge_base_path, "daily_reports")
+            self._log_index = DailyLogIndex(
+                os.path.join(self.knowledge_base_path, "daily_log_index.sqlite3"),
+                DEFAULT_LOG_DIRS[:2] + [reports_path]
+            )
+        return self._log_index
+    
+    def collect_reports_from_index(self, date_from: Optional[str] = None, date_to: Optional[str] = None) -> List[Dict]:
+        """横断インデックスから重複排除済みの日報を取得"""
+        stats = self.log_index.refresh()
+        print(f"📋 日報インデックス: 走査 {stats['scanned']}件 / 更新 {stats['updated']}件 / 新規文書 {stats['new_documents']}件")
+        # 洞察候補は文書（内容ハッシュ）単位でテーマ定義のバージョンとともにインデックスへ保存済み
+        theme_version = self.theme_version()
+        reports = self.log_index.reports_between(date_from, date_to, insight_version=theme_version)
+        extracted = {}
+        for report in reports:
+            if 'insight_candidates' not in report:
+                report['insight_candidates'] = self.extract_insight_candidates(report['sections'])
+                extracted[report['content_hash']] = report['insight_candidates']
+        if extracted:
+            self.log_index.store_insights(theme_version, extracted)
+        print(f"📋 洞察候補: 新規抽出 {len(extracted)}件 / 保存済み利用 {len(reports) - len(extracted)}件")
+        return reports
+        
+    def collect_daily_reports(self, use_cache: bool = True) -> List[Dict]:
+        """日報ファイルを収集・解析
+        
+        use_cache=True の場合、path+mtimeが変わっていない日報はセクション解析結果を
+        キャッシュから再利用する（キャッシュ由来の日報には 'content' を含めない）。
+        既定では日報・ログ横断インデックスから取得し、インデックスが使えない場合
+        （use_log_index=False・SQLiteエラー等）はdaily_reportsディレクトリを直接走査する。
+        """
+        if self.use_log_index:
+            try:
+                return self.collect_reports_from_index()
+            except (sqlite3.Error, OSError) as e:
+                print(f"⚠️ 日報インデックス利用不可のためディレクトリを走査します: {e}")
         
-    def collect_daily_reports(self) -> List[Dict]:
-        """日報ファイルを収集・解析"""
         reports_path = os.path.join(self.knowledge_base_path, "daily_reports")
         reports = []
         
         if not os.path.exists(reports_path):
             return reports
+        
+        cache = self.load_section_cache() if use_cache else {}
+        updated_cache = {}
+        parsed_count = 0
             
         for filename in os.listdir(reports_path):
             if filename.endswith('.md'):
                 file_path = os.path.join(reports_path, filename)
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    content = f.read()
+                mtime = os.path.getmtime(file_path)
+                
+                cached = cache.get(file_path)
+                if cached and cached['mtime'] == mtime:
+                    report = {
+                        'date': cached['date'],
+                        'filename': filename,
+                        'sections': cached['sections']
+                    }
+                    # テーマ定義が変わっていればキャッシュ済みセクションから再タグ付け
+                    if cached.get('theme_version') == self.theme_version() and 'insight_candidates' in cached:
+                        report['insight_candidates'] = cached['insight_candidates']
+                    else:
+                        report['insight_candidates'] = self.extract_insight_candidates(report['sections'])
+                        parsed_count += 1
+                else:
+                    with open(file_path, 'r', encoding='utf-8') as f:
+                        content = f.read()
                     
-                reports.append({
-                    'date': self.extract_date_from_filename(filename),
-                    'filename': filename,
-                    'content': content,
-                    'sections': self.parse_report_sections(content)
-                })
+                    report = {
+                        'date': self.extract_date_from_filename(filename),
+                        'filename': filename,
+                        'content': content,
+                        'sections': self.parse_report_sections(content)
+                    }
+                    report['insight_candidates'] = self.extract_insight_candidates(report['sections'])
+                    parsed_count += 1
+                
+                reports.append(report)
+                updated_cache[file_path] = {
+                    'mtime': mtime,
+                    'date': report['date'],
+                    'sections': report['sections'],
+                    'insight_candidates': report['insight_candidates'],
+                    'theme_version': self.theme_version()
+                }
+        
+        if use_cache and (parsed_count or set(updated_cache) != set(cache)):
+            self.save_section_cache(updated_cache)
+        if use_cache:
+            print(f"📋 日報解析: 新規・更新 {parsed_count}件 / キャッシュ利用 {len(reports) - parsed_count}件")
         
         return sorted(reports, key=lambda x: x['date'])
     
+    def load_section_cache(self) -> Dict:
+        """日報セクション解析キャッシュ読み込み"""
+        try:
+            with open(self.section_cache_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+    
+    def save_section_cache(self, cache: Dict):
+        """日報セクション解析キャッシュ保存"""
+        os.makedirs(self.cache_path, exist_ok=True)
+        tmp_path = self.section_cache_path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(cache, f, ensure_ascii=False)
+        os.replace(tmp_path, self.section_cache_path)
+    
     def extract_date_from_filename(self, filename: str) -> str:
         """ファイル名から日付抽出"""
         # 例: 2025-08-07_session_complete.md -> 2025-08-07
@@ -73,6 +232,9 @@ class BookPublishingSystem:
     def generate_chapter_outline(self, reports: List[Dict]) -> Dict:
         """日報から章立て自動生成"""
         
+        # 全テーマの洞察を1回の走査で索引化
+        theme_index = self.build_theme_index(reports)
+        
         chapter_outline = {
             "title": "AI協働ブログ自動化の実践 - Claude Code と共に構築する完全自動化システム",
             "subtitle": "NotebookLMからWordPressまで、5分で記事投稿する技術",
@@ -85,7 +247,7 @@ class BookPublishingSystem:
                         "Claude Codeとの出会い",
                         "AI協働による可能性の発見"
                     ],
-                    "key_insights": self.extract_insights_by_theme(reports, "ai_collaboration")
+                    "key_insights": theme_index.get("ai_collaboration", [])[:5]
                 },
                 {
                     "number": 2, 
@@ -95,7 +257,7 @@ class BookPublishingSystem:
                         "WordPress API統合の第一歩",
                         "テスト・検証・改善のサイクル"
                     ],
-                    "key_insights": self.extract_insights_by_theme(reports, "system_building")
+                    "key_insights": theme_index.get("system_building", [])[:5]
                 },
                 {
                     "number": 3,
@@ -105,7 +267,7 @@ class BookPublishingSystem:
                         "28-32文字タイトル最適化の実装",
                         "メタデータ自動生成システム"
                     ],
-                    "key_insights": self.extract_insights_by_theme(reports, "wordpress_seo")
+                    "key_insights": theme_index.get("wordpress_seo", [])[:5]
                 },
                 {
                     "number": 4,
@@ -115,7 +277,7 @@ class BookPublishingSystem:
                         "SEO最適化alt属性の自動生成",
                         "スコアリングシステムによる品質確保"
                     ],
-                    "key_insights": self.extract_insights_by_theme(reports, "image_system")
+                    "key_insights": theme_index.get("image_system", [])[:5]
                 },
                 {
                     "number": 5,
@@ -125,7 +287,7 @@ class BookPublishingSystem:
                         "マフィンブログフォーマット準拠チェック",
                         "スコアリングによる品質担保"
                     ],
-                    "key_insights": self.extract_insights_by_theme(reports, "quality_assurance")
+                    "key_insights": theme_index.get("quality_assurance", [])[:5]
                 },
                 {
                     "number": 6,
@@ -135,7 +297,7 @@ class BookPublishingSystem:
                         "NotebookLM要約からの自動実行",
                         "ユーザー体験の最適化"
                     ],
-                    "key_insights": self.extract_insights_by_theme(reports, "automation")
+                    "key_insights": theme_index.get("automation", [])[:5]
                 },
                 {
                     "number": 7,
@@ -145,7 +307,7 @@ class BookPublishingSystem:
                         "セキュリティ考慮事項",
                         "拡張性・汎用性の確保"
                     ],
-                    "key_insights": self.extract_insights_by_theme(reports, "system_management")
+                    "key_insights": theme_index.get("system_management", [])[:5]
                 },
                 {
                     "number": 8,
@@ -155,7 +317,7 @@ class BookPublishingSystem:
                         "他業界への応用可能性", 
                         "次世代AI協働システムの展望"
                     ],
-                    "key_insights": self.extract_insights_by_theme(reports, "future_prospects")
+                    "key_insights": theme_index.get("future_prospects", [])[:5]
                 }
             ],
             "appendix": [
@@ -168,39 +330,70 @@ class BookPublishingSystem:
         
         return chapter_outline
     
+    def theme_version(self) -> str:
+        """テーマ定義のハッシュ（キャッシュ済みタグの有効性判定用）"""
+        serialized = json.dumps(self.THEME_KEYWORDS, ensure_ascii=False, sort_keys=True)
+        return hashlib.sha1(serialized.encode('utf-8')).hexdigest()[:12]
+    
+    def extract_insight_candidates(self, sections: Dict) -> List[Dict]:
+        """洞察候補行（見出し・強調行）を抽出し、該当する全テーマでタグ付け"""
+        candidates = []
+        for section_content in sections.values():
+            for line in section_content.split('\n'):
+                if '###' in line or '**' in line:
+                    themes = [
+                        theme for theme, keywords in self.THEME_KEYWORDS.items()
+                        if any(keyword in line for keyword in keywords)
+                    ]
+                    candidates.append({'text': line.strip(), 'themes': themes})
+        return candidates
+    
+    def build_theme_index(self, reports: List[Dict]) -> Dict[str, List[str]]:
+        """日報を1回走査し、テーマ → 洞察リスト（日報・出現順）の索引を作成"""
+        index = {theme: [] for theme in self.THEME_KEYWORDS}
+        for report in reports:
+            candidates = report.get('insight_candidates')
+            if candidates is None and 'sections' in report:
+                candidates = self.extract_insight_candidates(report['sections'])
+            for candidate in candidates or []:
+                for theme in candidate['themes']:
+                    index[theme].append(candidate['text'])
+        return index
+    
+    def query_insights(self, reports: List[Dict], keywords: List[str]) -> List[str]:
+        """任意キーワード（未定義テーマ）の洞察を候補行のみから検索（本文の再走査なし）"""
+        insights = []
+        for report in reports:
+            candidates = report.get('insight_candidates')
+            if candidates is None and 'sections' in report:
+                candidates = self.extract_insight_candidates(report['sections'])
+            for candidate in candidates or []:
+                if any(keyword in candidate['text'] for keyword in keywords):
+                    insights.append(candidate['text'])
+        return insights
+    
     def extract_insights_by_theme(self, reports: List[Dict], theme: str) -> List[str]:
         """テーマ別の洞察抽出"""
-        insights = []
+        return self.build_theme_index(reports).get(theme, [])[:5]  # 上位5つの洞察
+    
+    def generate_manuscript_draft(self, outline: Dict) -> str:
+        """章立てから原稿ドラフト生成"""
         
-        theme_keywords = {
-            "ai_collaboration": ["AI協働", "Claude Code", "協働パターン", "AI活用"],
-            "system_building": ["段階的", "システム構築", "テスト", "検証"],
-            "wordpress_seo": ["WordPress", "SEO", "タイトル", "メタデータ"],
-            "image_system": ["Unsplash", "画像", "alt属性", "アイキャッチ"],
-            "quality_assurance": ["品質保証", "AI表現", "スコア", "チェック"],
-            "automation": ["自動化", "ワークフロー", "NotebookLM", "フェーズ"],
-            "system_management": ["GitHub", "保存", "セキュリティ", "管理"],
-            "future_prospects": ["未来", "展望", "ビジネス", "ROI", "効果"]
-        }
+        manuscript = self.render_front_matter(outline)
         
-        keywords = theme_keywords.get(theme, [])
+        # 各章の詳細
+        for chapter in outline['chapters']:
+            manuscript += self.render_chapter(chapter)
         
-        for report in reports:
-            if 'sections' in report:
-                for section_name, section_content in report['sections'].items():
-                    if any(keyword in section_content for keyword in keywords):
-                        # キーワードに関連する重要な洞察を抽出
-                        lines = section_content.split('\n')
-                        for line in lines:
-                            if ('###' in line or '**' in line) and any(keyword in line for keyword in keywords):
-                                insights.append(line.strip())
-        
-        return insights[:5]  # 上位5つの洞察
+        # 付録
+        manuscript += self.render_appendix(outline)
+        
+        return manuscript
     
-    def generate_manuscript_draft(self, outline: Dict) -> str:
-        """章立てから原稿ドラフト生成"""
+    def render_front_matter(self, outline: Dict) -> str:
+        """タイトル・目次部分のMarkdown"""
         
-        manuscript = f"""# {outline['title']}
+        front_matter = f"""# {outline['title']}
 
 ## {outline['subtitle']}
 
@@ -212,45 +405,188 @@ class BookPublishingSystem:
         
         # 目次生成
         for chapter in outline['chapters']:
-            manuscript += f"{chapter['number']}. **{chapter['title']}**\n"
+            front_matter += f"{chapter['number']}. **{chapter['title']}**\n"
             for section in chapter['sections']:
-                manuscript += f"   - {section}\n"
-            manuscript += "\n"
+                front_matter += f"   - {section}\n"
+            front_matter += "\n"
         
-        manuscript += "\n---\n\n"
+        front_matter += "\n---\n\n"
         
-        # 各章の詳細
-        for chapter in outline['chapters']:
-            manuscript += f"""## 第{chapter['number']}章: {chapter['title']}
+        return front_matter
+    
+    def render_chapter(self, chapter: Dict) -> str:
+        """1章分のMarkdown"""
+        return "".join(self.iter_chapter_parts(chapter))
+    
+    def iter_chapter_parts(self, chapter: Dict):
+        """1章分のMarkdownを 章見出し → 節 → 洞察 の順に逐次生成"""
+        
+        yield f"""## 第{chapter['number']}章: {chapter['title']}
 
 ### 概要
 この章では、{chapter['sections'][0]}について詳しく解説します。
 
 """
-            
-            # セクション詳細
-            for i, section in enumerate(chapter['sections'], 1):
-                manuscript += f"""### {chapter['number']}.{i} {section}
+        
+        # セクション詳細
+        for i, section in enumerate(chapter['sections'], 1):
+            yield f"""### {chapter['number']}.{i} {section}
 
 （この部分は日報からの具体的な体験・技術的詳細で充実させる）
 
 """
+        
+        # 重要な洞察
+        if chapter['key_insights']:
+            insights = "### 💡 重要な洞察\n\n"
+            for insight in chapter['key_insights']:
+                insights += f"- {insight}\n"
+            yield insights + "\n"
+        
+        yield "---\n\n"
+    
+    def render_appendix(self, outline: Dict) -> str:
+        """付録部分のMarkdown"""
+        
+        appendix = "## 📚 付録\n\n"
+        for item in outline['appendix']:
+            appendix += f"### {item}\n（詳細内容を記載）\n\n"
+        
+        return appendix
+    
+    def build_chapter_html(self, outline: Dict, max_workers: Optional[int] = None) -> List[str]:
+        """章ごとのHTMLを差分ビルドしてリストで返す"""
+        return [html for _, html in self.iter_chapter_html(outline, max_workers)]
+    
+    def iter_chapter_html(self, outline: Dict, max_workers: Optional[int] = None):
+        """章ごとのHTMLを差分ビルドし、章の順に (章, HTML) を逐次返す
+        
+        章の内容（タイトル・節・洞察）のハッシュが前回と同じ章はキャッシュを再利用し、
+        変化した章だけをプロセスプールで並列にHTML変換する。
+        """
+        os.makedirs(self.chapter_cache_path, exist_ok=True)
+        manifest_path = os.path.join(self.chapter_cache_path, "manifest.json")
+        try:
+            with open(manifest_path, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            manifest = {}
+        
+        plan = []
+        stale_markdown = {}
+        for chapter in outline['chapters']:
+            chapter_markdown = self.render_chapter(chapter)
+            id_prefix = self.chapter_id_prefix(chapter)
+            fingerprint = hashlib.sha1((id_prefix + "\n" + chapter_markdown).encode('utf-8')).hexdigest()
+            cache_file = os.path.join(self.chapter_cache_path, f"chapter_{chapter['number']:02d}.html")
+            key = str(chapter['number'])
             
-            # 重要な洞察
-            if chapter['key_insights']:
-                manuscript += "### 💡 重要な洞察\n\n"
-                for insight in chapter['key_insights']:
-                    manuscript += f"- {insight}\n"
-                manuscript += "\n"
+            if not (manifest.get(key) == fingerprint and os.path.exists(cache_file)):
+                stale_markdown[key] = (chapter_markdown, id_prefix)
+            plan.append((chapter, key, fingerprint, cache_file))
+        
+        print(f"🔁 章HTMLビルド: 再生成 {len(stale_markdown)}章 / 再利用 {len(plan) - len(stale_markdown)}章")
+        
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                key: executor.submit(render_markdown_html, chapter_markdown, id_prefix)
+                for key, (chapter_markdown, id_prefix) in stale_markdown.items()
+            }
             
-            manuscript += "---\n\n"
+            for chapter, key, fingerprint, cache_file in plan:
+                if key in futures:
+                    html = futures.pop(key).result()
+                    with open(cache_file, 'w', encoding='utf-8') as f:
+                        f.write(html)
+                    manifest[key] = fingerprint
+                    with open(manifest_path, 'w', encoding='utf-8') as f:
+                        json.dump(manifest, f, ensure_ascii=False, indent=2)
+                else:
+                    with open(cache_file, 'r', encoding='utf-8') as f:
+                        html = f.read()
+                yield chapter, html
+    
+    def write_manuscript_stream(self, outline: Dict, manuscript_path: str, html_path: str, chapters_dir: str) -> int:
+        """原稿を 目次 → 章 → 節 の順にファイルへ直接書き出し、単語数を返す
         
-        # 付録
-        manuscript += "## 📚 付録\n\n"
-        for item in outline['appendix']:
-            manuscript += f"### {item}\n（詳細内容を記載）\n\n"
+        原稿全体を文字列として保持せず、Markdown・統合HTML・章別HTML（EPUB形式の分割）を
+        章ごとに書き出してフラッシュするため、ビルド途中でも完成済みの章を参照できる。
+        """
+        os.makedirs(chapters_dir, exist_ok=True)
+        chapters = outline['chapters']
+        word_count = 0
         
-        return manuscript
+        with open(manuscript_path, 'w', encoding='utf-8') as md_file, \
+             open(html_path, 'w', encoding='utf-8') as html_file:
+            
+            # 目次
+            front_matter = self.render_front_matter(outline)
+            md_file.write(front_matter)
+            word_count += len(front_matter.split())
+            html_file.write(html_document_open(outline['title']))
+            html_file.write(render_markdown_html(front_matter, "front"))
+            self.write_chapter_index(outline, chapters_dir)
+            
+            # 各章（Markdownは節単位、HTMLは章単位で書き出し）
+            html_iterator = self.iter_chapter_html(outline)
+            for index, chapter in enumerate(chapters):
+                for part in self.iter_chapter_parts(chapter):
+                    md_file.write(part)
+                    word_count += len(part.split())
+                
+                _, chapter_html = next(html_iterator)
+                html_file.write("\n" + chapter_html)
+                self.write_chapter_file(
+                    outline, chapter, chapter_html, chapters_dir,
+                    chapters[index - 1] if index > 0 else None,
+                    chapters[index + 1] if index + 1 < len(chapters) else None
+                )
+                
+                md_file.flush()
+                html_file.flush()
+            html_iterator.close()
+            
+            # 付録
+            appendix = self.render_appendix(outline)
+            md_file.write(appendix)
+            word_count += len(appendix.split())
+            html_file.write("\n" + render_markdown_html(appendix, "appendix"))
+            html_file.write(html_document_close())
+        
+        return word_count
+    
+    def chapter_id_prefix(self, chapter: Dict) -> str:
+        """章内の見出しidの名前空間"""
+        return f"ch{chapter['number']:02d}"
+    
+    def chapter_filename(self, chapter: Dict) -> str:
+        """章別HTMLのファイル名"""
+        return f"chapter_{chapter['number']:02d}.html"
+    
+    def write_chapter_index(self, outline: Dict, chapters_dir: str):
+        """章別HTMLの目次ページ（index.html）"""
+        with open(os.path.join(chapters_dir, "index.html"), 'w', encoding='utf-8') as f:
+            f.write(html_document_open(outline['title']))
+            f.write(f"<h1>{outline['title']}</h1>\n<h2>{outline['subtitle']}</h2>\n<ol>\n")
+            for chapter in outline['chapters']:
+                f.write(f'<li><a href="{self.chapter_filename(chapter)}">{chapter["title"]}</a></li>\n')
+            f.write("</ol>\n")
+            f.write(html_document_close())
+    
+    def write_chapter_file(self, outline: Dict, chapter: Dict, chapter_html: str, chapters_dir: str,
+                           previous_chapter: Optional[Dict], next_chapter: Optional[Dict]):
+        """1章分の独立HTML（前後の章・目次へのナビゲーション付き）"""
+        links = ['<a href="index.html">目次</a>']
+        if previous_chapter:
+            links.insert(0, f'<a href="{self.chapter_filename(previous_chapter)}">← 第{previous_chapter["number"]}章</a>')
+        if next_chapter:
+            links.append(f'<a href="{self.chapter_filename(next_chapter)}">第{next_chapter["number"]}章 →</a>')
+        nav = f"<nav>{' | '.join(links)}</nav>\n"
+        
+        with open(os.path.join(chapters_dir, self.chapter_filename(chapter)), 'w', encoding='utf-8') as f:
+            f.write(html_document_open(f"第{chapter['number']}章: {chapter['title']} - {outline['title']}"))
+            f.write(nav + chapter_html + "\n" + nav)
+            f.write(html_document_close())
     
     def create_publishing_package(self) -> Dict:
         """出版パッケージ作成"""
@@ -265,11 +601,7 @@ class BookPublishingSystem:
         outline = self.generate_chapter_outline(reports)
         print("📝 章立て生成完了")
         
-        # 3. 原稿ドラフト生成
-        manuscript = self.generate_manuscript_draft(outline)
-        print("✍️ 原稿ドラフト生成完了")
-        
-        # 4. ファイル保存
+        # 3. ファイル保存
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         
         # 章立てJSON保存
@@ -277,39 +609,18 @@ class BookPublishingSystem:
         with open(outline_path, 'w', encoding='utf-8') as f:
             json.dump(outline, f, ensure_ascii=False, indent=2)
         
-        # 原稿Markdown保存
+        # 4. 原稿ドラフト（Markdown・HTML・章別HTML）を章ごとに逐次書き出し
         manuscript_path = os.path.join(self.manuscript_path, f"manuscript_draft_{timestamp}.md")
-        with open(manuscript_path, 'w', encoding='utf-8') as f:
-            f.write(manuscript)
-        
-        # HTMLバージョン生成
-        html_content = markdown.markdown(manuscript, extensions=['toc', 'tables', 'fenced_code'])
         html_path = os.path.join(self.manuscript_path, f"manuscript_draft_{timestamp}.html")
-        with open(html_path, 'w', encoding='utf-8') as f:
-            f.write(f"""
-<!DOCTYPE html>
-<html lang="ja">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>{outline['title']}</title>
-    <style>
-        body {{ font-family: 'Hiragino Kaku Gothic Pro', sans-serif; line-height: 1.6; margin: 40px; }}
-        h1, h2, h3 {{ color: #333; }}
-        code {{ background: #f4f4f4; padding: 2px 4px; }}
-        pre {{ background: #f4f4f4; padding: 15px; overflow-x: auto; }}
-    </style>
-</head>
-<body>
-{html_content}
-</body>
-</html>
-            """)
+        chapters_dir = os.path.join(self.manuscript_path, f"manuscript_chapters_{timestamp}")
+        word_count = self.write_manuscript_stream(outline, manuscript_path, html_path, chapters_dir)
+        print("✍️ 原稿ドラフト生成完了")
         
         print(f"💾 ファイル保存完了:")
         print(f"   章立て: {outline_path}")
         print(f"   原稿: {manuscript_path}")
         print(f"   HTML: {html_path}")
+        print(f"   章別HTML: {chapters_dir}")
         
         return {
             "success": True,
@@ -317,7 +628,8 @@ class BookPublishingSystem:
             "outline_path": outline_path,
             "manuscript_path": manuscript_path,
             "html_path": html_path,
-            "word_count": len(manuscript.split()),
+            "chapters_dir": chapters_dir,
+            "word_count": word_count,
             "chapter_count": len(outline['chapters'])
         }
 
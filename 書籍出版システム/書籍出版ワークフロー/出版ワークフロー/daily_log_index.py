@@ -0,0 +1,285 @@
+"""
+日報・ログ横断インデックス
+統合管理システム/日報・ログ、CLAUDE_WORKSPACE/LOGS、書籍化用daily_reportsの
+重複する日報を内容ハッシュで一本化し、日付範囲・全文検索できるSQLiteストアに格納する
+"""
+
+import os
+import re
+import json
+import hashlib
+import sqlite3
+from typing import Dict, List, Optional
+
+DEFAULT_LOG_DIRS = [
+    "/Users/satoumasamitsu/Desktop/osigoto/統合管理システム/日報・ログ",
+    "/Users/satoumasamitsu/Desktop/osigoto/CLAUDE_WORKSPACE/LOGS",
+    "/Users/satoumasamitsu/osigoto/ブログ自動化/book_publication/knowledge_base/daily_reports"
+]
+
+class DailyLogIndex:
+    """日報・ログの統合インデックス（内容ハッシュで重複排除・FTS5全文検索）"""
+
+    def __init__(self, db_path: str, source_dirs: Optional[List[str]] = None):
+        self.db_path = db_path
+        self.source_dirs = source_dirs or DEFAULT_LOG_DIRS
+
+        os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        self.conn = sqlite3.connect(db_path)
+        self.conn.row_factory = sqlite3.Row
+        self.fts_enabled = self._create_schema()
+
+    def _create_schema(self) -> bool:
+        """テーブル作成（FTS5 trigramが使えない環境ではLIKE検索にフォールバック）"""
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS sources (
+                path TEXT PRIMARY KEY,
+                content_hash TEXT NOT NULL,
+                mtime REAL NOT NULL,
+                size INTEGER NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS documents (
+                content_hash TEXT PRIMARY KEY,
+                date TEXT NOT NULL,
+                title TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS sections (
+                id INTEGER PRIMARY KEY,
+                content_hash TEXT NOT NULL,
+                date TEXT NOT NULL,
+                position INTEGER NOT NULL,
+                section TEXT NOT NULL,
+                text TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS insights (
+                content_hash TEXT PRIMARY KEY,
+                version TEXT NOT NULL,
+                candidates TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_sections_date ON sections(date);
+            CREATE INDEX IF NOT EXISTS idx_sections_hash ON sections(content_hash);
+            CREATE INDEX IF NOT EXISTS idx_sources_hash ON sources(content_hash);
+        """)
+        try:
+            self.conn.execute("""
+                CREATE VIRTUAL TABLE IF NOT EXISTS sections_fts USING fts5(
+                    section, text, content='sections', content_rowid='id', tokenize='trigram'
+                )
+            """)
+            return True
+        except sqlite3.OperationalError:
+            return False
+
+    @staticmethod
+    def extract_date(filename: str) -> str:
+        """ファイル名から日付（YYYY-MM-DD）を抽出"""
+        match = re.match(r'(\d{4}-\d{2}-\d{2})', filename)
+        return match.group(1) if match else ""
+
+    @staticmethod
+    def parse_sections(content: str) -> List[tuple]:
+        """## 見出し単位で (見出し, 本文) に分割"""
+        sections = []
+        current_section = None
+        current_content = []
+
+        for line in content.split('\n'):
+            if line.startswith('## '):
+                if current_section:
+                    sections.append((current_section, '\n'.join(current_content)))
+                current_section = line[3:].strip()
+                current_content = []
+            else:
+                current_content.append(line)
+
+        if current_section:
+            sections.append((current_section, '\n'.join(current_content)))
+
+        return sections
+
+    def refresh(self) -> Dict[str, int]:
+        """全ソースディレクトリを走査し、新規・変更・削除されたファイルのみ反映"""
+        stats = {"scanned": 0, "updated": 0, "new_documents": 0, "removed": 0}
+        known = {
+            row["path"]: row for row in self.conn.execute("SELECT path, mtime, size FROM sources")
+        }
+        seen = set()
+
+        with self.conn:
+            for directory in self.source_dirs:
+                if not os.path.isdir(directory):
+                    continue
+                for filename in os.listdir(directory):
+                    if not filename.endswith('.md'):
+                        continue
+                    path = os.path.join(directory, filename)
+                    seen.add(path)
+                    stats["scanned"] += 1
+
+                    stat = os.stat(path)
+                    row = known.get(path)
+                    if row and row["mtime"] == stat.st_mtime and row["size"] == stat.st_size:
+                        continue
+
+                    with open(path, 'r', encoding='utf-8') as f:
+                        content = f.read()
+                    content_hash = hashlib.sha1(content.encode('utf-8')).hexdigest()
+
+                    self.conn.execute(
+                        "INSERT OR REPLACE INTO sources (path, content_hash, mtime, size) VALUES (?, ?, ?, ?)",
+                        (path, content_hash, stat.st_mtime, stat.st_size)
+                    )
+                    stats["updated"] += 1
+
+                    # 同一内容の日報は1回だけ解析・格納
+                    exists = self.conn.execute(
+                        "SELECT 1 FROM documents WHERE content_hash = ?", (content_hash,)
+                    ).fetchone()
+                    if not exists:
+                        self._insert_document(content_hash, filename, content)
+                        stats["new_documents"] += 1
+
+            for path in set(known) - seen:
+                self.conn.execute("DELETE FROM sources WHERE path = ?", (path,))
+                stats["removed"] += 1
+
+            # どのファイルからも参照されなくなった文書を削除
+            orphans = [
+                row["content_hash"] for row in self.conn.execute(
+                    "SELECT content_hash FROM documents WHERE content_hash NOT IN (SELECT content_hash FROM sources)"
+                )
+            ]
+            for content_hash in orphans:
+                self._delete_document(content_hash)
+
+        return stats
+
+    def _insert_document(self, content_hash: str, filename: str, content: str):
+        date = self.extract_date(filename)
+        title_match = re.search(r'^# (.+)$', content, re.MULTILINE)
+        title = title_match.group(1).strip() if title_match else os.path.splitext(filename)[0]
+
+        self.conn.execute(
+            "INSERT INTO documents (content_hash, date, title) VALUES (?, ?, ?)",
+            (content_hash, date, title)
+        )
+        for position, (section, text) in enumerate(self.parse_sections(content)):
+            cursor = self.conn.execute(
+                "INSERT INTO sections (content_hash, date, position, section, text) VALUES (?, ?, ?, ?, ?)",
+                (content_hash, date, position, section, text)
+            )
+            if self.fts_enabled:
+                self.conn.execute(
+                    "INSERT INTO sections_fts (rowid, section, text) VALUES (?, ?, ?)",
+                    (cursor.lastrowid, section, text)
+                )
+
+    def _delete_document(self, content_hash: str):
+        if self.fts_enabled:
+            for row in self.conn.execute(
+                "SELECT id, section, text FROM sections WHERE content_hash = ?", (content_hash,)
+            ).fetchall():
+                self.conn.execute(
+                    "INSERT INTO sections_fts (sections_fts, rowid, section, text) VALUES ('delete', ?, ?, ?)",
+                    (row["id"], row["section"], row["text"])
+                )
+        self.conn.execute("DELETE FROM sections WHERE content_hash = ?", (content_hash,))
+        self.conn.execute("DELETE FROM insights WHERE content_hash = ?", (content_hash,))
+        self.conn.execute("DELETE FROM documents WHERE content_hash = ?", (content_hash,))
+
+    def search(self, query: str, date_from: Optional[str] = None, date_to: Optional[str] = None,
+               limit: int = 50) -> List[Dict]:
+        """全文検索（日付範囲指定可）。結果は日付の新しい順"""
+        conditions = []
+        params = []
+
+        # trigramは3文字以上のみ索引を使用できるため、短い語はLIKEで検索
+        if self.fts_enabled and len(query) >= 3:
+            sql = ("SELECT s.date, s.section, s.text, d.title, s.content_hash FROM sections_fts "
+                   "JOIN sections s ON s.id = sections_fts.rowid JOIN documents d USING (content_hash) "
+                   "WHERE sections_fts MATCH ?")
+            params.append('"' + query.replace('"', '""') + '"')
+        else:
+            sql = ("SELECT s.date, s.section, s.text, d.title, s.content_hash FROM sections s "
+                   "JOIN documents d USING (content_hash) WHERE (s.text LIKE ? OR s.section LIKE ?)")
+            params.extend([f"%{query}%", f"%{query}%"])
+
+        if date_from:
+            conditions.append("s.date >= ?")
+            params.append(date_from)
+        if date_to:
+            conditions.append("s.date <= ?")
+            params.append(date_to)
+        for condition in conditions:
+            sql += f" AND {condition}"
+        sql += " ORDER BY s.date DESC, s.position LIMIT ?"
+        params.append(limit)
+
+        return [dict(row) for row in self.conn.execute(sql, params)]
+
+    def reports_between(self, date_from: Optional[str] = None, date_to: Optional[str] = None,
+                        insight_version: Optional[str] = None) -> List[Dict]:
+        """日付範囲の日報を重複排除済みで返す（BookPublishingSystemの日報形式）
+
+        insight_version を指定すると、そのバージョンで保存済みの洞察候補を 'insight_candidates' に含める
+        """
+        conditions = ""
+        params = []
+        if date_from:
+            conditions += " AND d.date >= ?"
+            params.append(date_from)
+        if date_to:
+            conditions += " AND d.date <= ?"
+            params.append(date_to)
+
+        # 文書・セクション・参照元パス・洞察候補をそれぞれ1クエリで取得（文書ごとの追加クエリなし）
+        reports: Dict[str, Dict] = {}
+        for row in self.conn.execute(
+            "SELECT d.content_hash, d.date, d.title, s.section, s.text FROM documents d "
+            "LEFT JOIN sections s ON s.content_hash = d.content_hash "
+            f"WHERE 1 = 1{conditions} ORDER BY d.date, d.title, d.content_hash, s.position", params
+        ):
+            report = reports.get(row["content_hash"])
+            if report is None:
+                report = reports[row["content_hash"]] = {
+                    'date': row["date"],
+                    'filename': row["title"],
+                    'title': row["title"],
+                    'content_hash': row["content_hash"],
+                    'source_paths': [],
+                    'sections': {}
+                }
+            if row["section"] is not None:
+                report['sections'][row["section"]] = row["text"]
+
+        for row in self.conn.execute(
+            "SELECT src.content_hash, src.path FROM sources src "
+            "JOIN documents d ON d.content_hash = src.content_hash "
+            f"WHERE 1 = 1{conditions} ORDER BY src.path", params
+        ):
+            report = reports[row["content_hash"]]
+            if not report['source_paths']:
+                report['filename'] = os.path.basename(row["path"])
+            report['source_paths'].append(row["path"])
+
+        if insight_version is not None:
+            for row in self.conn.execute(
+                "SELECT i.content_hash, i.candidates FROM insights i "
+                "JOIN documents d ON d.content_hash = i.content_hash "
+                f"WHERE i.version = ?{conditions}", [insight_version] + params
+            ):
+                reports[row["content_hash"]]['insight_candidates'] = json.loads(row["candidates"])
+
+        return list(reports.values())
+
+    def store_insights(self, version: str, candidates_by_hash: Dict[str, List[Dict]]):
+        """文書ごとの洞察候補を保存（次回以降は同じバージョンなら再抽出不要）"""
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO insights (content_hash, version, candidates) VALUES (?, ?, ?)",
+                [(content_hash, version, json.dumps(candidates, ensure_ascii=False))
+                 for content_hash, candidates in candidates_by_hash.items()]
+            )
+
+    def close(self):
+        self.conn.close()
@@ -5,24 +5,140 @@
 
 import os
 import json
+import fcntl
+import atexit
+import threading
 from datetime import datetime
 from typing import Dict, List, Optional
+from daily_log_index import DailyLogIndex, DEFAULT_LOG_DIRS
+
+class SessionJournal:
+    """追記専用のセッションイベントジャーナル（JSONL・fsyncはまとめて実行）
+
+    開いている間はファイルに排他ロックを保持し、実行中のセッションが復元対象にならないようにする
+    """
+    
+    def __init__(self, path: str, fsync_every: int = 20, fsync_interval: float = 1.0):
+        self.path = path
+        self.fsync_every = fsync_every
+        self.fsync_interval = fsync_interval
+        self.pending = 0
+        self.lock = threading.Lock()
+        self.timer = None
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.file = open(path, 'a', encoding='utf-8')
+        fcntl.flock(self.file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        atexit.register(self.close)
+    
+    def append(self, event_type: str, data) -> None:
+        """イベントを1行追記（OSへは毎回フラッシュ、ディスク同期は件数・時間でまとめる）"""
+        record = {"type": event_type, "time": datetime.now().isoformat(), "data": data}
+        with self.lock:
+            self.file.write(json.dumps(record, ensure_ascii=False) + "\n")
+            self.file.flush()
+            self.pending += 1
+            if self.pending >= self.fsync_every:
+                self._sync_locked()
+            elif self.timer is None:
+                # 追記が途切れてもfsync_interval以内にディスクへ確定
+                self.timer = threading.Timer(self.fsync_interval, self.sync)
+                self.timer.daemon = True
+                self.timer.start()
+    
+    def sync(self) -> None:
+        """未同期のイベントをディスクへ確定"""
+        with self.lock:
+            self._sync_locked()
+    
+    def _sync_locked(self) -> None:
+        if self.timer is not None:
+            self.timer.cancel()
+            self.timer = None
+        if self.file.closed or not self.pending:
+            return
+        os.fsync(self.file.fileno())
+        self.pending = 0
+    
+    def close(self) -> None:
+        with self.lock:
+            if not self.file.closed:
+                self._sync_locked()
+                self.file.close()
+        atexit.unregister(self.close)
+    
+    @staticmethod
+    def is_active(path: str) -> bool:
+        """他のプロセスが書き込み中のジャーナルか（ロックを取得できなければ使用中）"""
+        with open(path, 'a', encoding='utf-8') as f:
+            try:
+                fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                return True
+            fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+        return False
+    
+    @staticmethod
+    def replay(path: str) -> List[Dict]:
+        """ジャーナルのイベントを順に読み込み（書き込み途中の最終行は無視）"""
+        events = []
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    events.append(json.loads(line))
+                except ValueError:
+                    break
+        return events
 
 class DailyReportAutomation:
     """日報自動生成・管理システム"""
     
+    # ジャーナルのイベント種別 → session_data のリスト項目
+    LIST_EVENTS = {
+        "implementation": "implementations",
+        "technical_discovery": "technical_discoveries",
+        "challenge_solved": "challenges_solved",
+        "workflow_improvement": "workflow_improvements",
+        "book_insight": "insights",
+        "next_plan": "next_plans"
+    }
+    
     def __init__(self, base_path: str = None):
         self.base_path = base_path or "/Users/satoumasamitsu/osigoto/ブログ自動化/book_publication"
         self.reports_path = os.path.join(self.base_path, "knowledge_base", "daily_reports")
+        self.journal_path = os.path.join(self.base_path, "knowledge_base", "session_journal")
         self.session_data = {}
+        self.journal = None
+        self._log_index = None
         
         # ディレクトリ作成
         os.makedirs(self.reports_path, exist_ok=True)
     
-    def start_session_tracking(self, theme: str = ""):
-        """セッション追跡開始"""
-        self.session_data = {
-            "start_time": datetime.now(),
+    @property
+    def log_index(self) -> DailyLogIndex:
+        """日報・ログ横断インデックス（初回アクセス時に接続）"""
+        if self._log_index is None:
+            self._log_index = DailyLogIndex(
+                os.path.join(self.base_path, "knowledge_base", "daily_log_index.sqlite3"),
+                DEFAULT_LOG_DIRS[:2] + [self.reports_path]
+            )
+        return self._log_index
+    
+    def search_past_reports(self, query: str, date_from: Optional[str] = None,
+                            date_to: Optional[str] = None, limit: int = 20) -> List[Dict]:
+        """過去の日報・ログを全文検索（重複排除済み・新しい順）"""
+        self.log_index.refresh()
+        return self.log_index.search(query, date_from, date_to, limit)
+    
+    def get_past_reports(self, date_from: Optional[str] = None, date_to: Optional[str] = None) -> List[Dict]:
+        """日付範囲の過去日報を取得（重複排除済み）"""
+        self.log_index.refresh()
+        return self.log_index.reports_between(date_from, date_to)
+    
+    @staticmethod
+    def empty_session(theme: str = "", start_time: datetime = None) -> Dict:
+        """空のセッションデータ"""
+        return {
+            "start_time": start_time or datetime.now(),
             "theme": theme,
             "implementations": [],
             "technical_discoveries": [],
@@ -32,8 +148,89 @@ class DailyReportAutomation:
             "insights": [],
             "next_plans": []
         }
+    
+    def start_session_tracking(self, theme: str = ""):
+        """セッション追跡開始"""
+        self.session_data = self.empty_session(theme)
+        
+        # セッションごとのジャーナルを開始（クラッシュ時はここから復元）
+        if self.journal:
+            self.journal.close()
+        started = self.session_data["start_time"]
+        self.journal = SessionJournal(
+            os.path.join(self.journal_path, f"session_{started.strftime('%Y%m%d_%H%M%S_%f')}.jsonl")
+        )
+        self.journal.append("start", {"theme": theme, "start_time": started.isoformat()})
         print(f"📝 セッション追跡開始: {theme}")
     
+    def _record(self, event_type: str, record: Dict):
+        """イベントをセッションデータに反映し、ジャーナルへ追記"""
+        if not self.session_data:
+            self.session_data = self.empty_session()
+        self.apply_event(self.session_data, event_type, record)
+        if self.journal:
+            self.journal.append(event_type, record)
+    
+    @classmethod
+    def apply_event(cls, session_data: Dict, event_type: str, record: Dict):
+        """1イベントをセッションデータに適用"""
+        if event_type in cls.LIST_EVENTS:
+            session_data[cls.LIST_EVENTS[event_type]].append(record)
+        elif event_type == "achievement":
+            session_data["achievements"][record["metric_name"]] = {
+                key: value for key, value in record.items() if key != "metric_name"
+            }
+    
+    @classmethod
+    def replay_session(cls, journal_file: str) -> Dict:
+        """ジャーナルからセッションデータを再構築（終了時刻は最後に記録されたイベントの時刻）"""
+        session_data = {}
+        for event in SessionJournal.replay(journal_file):
+            if event["type"] == "start":
+                session_data = cls.empty_session(
+                    event["data"]["theme"], datetime.fromisoformat(event["data"]["start_time"])
+                )
+                session_data["end_time"] = session_data["start_time"]
+            elif session_data:
+                cls.apply_event(session_data, event["type"], event["data"])
+                event_time = event.get("time") or event["data"].get("timestamp")
+                if event_time:
+                    session_data["end_time"] = max(session_data["end_time"], datetime.fromisoformat(event_time))
+        return session_data
+    
+    @classmethod
+    def has_records(cls, session_data: Dict) -> bool:
+        """開始イベント以外の記録があるか"""
+        return any(session_data.get(key) for key in cls.LIST_EVENTS.values()) or bool(session_data.get("achievements"))
+    
+    def recover_sessions(self) -> List[str]:
+        """日報未保存のまま終了したセッションをジャーナルから復元して日報を保存"""
+        recovered = []
+        if not os.path.isdir(self.journal_path):
+            return recovered
+        
+        for filename in sorted(os.listdir(self.journal_path)):
+            if not filename.endswith('.jsonl'):
+                continue
+            journal_file = os.path.join(self.journal_path, filename)
+            if self.journal and self.journal.path == journal_file:
+                continue
+            # 実行中の別セッションのジャーナルには触れない
+            if SessionJournal.is_active(journal_file):
+                continue
+            
+            session_data = self.replay_session(journal_file)
+            if session_data and self.has_records(session_data):
+                recovery = DailyReportAutomation(self.base_path)
+                recovery.session_data = session_data
+                recovered.append(recovery.save_daily_report())
+                print(f"♻️ セッション復元: {filename}")
+            else:
+                print(f"⏭️  記録のないセッションのため日報は作成しません: {filename}")
+            os.replace(journal_file, journal_file + ".done")
+        
+        return recovered
+    
     def log_implementation(self, feature_name: str, file_path: str, description: str, characteristics: List[str] = None):
         """実装機能の記録"""
         implementation = {
@@ -43,7 +240,7 @@ class DailyReportAutomation:
             "characteristics": characteristics or [],
             "timestamp": datetime.now().isoformat()
         }
-        self.session_data["implementations"].append(implementation)
+        self._record("implementation", implementation)
         print(f"🛠 実装記録: {feature_name}")
     
     def log_technical_discovery(self, category: str, discovery: str, details: str):
@@ -54,7 +251,7 @@ class DailyReportAutomation:
             "details": details,
             "timestamp": datetime.now().isoformat()
         }
-        self.session_data["technical_discoveries"].append(discovery_record)
+        self._record("technical_discovery", discovery_record)
         print(f"💡 技術発見記録: {discovery}")
     
     def log_challenge_solved(self, challenge: str, problem: str, solution: str, learning: str):
@@ -66,7 +263,7 @@ class DailyReportAutomation:
             "learning": learning,
             "timestamp": datetime.now().isoformat()
         }
-        self.session_data["challenges_solved"].append(challenge_record)
+        self._record("challenge_solved", challenge_record)
         print(f"🐛 課題解決記録: {challenge}")
     
     def log_workflow_improvement(self, improvement: str, before: str, after: str, effect: str):
@@ -78,16 +275,17 @@ class DailyReportAutomation:
             "effect": effect,
             "timestamp": datetime.now().isoformat()
         }
-        self.session_data["workflow_improvements"].append(improvement_record)
+        self._record("workflow_improvement", improvement_record)
         print(f"🔄 ワークフロー改善記録: {improvement}")
     
     def log_achievement(self, metric_name: str, value: str, description: str = ""):
         """成果の記録"""
-        self.session_data["achievements"][metric_name] = {
+        self._record("achievement", {
+            "metric_name": metric_name,
             "value": value,
             "description": description,
             "timestamp": datetime.now().isoformat()
-        }
+        })
         print(f"📈 成果記録: {metric_name} = {value}")
     
     def log_book_insight(self, insight_type: str, content: str):
@@ -97,7 +295,7 @@ class DailyReportAutomation:
             "content": content,
             "timestamp": datetime.now().isoformat()
         }
-        self.session_data["insights"].append(insight_record)
+        self._record("book_insight", insight_record)
         print(f"📚 書籍化洞察記録: {insight_type}")
     
     def log_next_plan(self, plan: str, priority: str = "medium"):
@@ -107,7 +305,7 @@ class DailyReportAutomation:
             "priority": priority,
             "timestamp": datetime.now().isoformat()
         }
-        self.session_data["next_plans"].append(plan_record)
+        self._record("next_plan", plan_record)
         print(f"🎯 次回計画記録: {plan}")
     
     def generate_daily_report(self) -> str:
@@ -116,7 +314,7 @@ class DailyReportAutomation:
         if not self.session_data:
             return self.generate_template_report()
         
-        today = datetime.now().strftime("%Y-%m-%d")
+        today = self.session_data.get('start_time', datetime.now()).strftime("%Y-%m-%d")
         session_time = self.calculate_session_duration()
         
         report = f"""# 📅 日報 - {today}
@@ -247,7 +445,9 @@ class DailyReportAutomation:
         if 'start_time' not in self.session_data:
             return "未記録"
         
-        duration = datetime.now() - self.session_data['start_time']
+        # 復元したセッションは最後のイベント時刻を終了時刻とする
+        end_time = self.session_data.get('end_time') or datetime.now()
+        duration = end_time - self.session_data['start_time']
         hours = int(duration.total_seconds() // 3600)
         minutes = int((duration.total_seconds() % 3600) // 60)
         
@@ -353,8 +553,9 @@ class DailyReportAutomation:
         """日報保存"""
         report_content = self.generate_daily_report()
         
-        today = datetime.now().strftime("%Y-%m-%d")
-        timestamp = datetime.now().strftime("%H%M%S")
+        # 日付はセッション開始日、時刻は終了時刻（復元時は最後のイベント時刻）
+        today = self.session_data.get('start_time', datetime.now()).strftime("%Y-%m-%d")
+        timestamp = (self.session_data.get('end_time') or datetime.now()).strftime("%H%M%S")
         
         # ファイル名生成
         if self.session_data.get('theme'):
@@ -369,6 +570,12 @@ class DailyReportAutomation:
         with open(file_path, 'w', encoding='utf-8') as f:
             f.write(report_content)
         
+        # 日報保存後はジャーナルを完了扱いにする（復元対象から外す）
+        if self.journal:
+            self.journal.close()
+            os.replace(self.journal.path, self.journal.path + ".done")
+            self.journal = None
+        
         print(f"💾 日報保存完了: {filename}")
         return file_path
     
@@ -421,6 +628,9 @@ if __name__ == "__main__":
     # 日報システムテスト
     report_system = DailyReportAutomation()
     
+    # 前回クラッシュしたセッションがあれば日報として復元
+    report_system.recover_sessions()
+    
     # サンプルセッション
     report_system.start_session_tracking("書籍化システム構築")
     
@@ -0,0 +1,55 @@
+"""書籍出版システムの章別HTMLビルドテスト"""
+
+import os
+import re
+import sys
+from collections import Counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from book_creation_system import BookPublishingSystem, render_markdown_html
+from daily_log_index import DailyLogIndex
+
+def test_chapter_heading_ids_are_unique_in_combined_html(tmp_path):
+    system = BookPublishingSystem(str(tmp_path))
+    outline = system.generate_chapter_outline([])
+    html_path = str(tmp_path / "manuscript.html")
+
+    system.write_manuscript_stream(outline, str(tmp_path / "manuscript.md"), html_path, str(tmp_path / "chapters"))
+
+    with open(html_path, encoding='utf-8') as f:
+        ids = re.findall(r'id="([^"]+)"', f.read())
+    duplicates = [heading_id for heading_id, count in Counter(ids).items() if count > 1]
+    assert ids
+    assert duplicates == []
+
+def test_id_prefix_namespaces_japanese_headings():
+    html = render_markdown_html("## 概要\n\n## 概要\n", "ch03")
+    assert re.findall(r'id="([^"]+)"', html) == ["ch03", "ch03_1"]
+
+def test_index_reuses_stored_insight_candidates(tmp_path):
+    reports_path = tmp_path / "knowledge_base" / "daily_reports"
+    reports_path.mkdir(parents=True)
+    report = "# 日報\n\n## 作業内容\n\n### Claude Codeで自動化\n**SEOタイトル改善**\n"
+    (reports_path / "2025-08-01_session.md").write_text(report, encoding='utf-8')
+    (reports_path / "2025-08-01_copy.md").write_text(report, encoding='utf-8')
+
+    system = BookPublishingSystem(str(tmp_path))
+    system._log_index = DailyLogIndex(
+        str(tmp_path / "knowledge_base" / "daily_log_index.sqlite3"), [str(reports_path)]
+    )
+    first = system.collect_daily_reports()
+    assert len(first) == 1
+    assert first[0]['source_paths'] == sorted(str(path) for path in reports_path.iterdir())
+    assert {theme for candidate in first[0]['insight_candidates'] for theme in candidate['themes']}
+
+    calls = []
+    system.extract_insight_candidates = lambda sections: calls.append(sections) or []
+    second = system.collect_daily_reports()
+    assert calls == []
+    assert second[0]['insight_candidates'] == first[0]['insight_candidates']
+
+    # テーマ定義が変われば再抽出する
+    system.THEME_KEYWORDS = dict(BookPublishingSystem.THEME_KEYWORDS, new_theme=["日報"])
+    system.collect_daily_reports()
+    assert len(calls) == 1
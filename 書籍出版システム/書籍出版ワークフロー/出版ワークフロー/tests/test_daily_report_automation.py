@@ -0,0 +1,88 @@
+"""日報自動生成システムのセッションジャーナル復元テスト"""
+
+import os
+import sys
+import json
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import daily_report_automation
+from daily_report_automation import DailyReportAutomation, SessionJournal
+
+def write_journal(path, events):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        for event in events:
+            f.write(json.dumps(event, ensure_ascii=False) + "\n")
+
+def test_recovered_session_uses_journal_dates(tmp_path):
+    system = DailyReportAutomation(str(tmp_path))
+    journal_file = os.path.join(system.journal_path, "session_20250801_100000_000000.jsonl")
+    write_journal(journal_file, [
+        {"type": "start", "data": {"theme": "復元テスト", "start_time": "2025-08-01T10:00:00"}},
+        {"type": "implementation", "time": "2025-08-01T11:30:00", "data": {
+            "feature_name": "機能A", "file_path": "a.py", "description": "説明", "characteristics": [],
+            "timestamp": "2025-08-01T11:30:00"}},
+    ])
+
+    recovered = system.recover_sessions()
+
+    assert len(recovered) == 1
+    filename = os.path.basename(recovered[0])
+    assert filename.startswith("2025-08-01_")
+    assert filename.endswith("_113000.md")
+    with open(recovered[0], encoding='utf-8') as f:
+        content = f.read()
+    assert "# 📅 日報 - 2025-08-01" in content
+    assert "**作業時間**: 1時間30分" in content
+    assert os.path.exists(journal_file + ".done")
+
+def test_end_time_falls_back_to_event_timestamp(tmp_path):
+    journal_file = str(tmp_path / "session.jsonl")
+    write_journal(journal_file, [
+        {"type": "start", "data": {"theme": "", "start_time": "2025-08-01T10:00:00"}},
+        {"type": "next_plan", "data": {"plan": "続き", "priority": "high", "timestamp": "2025-08-01T10:45:00"}},
+    ])
+
+    session_data = DailyReportAutomation.replay_session(journal_file)
+
+    assert session_data["end_time"].isoformat() == "2025-08-01T10:45:00"
+
+def test_start_only_journal_is_retired_without_report(tmp_path):
+    system = DailyReportAutomation(str(tmp_path))
+    journal_file = os.path.join(system.journal_path, "session_20250801_100000_000000.jsonl")
+    write_journal(journal_file, [
+        {"type": "start", "data": {"theme": "空", "start_time": "2025-08-01T10:00:00"}},
+    ])
+
+    assert system.recover_sessions() == []
+    assert os.listdir(system.reports_path) == []
+    assert os.path.exists(journal_file + ".done")
+
+def test_live_journal_is_not_recovered(tmp_path):
+    system = DailyReportAutomation(str(tmp_path))
+    live = DailyReportAutomation(str(tmp_path))
+    live.start_session_tracking("実行中")
+    live.log_next_plan("作業中")
+    try:
+        assert system.recover_sessions() == []
+        assert os.path.exists(live.journal.path)
+        assert not os.path.exists(live.journal.path + ".done")
+    finally:
+        live.journal.close()
+
+def test_interval_timer_fsyncs_without_further_appends(tmp_path, monkeypatch):
+    synced = []
+    real_fsync = os.fsync
+    monkeypatch.setattr(daily_report_automation.os, "fsync", lambda fd: (synced.append(fd), real_fsync(fd)))
+
+    journal = SessionJournal(str(tmp_path / "session.jsonl"), fsync_every=100, fsync_interval=0.05)
+    try:
+        journal.append("next_plan", {"plan": "a", "priority": "low"})
+        assert synced == []
+        time.sleep(0.3)
+        assert len(synced) == 1
+        assert journal.pending == 0
+    finally:
+        journal.close()
@@ -15,11 +15,432 @@
 import os
 import re
 import json
+import math
+import random
+import socket
+import socketserver
+import sys
+import threading
+import unicodedata
+import zlib
+from collections import Counter, deque
+from contextlib import redirect_stdout
 from datetime import datetime
 from typing import Dict, List, Optional, Tuple, Any
 from pathlib import Path
 import difflib
 
+def tokenize_ngrams(text: str, sizes: Tuple[int, ...] = (2, 3)) -> List[str]:
+    """外部トークナイザ不要の文字n-gram分割（日本語・英語共通）"""
+    normalized = unicodedata.normalize("NFKC", text).lower()
+    tokens = []
+    for run in re.findall(r'\w+', normalized):
+        if len(run) < min(sizes):
+            tokens.append(run)
+            continue
+        for n in sizes:
+            tokens.extend(run[i:i + n] for i in range(len(run) - n + 1))
+    return tokens
+
+
+class KeywordAutomaton:
+    """Aho–Corasick法による複数キーワード同時照合（大文字小文字を区別しない）"""
+    
+    def __init__(self):
+        """初期化"""
+        self.goto = [{}]       # ノード -> {文字: 次ノード}
+        self.fail = [0]
+        self.terminals = [[]]  # ノード -> そのノードで終わる [(キーワード, payload)]
+        self.outputs = [[]]    # ノード -> 失敗リンク先を含む出力
+        self.built = False
+    
+    def add(self, keyword: str, payload: Any = None):
+        """キーワードを登録（payloadに分類情報などを付与）"""
+        node = 0
+        for char in keyword.lower():
+            next_node = self.goto[node].get(char)
+            if next_node is None:
+                next_node = len(self.goto)
+                self.goto[node][char] = next_node
+                self.goto.append({})
+                self.fail.append(0)
+                self.terminals.append([])
+            node = next_node
+        self.terminals[node].append((keyword, payload))
+        self.built = False
+    
+    def build(self):
+        """失敗リンクを構築"""
+        self.outputs = [list(terminal) for terminal in self.terminals]
+        queue = deque()
+        for child in self.goto[0].values():
+            self.fail[child] = 0
+            queue.append(child)
+        while queue:
+            node = queue.popleft()
+            for char, child in self.goto[node].items():
+                queue.append(child)
+                fallback = self.fail[node]
+                while fallback and char not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                self.fail[child] = self.goto[fallback].get(char, 0)
+                self.outputs[child] = self.terminals[child] + self.outputs[self.fail[child]]
+        self.built = True
+    
+    def find_all(self, text: str) -> List[Tuple[int, str, Any]]:
+        """テキストを1回走査し (終了位置, キーワード, payload) をすべて返す"""
+        if not self.built:
+            self.build()
+        hits = []
+        node = 0
+        for position, char in enumerate(text.lower()):
+            while node and char not in self.goto[node]:
+                node = self.fail[node]
+            node = self.goto[node].get(char, 0)
+            for keyword, payload in self.outputs[node]:
+                hits.append((position, keyword, payload))
+        return hits
+    
+    def matched(self, text: str) -> set:
+        """テキスト中に出現した (キーワード, payload) の集合"""
+        return {(keyword, payload) for _, keyword, payload in self.find_all(text)}
+
+
+class ArchiveSearchIndex:
+    """全文を対象とした永続転置インデックス（文字2-gram/3-gram + BM25）"""
+    
+    def __init__(self, index_path: str, k1: float = 1.5, b: float = 0.75):
+        """初期化"""
+        self.index_path = index_path
+        self.k1 = k1
+        self.b = b
+        self.documents = {}   # path -> {"mtime", "size", "length", "terms"}
+        self.postings = {}    # term -> {path: tf}
+        self.load()
+    
+    def load(self):
+        """インデックスファイル読み込み"""
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            self.documents = data.get("documents", {})
+            self.postings = data.get("postings", {})
+        except (OSError, ValueError):
+            self.documents = {}
+            self.postings = {}
+    
+    def save(self):
+        """インデックスファイル保存（一時ファイル経由で置換）"""
+        os.makedirs(os.path.dirname(self.index_path), exist_ok=True)
+        tmp_path = self.index_path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({"documents": self.documents, "postings": self.postings}, f, ensure_ascii=False)
+        os.replace(tmp_path, self.index_path)
+    
+    def refresh(self, directory: str, pattern: str = "*.md") -> int:
+        """mtime/サイズが変化した文書のみ再インデックスし、更新件数を返す"""
+        seen = set()
+        updated = 0
+        
+        for file_path in Path(directory).glob(pattern):
+            path = str(file_path)
+            seen.add(path)
+            try:
+                stat = file_path.stat()
+            except OSError:
+                continue
+            
+            document = self.documents.get(path)
+            if document and document["mtime"] == stat.st_mtime and document["size"] == stat.st_size:
+                continue
+            
+            try:
+                with open(file_path, 'r', encoding='utf-8') as f:
+                    content = f.read()
+            except Exception as e:
+                print(f"⚠️ インデックス作成警告 ({file_path.name}): {e}")
+                continue
+            
+            self._remove_document(path)
+            self._add_document(path, file_path.name + "\n" + content, stat)
+            updated += 1
+        
+        # 削除されたファイルをインデックスから除去
+        for path in [p for p in self.documents if p not in seen]:
+            self._remove_document(path)
+            updated += 1
+        
+        if updated:
+            self.save()
+        return updated
+    
+    def _add_document(self, path: str, content: str, stat: os.stat_result):
+        """文書をインデックスに追加"""
+        term_counts = Counter(tokenize_ngrams(content))
+        for term, tf in term_counts.items():
+            self.postings.setdefault(term, {})[path] = tf
+        self.documents[path] = {
+            "mtime": stat.st_mtime,
+            "size": stat.st_size,
+            "length": sum(term_counts.values()),
+            "terms": list(term_counts)
+        }
+    
+    def _remove_document(self, path: str):
+        """文書をインデックスから除去"""
+        document = self.documents.pop(path, None)
+        if not document:
+            return
+        for term in document["terms"]:
+            posting = self.postings.get(term)
+            if posting is not None:
+                posting.pop(path, None)
+                if not posting:
+                    del self.postings[term]
+    
+    def contains(self, phrase: str) -> set:
+        """フレーズの全n-gramを含む文書パスの集合（全文一致の候補）"""
+        terms = set(tokenize_ngrams(phrase))
+        if not terms:
+            return set()
+        postings = sorted((self.postings.get(term, {}) for term in terms), key=len)
+        result = set(postings[0])
+        for posting in postings[1:]:
+            result.intersection_update(posting)
+            if not result:
+                break
+        return result
+    
+    def search(self, query: str, top_k: Optional[int] = None) -> List[Tuple[str, float]]:
+        """BM25で文書をランキングし (パス, スコア) のリストを返す"""
+        if not self.documents:
+            return []
+        
+        doc_count = len(self.documents)
+        avg_length = sum(d["length"] for d in self.documents.values()) / doc_count or 1
+        scores = Counter()
+        
+        for term in set(tokenize_ngrams(query)):
+            posting = self.postings.get(term)
+            if not posting:
+                continue
+            idf = math.log(1 + (doc_count - len(posting) + 0.5) / (len(posting) + 0.5))
+            for path, tf in posting.items():
+                length_norm = 1 - self.b + self.b * self.documents[path]["length"] / avg_length
+                scores[path] += idf * tf * (self.k1 + 1) / (tf + self.k1 * length_norm)
+        
+        ranked = scores.most_common(top_k)
+        return [(path, score) for path, score in ranked]
+
+
+class NearDuplicateDetector:
+    """完成記事本文のMinHash署名 + LSHによる近似重複検出"""
+    
+    MERSENNE_PRIME = (1 << 61) - 1
+    
+    def __init__(self, signature_path: str, num_perm: int = 64, bands: int = 32, shingle_size: int = 5):
+        """初期化（num_perm = bands × rows）
+
+        候補になる確率は 1 - (1 - s^rows)^bands。既定の32バンド×2行では閾値付近が
+        s=0.3で約95%・s=0.4で99%以上となり、既定閾値0.3の類似記事を取りこぼさない
+        """
+        self.signature_path = signature_path
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.shingle_size = shingle_size
+        
+        # 固定シードでハッシュ関数群を生成（署名を永続化するため再現性が必要）
+        rng = random.Random(42)
+        self.permutations = [
+            (rng.randrange(1, self.MERSENNE_PRIME), rng.randrange(0, self.MERSENNE_PRIME))
+            for _ in range(num_perm)
+        ]
+        
+        self.documents = {}   # path -> {"mtime", "size", "title", "signature"}
+        self.buckets = {}     # (band, band_hash) -> set(path)
+        self.load()
+    
+    def load(self):
+        """署名ファイル読み込みとLSHバケット構築"""
+        try:
+            with open(self.signature_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get("num_perm") == self.num_perm:
+                self.documents = data.get("documents", {})
+        except (OSError, ValueError):
+            self.documents = {}
+        
+        self.buckets = {}
+        for path, document in self.documents.items():
+            self._insert_buckets(path, document["signature"])
+    
+    def save(self):
+        """署名ファイル保存"""
+        os.makedirs(os.path.dirname(self.signature_path), exist_ok=True)
+        tmp_path = self.signature_path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({"num_perm": self.num_perm, "documents": self.documents}, f, ensure_ascii=False)
+        os.replace(tmp_path, self.signature_path)
+    
+    def _shingles(self, text: str) -> set:
+        """空白・記号を除いた本文の文字shingle（crc32ハッシュ）集合"""
+        normalized = "".join(re.findall(r'\w+', unicodedata.normalize("NFKC", text).lower()))
+        size = self.shingle_size
+        if len(normalized) < size:
+            return {zlib.crc32(normalized.encode('utf-8'))} if normalized else set()
+        return {
+            zlib.crc32(normalized[i:i + size].encode('utf-8'))
+            for i in range(len(normalized) - size + 1)
+        }
+    
+    def signature(self, text: str) -> List[int]:
+        """MinHash署名を計算"""
+        shingles = self._shingles(text)
+        if not shingles:
+            return [self.MERSENNE_PRIME] * self.num_perm
+        prime = self.MERSENNE_PRIME
+        return [min((a * x + b) % prime for x in shingles) for a, b in self.permutations]
+    
+    def _band_keys(self, signature: List[int]) -> List[Tuple[int, int]]:
+        """署名をバンドに分割したバケットキー"""
+        return [
+            (band, hash(tuple(signature[band * self.rows:(band + 1) * self.rows])))
+            for band in range(self.bands)
+        ]
+    
+    def _insert_buckets(self, path: str, signature: List[int]):
+        for key in self._band_keys(signature):
+            self.buckets.setdefault(key, set()).add(path)
+    
+    def _remove_document(self, path: str):
+        document = self.documents.pop(path, None)
+        if not document:
+            return
+        for key in self._band_keys(document["signature"]):
+            bucket = self.buckets.get(key)
+            if bucket is not None:
+                bucket.discard(path)
+                if not bucket:
+                    del self.buckets[key]
+    
+    def refresh(self, directories: List[str], pattern: str = "**/*.md") -> int:
+        """mtime/サイズが変化した記事のみ署名を再計算し、更新件数を返す"""
+        seen = set()
+        updated = 0
+        
+        for directory in directories:
+            for file_path in Path(directory).glob(pattern):
+                path = str(file_path)
+                seen.add(path)
+                try:
+                    stat = file_path.stat()
+                except OSError:
+                    continue
+                
+                document = self.documents.get(path)
+                if document and document["mtime"] == stat.st_mtime and document["size"] == stat.st_size:
+                    continue
+                
+                try:
+                    with open(file_path, 'r', encoding='utf-8') as f:
+                        content = f.read()
+                except Exception as e:
+                    print(f"⚠️ 署名作成警告 ({file_path.name}): {e}")
+                    continue
+                
+                self._remove_document(path)
+                signature = self.signature(content)
+                self.documents[path] = {
+                    "mtime": stat.st_mtime,
+                    "size": stat.st_size,
+                    "title": file_path.stem,
+                    "signature": signature
+                }
+                self._insert_buckets(path, signature)
+                updated += 1
+        
+        for path in [p for p in self.documents if p not in seen]:
+            self._remove_document(path)
+            updated += 1
+        
+        if updated:
+            self.save()
+        return updated
+    
+    def query(self, text: str, threshold: float = 0.3, exclude_path: Optional[str] = None) -> List[Dict]:
+        """LSH候補のみとJaccard係数を推定し、閾値以上を類似度順で返す"""
+        signature = self.signature(text)
+        candidates = set()
+        for key in self._band_keys(signature):
+            candidates.update(self.buckets.get(key, ()))
+        if exclude_path:
+            candidates.discard(str(Path(exclude_path)))
+        
+        results = []
+        for path in candidates:
+            existing = self.documents[path]["signature"]
+            jaccard = sum(1 for x, y in zip(signature, existing) if x == y) / self.num_perm
+            if jaccard >= threshold:
+                results.append({
+                    "path": path,
+                    "title": self.documents[path]["title"],
+                    "jaccard": round(jaccard, 3)
+                })
+        
+        results.sort(key=lambda x: x["jaccard"], reverse=True)
+        return results
+
+
+class DocumentFeatureCache:
+    """文書ごとの構造特徴（見出し・強調表現・数値データ）をpath+mtime+sizeで管理するキャッシュ"""
+    
+    def __init__(self, cache_file: str):
+        """初期化"""
+        self.cache_file = cache_file
+        self.entries = {}   # path -> {"mtime", "size", "headings", "emphasis", "numbers"}
+        self.dirty = False
+        try:
+            with open(self.cache_file, 'r', encoding='utf-8') as f:
+                self.entries = json.load(f)
+        except (OSError, ValueError):
+            self.entries = {}
+    
+    def get(self, file_path: str) -> Dict[str, Any]:
+        """特徴を取得（変更があった文書のみ再解析）"""
+        stat = os.stat(file_path)
+        entry = self.entries.get(file_path)
+        if entry and entry["mtime"] == stat.st_mtime and entry["size"] == stat.st_size:
+            return entry
+        
+        with open(file_path, 'r', encoding='utf-8') as f:
+            content = f.read()
+        
+        entry = {
+            "mtime": stat.st_mtime,
+            "size": stat.st_size,
+            "headings": [[len(level), text] for level, text in re.findall(r'^(#{1,6})\s+(.+)$', content, re.MULTILINE)],
+            "emphasis": re.findall(r'\*\*(.+?)\*\*', content),
+            "numbers": re.findall(r'(\d+%|\d+人|\d+倍|\d+円|\d+冊)', content)
+        }
+        self.entries[file_path] = entry
+        self.dirty = True
+        return entry
+    
+    def save(self):
+        """変更がある場合のみ1ファイルにコンパクト保存"""
+        if not self.dirty:
+            return
+        for path in [p for p in self.entries if not os.path.exists(p)]:
+            del self.entries[path]
+        os.makedirs(os.path.dirname(self.cache_file), exist_ok=True)
+        tmp_path = self.cache_file + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.entries, f, ensure_ascii=False, separators=(',', ':'))
+        os.replace(tmp_path, self.cache_file)
+        self.dirty = False
+
+
 class ArchiveUtilizationSystem:
     """統合資料アーカイブ自動検索・活用システム"""
     
@@ -29,6 +450,22 @@ class ArchiveUtilizationSystem:
         self.archive_path = os.path.join(self.base_path, "統合管理システム/資料アーカイブ/")
         self.notebook_path = os.path.join(self.base_path, "ブログ自動化/NotebookLM資料/")
         self.duplication_db_path = os.path.join(self.archive_path, "作成済み記事・キーワード重複管理.md")
+        self.cache_path = os.path.join(self.archive_path, ".cache/")
+        
+        # 全文検索インデックス（初回検索時に差分更新）
+        self.search_index = ArchiveSearchIndex(os.path.join(self.cache_path, "archive_search_index.json"))
+        
+        # 完成記事本文の近似重複検出（ブログ記事 + ミネルヴスリープ完成記事・検査中の記事自身はexclude_pathで除外）
+        self.finished_article_paths = [
+            os.path.join(self.base_path, "ブログ自動化/WordPress投稿下書き/"),
+            os.path.join(self.base_path, "ライティング案件/ミネルヴスリープ/記事/2_完成記事/")
+        ]
+        self.near_duplicate_detector = NearDuplicateDetector(
+            os.path.join(self.cache_path, "near_duplicate_signatures.json")
+        )
+        
+        # 品質要素抽出用の構造特徴キャッシュ
+        self.feature_cache = DocumentFeatureCache(os.path.join(self.cache_path, "document_features.json"))
         
         # キーワードマッピングデータベース
         self.keyword_categories = {
@@ -84,6 +521,50 @@ class ArchiveUtilizationSystem:
                 }
             ]
         }
+        self._duplication_db_mtime = None
+        self.refresh_duplication_db()
+    
+    def refresh_duplication_db(self) -> bool:
+        """重複管理DB（Markdown内のJSONブロック）を更新時のみ再読み込み"""
+        try:
+            mtime = os.path.getmtime(self.duplication_db_path)
+        except OSError:
+            return False
+        if mtime == self._duplication_db_mtime:
+            return False
+        
+        try:
+            with open(self.duplication_db_path, 'r', encoding='utf-8') as f:
+                content = f.read()
+            
+            loaded = {}
+            for block in re.findall(r'```json\s*\n(.*?)```', content, re.DOTALL):
+                data = json.loads(block)
+                if "blog_articles" in data:
+                    loaded["blog"] = list(data["blog_articles"].values())
+                if "writing_projects" in data:
+                    loaded["writing_project"] = list(data["writing_projects"].values())
+            
+            self.created_articles.update(loaded)
+            self._duplication_db_mtime = mtime
+            return True
+        
+        except Exception as e:
+            print(f"⚠️ 重複管理DB読み込み警告: {e}")
+            return False
+    
+    @property
+    def keyword_automaton(self) -> KeywordAutomaton:
+        """keyword_categoriesから構築したAho–Corasickオートマトン（初回のみ構築）"""
+        if getattr(self, "_keyword_automaton", None) is None:
+            automaton = KeywordAutomaton()
+            for category, keywords in self.keyword_categories.items():
+                for tier, tier_keywords in keywords.items():
+                    for keyword in tier_keywords:
+                        automaton.add(keyword, (category, tier))
+            automaton.build()
+            self._keyword_automaton = automaton
+        return self._keyword_automaton
     
     def extract_keywords_from_request(self, user_request: str) -> Dict[str, Any]:
         """ユーザーリクエストからキーワードを自動抽出"""
@@ -96,32 +577,22 @@ class ArchiveUtilizationSystem:
             "inferred_intent": ""
         }
         
-        request_lower = user_request.lower()
+        # 全カテゴリのキーワードを1回の走査で照合
+        hits = self.keyword_automaton.matched(user_request)
+        tier_weights = {"primary": 3, "secondary": 2, "tertiary": 1}
         
-        # カテゴリ判定とキーワード抽出
+        # カテゴリ判定とキーワード抽出（辞書の定義順を維持）
         for category, keywords in self.keyword_categories.items():
             category_score = 0
             found_keywords = []
             
-            # Primary keywordsチェック
-            for keyword in keywords["primary"]:
-                if keyword.lower() in request_lower or keyword in user_request:
-                    category_score += 3
-                    found_keywords.append(keyword)
-                    if keyword not in extracted_keywords["main_keywords"]:
-                        extracted_keywords["main_keywords"].append(keyword)
-            
-            # Secondary keywordsチェック
-            for keyword in keywords["secondary"]:
-                if keyword.lower() in request_lower or keyword in user_request:
-                    category_score += 2
-                    found_keywords.append(keyword)
-            
-            # Tertiary keywordsチェック
-            for keyword in keywords["tertiary"]:
-                if keyword.lower() in request_lower or keyword in user_request:
-                    category_score += 1
-                    found_keywords.append(keyword)
+            for tier, weight in tier_weights.items():
+                for keyword in keywords[tier]:
+                    if (keyword, (category, tier)) in hits:
+                        category_score += weight
+                        found_keywords.append(keyword)
+                        if tier == "primary" and keyword not in extracted_keywords["main_keywords"]:
+                            extracted_keywords["main_keywords"].append(keyword)
             
             if category_score > 0:
                 extracted_keywords["detected_keywords"].extend(found_keywords)
@@ -142,52 +613,76 @@ class ArchiveUtilizationSystem:
         relevant_materials = []
         
         try:
-            # NotebookLM資料フォルダをスキャン
-            for file_path in Path(self.notebook_path).glob("*.md"):
-                file_name = file_path.name
+            # 変更のあった資料のみインデックスを更新
+            updated = self.search_index.refresh(self.notebook_path)
+            if updated:
+                print(f"📇 検索インデックス更新: {updated}件")
+            
+            # 全文に対するキーワード出現（n-gram転置インデックス）
+            content_matches = {
+                keyword: self.search_index.contains(keyword)
+                for keyword in keywords["detected_keywords"]
+            }
+            
+            # BM25スコア（同点時の順位付けに使用）
+            query = " ".join(keywords["main_keywords"] + keywords["detected_keywords"])
+            bm25_scores = dict(self.search_index.search(query))
+            
+            # ファイル名照合用オートマトン（クエリごとに1回だけ構築）
+            name_automaton = KeywordAutomaton()
+            for keyword in set(keywords["main_keywords"] + keywords["detected_keywords"]):
+                name_automaton.add(keyword)
+            name_automaton.build()
+            
+            for file_path in self.search_index.documents:
+                file_name = os.path.basename(file_path)
                 relevance_score = 0
                 matched_keywords = []
                 
-                # ファイル名でのキーワードマッチング
+                # ファイル名でのキーワードマッチング（1回の走査）
+                name_hits = {keyword for keyword, _ in name_automaton.matched(file_name)}
                 for keyword in keywords["main_keywords"] + keywords["detected_keywords"]:
-                    if keyword.lower() in file_name.lower():
+                    if keyword in name_hits:
                         relevance_score += 3
                         matched_keywords.append(keyword)
                 
-                # ファイル内容での詳細マッチング（最初の500文字）
-                try:
-                    with open(file_path, 'r', encoding='utf-8') as f:
-                        content_preview = f.read(500)
-                        
-                        for keyword in keywords["detected_keywords"]:
-                            if keyword in content_preview:
-                                relevance_score += 1
-                                if keyword not in matched_keywords:
-                                    matched_keywords.append(keyword)
-                
-                except Exception as e:
-                    print(f"⚠️ ファイル読み込み警告 ({file_name}): {e}")
+                # ファイル全文での詳細マッチング
+                for keyword in keywords["detected_keywords"]:
+                    if file_path in content_matches[keyword]:
+                        relevance_score += 1
+                        if keyword not in matched_keywords:
+                            matched_keywords.append(keyword)
                 
                 # 関連性があるファイルを結果に追加
                 if relevance_score > 0:
                     relevant_materials.append({
                         "file_name": file_name,
-                        "file_path": str(file_path),
+                        "file_path": file_path,
                         "relevance_score": relevance_score,
+                        "bm25_score": round(bm25_scores.get(file_path, 0.0), 4),
                         "matched_keywords": matched_keywords,
                         "category": keywords["category"]
                     })
             
-            # 関連度順でソート
-            relevant_materials.sort(key=lambda x: x["relevance_score"], reverse=True)
+            # 関連度順でソート（同点はBM25順）
+            relevant_materials.sort(key=lambda x: (x["relevance_score"], x["bm25_score"]), reverse=True)
             
         except Exception as e:
             print(f"❌ アーカイブ検索エラー: {e}")
         
         return relevant_materials
     
-    def check_duplication_risk(self, keywords: Dict[str, Any]) -> Dict[str, Any]:
-        """記事重複リスクの自動チェック"""
+    def find_near_duplicate_articles(self, content: str, threshold: float = 0.3,
+                                     exclude_path: Optional[str] = None) -> List[Dict]:
+        """完成記事から本文が近似重複する記事を検索（Jaccard推定値付き・exclude_pathは検査対象自身）"""
+        updated = self.near_duplicate_detector.refresh(self.finished_article_paths)
+        if updated:
+            print(f"📇 重複検出署名更新: {updated}件")
+        return self.near_duplicate_detector.query(content, threshold=threshold, exclude_path=exclude_path)
+    
+    def check_duplication_risk(self, keywords: Dict[str, Any], content: Optional[str] = None,
+                               content_path: Optional[str] = None) -> Dict[str, Any]:
+        """記事重複リスクの自動チェック（content指定時は本文の近似重複も検査・content_pathの記事自身は除外）"""
         
         duplication_result = {
             "status": "SAFE",
@@ -236,6 +731,20 @@ class ArchiveUtilizationSystem:
                                 "created_date": article["created_date"]
                             })
             
+            # 本文の近似重複チェック（MinHash/LSH）
+            if content:
+                for match in self.find_near_duplicate_articles(content, exclude_path=content_path):
+                    current_risk = min(9, int(match["jaccard"] * 10))
+                    duplication_result["conflicting_articles"].append({
+                        "article": match["title"],
+                        "overlap_type": "content_near_duplicate",
+                        "jaccard": match["jaccard"],
+                        "file_path": match["path"]
+                    })
+                    if current_risk > duplication_result["risk_level"]:
+                        duplication_result["risk_level"] = current_risk
+                        duplication_result["status"] = "MODERATE_RISK" if current_risk < 7 else "HIGH_RISK"
+            
             # 差別化提案生成
             if duplication_result["risk_level"] > 3:
                 duplication_result["suggestions"] = self._generate_differentiation_suggestions(
@@ -306,27 +815,25 @@ class ArchiveUtilizationSystem:
         
         try:
             for material in relevant_materials[:3]:  # 上位3つの関連資料を分析
-                file_path = material["file_path"]
-                
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    content = f.read()
+                # 構造特徴はキャッシュから取得（変更された文書のみ再解析）
+                features = self.feature_cache.get(material["file_path"])
                 
                 # 構造パターン抽出（見出し構造）
-                headings = re.findall(r'^(#{1,6})\s+(.+)$', content, re.MULTILINE)
+                headings = features["headings"]
                 if headings:
-                    structure_pattern = [f"H{len(h[0])}:{h[1][:30]}..." for h in headings[:5]]
+                    structure_pattern = [f"H{level}:{text[:30]}..." for level, text in headings[:5]]
                     quality_elements["proven_structures"].append({
                         "source": material["file_name"],
                         "structure": structure_pattern
                     })
                 
                 # 効果的なフレーズ抽出（強調表現）
-                effective_phrases = re.findall(r'\*\*(.+?)\*\*', content)
+                effective_phrases = features["emphasis"]
                 if effective_phrases:
                     quality_elements["effective_phrases"].extend(effective_phrases[:5])
                 
                 # データソース抽出（具体的な数値・研究結果）
-                data_patterns = re.findall(r'(\d+%|\d+人|\d+倍|\d+円|\d+冊)', content)
+                data_patterns = features["numbers"]
                 if data_patterns:
                     quality_elements["reliable_data_sources"].extend(data_patterns[:5])
                 
@@ -338,6 +845,11 @@ class ArchiveUtilizationSystem:
         except Exception as e:
             print(f"❌ 品質要素抽出エラー: {e}")
         
+        try:
+            self.feature_cache.save()
+        except OSError as e:
+            print(f"⚠️ 特徴キャッシュ保存警告: {e}")
+        
         return quality_elements
     
     def generate_enhanced_suggestions(self, keywords: Dict, relevant_materials: List[Dict], 
@@ -404,8 +916,9 @@ class ArchiveUtilizationSystem:
         
         return suggestions
     
-    def auto_archive_utilization_workflow(self, user_request: str) -> Dict[str, Any]:
-        """統合自動活用ワークフロー - メイン実行関数"""
+    def auto_archive_utilization_workflow(self, user_request: str, draft_content: Optional[str] = None,
+                                          draft_path: Optional[str] = None) -> Dict[str, Any]:
+        """統合自動活用ワークフロー - メイン実行関数（draft_content指定時は本文重複も検査・draft_pathは自身として除外）"""
         
         print("🔍 統合資料アーカイブ自動活用システム起動...")
         
@@ -432,7 +945,9 @@ class ArchiveUtilizationSystem:
             
             # Step 3: 重複リスク自動チェック
             print("⚙️ Step 3: 重複リスク自動チェック...")
-            workflow_result["duplication_check"] = self.check_duplication_risk(workflow_result["keywords"])
+            workflow_result["duplication_check"] = self.check_duplication_risk(
+                workflow_result["keywords"], draft_content, draft_path
+            )
             print(f"✅ チェック完了: リスクレベル={workflow_result['duplication_check']['status']}")
             
             # Step 4: 品質要素自動抽出
@@ -498,8 +1013,181 @@ class ArchiveUtilizationSystem:
         return report
 
 
+class ArchiveService:
+    """インデックス・重複DBをメモリ常駐させる常駐サービス（1行1リクエストのJSON-RPC）"""
+    
+    DEFAULT_SOCKET_PATH = "/tmp/muffin_archive_service.sock"
+    
+    def __init__(self, system: Optional[ArchiveUtilizationSystem] = None):
+        """初期化（起動時に1回だけインデックスを読み込む）"""
+        self.system = system or ArchiveUtilizationSystem()
+        # 接続ごとのスレッドから共有インデックス・署名DBを更新するため処理は直列化
+        self.lock = threading.Lock()
+        self.methods = {
+            "ping": lambda: "pong",
+            "extract_keywords": self.system.extract_keywords_from_request,
+            "search": self.system.search_relevant_archives,
+            "check_duplication": self.system.check_duplication_risk,
+            "near_duplicates": self.system.find_near_duplicate_articles,
+            "workflow": self.system.auto_archive_utilization_workflow
+        }
+    
+    def handle(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """JSON-RPCリクエストを処理（重複DBは変更時のみ再読み込み）"""
+        response = {"jsonrpc": "2.0", "id": request.get("id")}
+        method = self.methods.get(request.get("method"))
+        if method is None:
+            response["error"] = {"code": -32601, "message": f"Method not found: {request.get('method')}"}
+            return response
+        
+        params = request.get("params") or []
+        try:
+            with self.lock:
+                self.system.refresh_duplication_db()
+                response["result"] = method(**params) if isinstance(params, dict) else method(*params)
+        except Exception as e:
+            response["error"] = {"code": -32000, "message": str(e)}
+        return response
+    
+    def handle_line(self, line: str) -> str:
+        """1行分のJSONを処理して1行のJSONを返す"""
+        try:
+            request = json.loads(line)
+        except ValueError as e:
+            return json.dumps({"jsonrpc": "2.0", "id": None, "error": {"code": -32700, "message": str(e)}})
+        return json.dumps(self.handle(request), ensure_ascii=False)
+    
+    def serve_stdio(self):
+        """標準入出力モード（進捗表示はstderrへ退避）"""
+        for line in sys.stdin:
+            if not line.strip():
+                continue
+            with redirect_stdout(sys.stderr):
+                reply = self.handle_line(line)
+            sys.stdout.write(reply + "\n")
+            sys.stdout.flush()
+    
+    @staticmethod
+    def is_listening(socket_path: str) -> bool:
+        """ソケットファイルの先で稼働中のサービスが接続を受け付けているか"""
+        probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            probe.settimeout(1.0)
+            probe.connect(socket_path)
+            return True
+        except OSError:
+            return False
+        finally:
+            probe.close()
+    
+    def serve_unix_socket(self, socket_path: str = DEFAULT_SOCKET_PATH):
+        """Unixソケットモード（接続ごとにスレッドで処理・ソケットは所有者のみ読み書き可）"""
+        service = self
+        
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                for raw_line in self.rfile:
+                    line = raw_line.decode('utf-8').strip()
+                    if line:
+                        self.wfile.write((service.handle_line(line) + "\n").encode('utf-8'))
+        
+        if os.path.exists(socket_path):
+            if self.is_listening(socket_path):
+                print(f"⚠️ アーカイブサービスは既に起動しています: {socket_path}")
+                return
+            # 前回の異常終了で残ったソケットファイルのみ削除
+            os.remove(socket_path)
+        
+        previous_umask = os.umask(0o177)
+        try:
+            server = socketserver.ThreadingUnixStreamServer(socket_path, Handler)
+        finally:
+            os.umask(previous_umask)
+        os.chmod(socket_path, 0o600)
+        server.daemon_threads = True
+        
+        with server:
+            print(f"🟢 アーカイブサービス起動: {socket_path}")
+            try:
+                server.serve_forever()
+            except KeyboardInterrupt:
+                print("\n🛑 アーカイブサービス停止")
+            finally:
+                os.remove(socket_path)
+
+
+class ArchiveServiceClient:
+    """常駐アーカイブサービスのクライアント（ArchiveUtilizationSystemと同名メソッドを提供）"""
+    
+    def __init__(self, socket_path: str = ArchiveService.DEFAULT_SOCKET_PATH, timeout: float = 30.0):
+        """初期化（接続できない場合はOSErrorを送出）"""
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(timeout)
+        self.sock.connect(socket_path)
+        self.reader = self.sock.makefile('r', encoding='utf-8')
+        self.request_id = 0
+    
+    @classmethod
+    def connect(cls, socket_path: str = ArchiveService.DEFAULT_SOCKET_PATH) -> Optional["ArchiveServiceClient"]:
+        """サービスが起動していれば接続、なければNone"""
+        if not os.path.exists(socket_path):
+            return None
+        try:
+            return cls(socket_path)
+        except OSError:
+            return None
+    
+    def call(self, method: str, *params) -> Any:
+        """リモート呼び出し"""
+        self.request_id += 1
+        request = {"jsonrpc": "2.0", "id": self.request_id, "method": method, "params": list(params)}
+        self.sock.sendall((json.dumps(request, ensure_ascii=False) + "\n").encode('utf-8'))
+        response = json.loads(self.reader.readline())
+        if "error" in response:
+            raise RuntimeError(response["error"]["message"])
+        return response["result"]
+    
+    def extract_keywords_from_request(self, user_request: str) -> Dict[str, Any]:
+        return self.call("extract_keywords", user_request)
+    
+    def search_relevant_archives(self, keywords: Dict[str, Any]) -> List[Dict]:
+        return self.call("search", keywords)
+    
+    def check_duplication_risk(self, keywords: Dict[str, Any], content: Optional[str] = None,
+                               content_path: Optional[str] = None) -> Dict[str, Any]:
+        return self.call("check_duplication", keywords, content, content_path)
+    
+    def find_near_duplicate_articles(self, content: str, threshold: float = 0.3,
+                                     exclude_path: Optional[str] = None) -> List[Dict]:
+        return self.call("near_duplicates", content, threshold, exclude_path)
+    
+    def auto_archive_utilization_workflow(self, user_request: str, draft_content: Optional[str] = None,
+                                          draft_path: Optional[str] = None) -> Dict[str, Any]:
+        return self.call("workflow", user_request, draft_content, draft_path)
+    
+    def close(self):
+        self.reader.close()
+        self.sock.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
 def main():
-    """テスト実行用メイン関数"""
+    """テスト実行用メイン関数（--serve [--stdio | --socket PATH] で常駐サービス起動）"""
+    if "--serve" in sys.argv:
+        service = ArchiveService()
+        if "--stdio" in sys.argv:
+            service.serve_stdio()
+        elif "--socket" in sys.argv:
+            service.serve_unix_socket(sys.argv[sys.argv.index("--socket") + 1])
+        else:
+            service.serve_unix_socket()
+        return
+    
     system = ArchiveUtilizationSystem()
     
     # テスト用リクエスト
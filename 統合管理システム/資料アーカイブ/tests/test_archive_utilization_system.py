@@ -0,0 +1,55 @@
+import random
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from archive_utilization_system import NearDuplicateDetector
+
+
+def jaccard(detector, a, b):
+    sa, sb = detector._shingles(a), detector._shingles(b)
+    return len(sa & sb) / len(sa | sb)
+
+
+def random_article(rng, words=120):
+    return " ".join("".join(rng.choice("あいうえおかきくけこさしすせそ") for _ in range(6)) for _ in range(words))
+
+
+def rewrite(rng, text, ratio):
+    words = text.split(" ")
+    for index in rng.sample(range(len(words)), int(len(words) * ratio)):
+        words[index] = "".join(rng.choice("たちつてとなにぬねの") for _ in range(6))
+    return " ".join(words)
+
+
+def test_default_threshold_recalls_similar_articles(tmp_path):
+    rng = random.Random(7)
+    detector = NearDuplicateDetector(str(tmp_path / "signatures.json"))
+    pairs = []
+    for index in range(60):
+        original = random_article(rng)
+        path = tmp_path / f"article_{index}.md"
+        path.write_text(original, encoding="utf-8")
+        pairs.append((str(path), rewrite(rng, original, rng.uniform(0.2, 0.3))))
+    detector.refresh([str(tmp_path)])
+
+    similar = [(path, draft) for path, draft in pairs if jaccard(detector, Path(path).read_text(encoding="utf-8"), draft) >= 0.4]
+    assert len(similar) >= 30
+    found = sum(
+        1 for path, draft in similar
+        if path in {match["path"] for match in detector.query(draft)}
+    )
+    assert found / len(similar) >= 0.9
+
+
+def test_exclude_path_skips_the_article_itself(tmp_path):
+    rng = random.Random(11)
+    article = tmp_path / "draft.md"
+    article.write_text(random_article(rng), encoding="utf-8")
+    detector = NearDuplicateDetector(str(tmp_path / "signatures.json"))
+    detector.refresh([str(tmp_path)])
+
+    content = article.read_text(encoding="utf-8")
+    assert [match["path"] for match in detector.query(content)] == [str(article)]
+    assert detector.query(content, exclude_path=str(article)) == []